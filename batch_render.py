@@ -0,0 +1,440 @@
+import argparse
+import collections
+import glob
+import json
+import os
+import queue
+import re
+import sys
+import time
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_MAX_JOBS_PER_WORKER = 500
+DEFAULT_MAX_RSS_MB = 1024
+
+# Jobs handed to each worker ahead of the one it is rendering
+JOBS_PER_WORKER = 4
+
+# A job whose worker died before saying it started it is handed out again, at most this many times in all
+MAX_ATTEMPTS = 3
+
+# Output names of JSON Lines records: <file name>-<line number>
+_RECORD_NAME = re.compile(r"(.*)-\d{6}")
+
+
+def collect_input_files(sources):
+    # Expands each source into resume file paths. A source can be a directory (every *.json and *.jsonl
+    # in it), a glob pattern, a manifest (.txt/.lst file with one path per line) or a single file.
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            files.extend(sorted(glob.glob(os.path.join(source, "*.json")) + glob.glob(os.path.join(source, "*.jsonl"))))
+        elif os.path.isfile(source) and source.endswith((".txt", ".lst")):
+            base_dir = os.path.dirname(os.path.abspath(source))
+            with open(source, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        files.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+        elif os.path.isfile(source):
+            files.append(source)
+        else:
+            files.extend(sorted(glob.glob(source, recursive=True)))
+    return files
+
+
+def output_names(input_files):
+    """Picks an output file name (without .pdf) for every input file, so no two PDFs overwrite each other.
+
+    Returns {input path: name} in input order, listing a file given twice
+    (under any spelling of its path) once. A file is named after itself when
+    no other input has the same name; files with the same name in different
+    directories (a/resume.json, b/resume.json, as globs and manifests often
+    give) are named after their path below the directory they have in
+    common (a_resume, b_resume). A name that still collides with another,
+    also only by letter case or with the <name>-<line> names of a JSON Lines
+    file's records, gets -2, -3, ... appended.
+    """
+    unique = {}
+    for path in input_files:
+        unique.setdefault(os.path.realpath(path), path)
+    groups = {}
+    for path in unique.values():
+        stem = os.path.splitext(os.path.basename(path))[0]
+        groups.setdefault((stem.lower(), path.endswith(".jsonl")), []).append(path)
+    wanted = {}
+    for paths in groups.values():
+        if len(paths) == 1:
+            wanted[paths[0]] = os.path.splitext(os.path.basename(paths[0]))[0]
+            continue
+        stems = [os.path.splitext(os.path.abspath(path))[0] for path in paths]
+        try:
+            root = os.path.commonpath([os.path.dirname(stem) for stem in stems])
+        except ValueError:  # on different drives
+            root = None
+        for path, stem in zip(paths, stems):
+            relative = os.path.relpath(stem, root) if root else os.path.splitdrive(stem)[1].lstrip("\\/")
+            wanted[path] = re.sub(r"[\\/]", "_", relative)
+
+    # JSON Lines files first, so a .json file named like one of their records is the one renamed
+    taken = set()
+    record_prefixes = set()
+    names = {}
+    for path in sorted(wanted, key=lambda path: not path.endswith(".jsonl")):
+        is_records = path.endswith(".jsonl")
+        name = candidate = wanted[path]
+        suffix = 1
+        while True:
+            key = candidate.lower()
+            if is_records:
+                clash = key in record_prefixes
+            else:
+                record = _RECORD_NAME.fullmatch(key)
+                clash = key in taken or (record is not None and record.group(1) in record_prefixes)
+            if not clash:
+                break
+            suffix += 1
+            candidate = f"{name}-{suffix}"
+        (record_prefixes if is_records else taken).add(candidate.lower())
+        names[path] = candidate
+    return {path: names[path] for path in wanted}
+
+
+def iter_tasks(input_files):
+    # One task per JSON file, and one per record of each JSON Lines file, each with its output name.
+    # JSON Lines files are scanned for line offsets only; the workers parse the records themselves.
+    from resume_generator import iter_jsonl_lines
+
+    for input_path, name in output_names(input_files).items():
+        if input_path.endswith(".jsonl"):
+            for line_number, offset, _ in iter_jsonl_lines(input_path):
+                yield {"input": input_path, "name": f"{name}-{line_number:06d}", "line": line_number, "offset": offset}
+        else:
+            yield {"input": input_path, "name": name}
+
+
+def _current_rss_mb():
+    # Resident set size of this process in MB (Linux /proc, falling back to peak RSS elsewhere)
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _output_path_for(task, output_dir):
+    if "name" in task:
+        return os.path.join(output_dir, task["name"] + ".pdf")
+    stem = os.path.splitext(os.path.basename(task["input"]))[0]
+    if "line" in task:
+        stem = f"{stem}-{task['line']:06d}"
+    return os.path.join(output_dir, stem + ".pdf")
+
+
+def render_task(task, output_dir, cache=None):
+    # Renders one resume (a JSON file, or one record of a JSON Lines file) and returns a job record.
+    # With a RenderCache, unchanged resumes are copied from the cache instead of being rendered.
+    from resume_generator import ResumePDF, generate_resume_pdf, read_resume_record
+    from resume_journal import atomic_output
+    from resume_schema import check_resume
+
+    record = dict(task, output=_output_path_for(task, output_dir), pid=os.getpid())
+    start = time.perf_counter()
+    try:
+        if "offset" in task:
+            data = read_resume_record(task["input"], task["offset"])
+        else:
+            with open(task["input"], "r", encoding="utf-8") as f:
+                data = json.load(f)
+        # Bad records are turned away here, in microseconds, before any font or page work
+        data, problems = check_resume(data)
+        if problems:
+            record["status"] = "invalid"
+            record["error"] = "; ".join(problems)
+        elif cache is not None:
+            hits_before = cache.hits
+            cache.render_to_file(data, record["output"])
+            record["cached"] = cache.hits > hits_before
+            record["status"] = "ok"
+        else:
+            pdf_instance = ResumePDF(unit="mm", format="A4")
+            generate_resume_pdf(data, pdf_instance)
+            # A worker killed mid-write leaves no truncated PDF behind
+            with atomic_output(record["output"]) as f:
+                pdf_instance.output_to(f)
+            record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def _worker_main(task_queue, result_queue, output_dir, max_jobs, max_rss_mb, cache_dir, cache_max_bytes,
+                 subset_cache_dir):
+    # Loads the fonts once, then renders jobs until told to stop or until it should be recycled
+    from font_registry import FONT_REGISTRY
+    FONT_REGISTRY.warm_up()
+    if subset_cache_dir:
+        from subset_cache import SUBSET_CACHE
+        SUBSET_CACHE.set_cache_dir(subset_cache_dir)
+
+    cache = None
+    if cache_dir:
+        from render_cache import RenderCache
+        cache = RenderCache(cache_dir, cache_max_bytes)
+
+    pid = os.getpid()
+    jobs_done = 0
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        index, job = task
+        result_queue.put(("started", pid, index))
+        record = render_task(job, output_dir, cache)
+        record["job"] = index
+        result_queue.put(("done", pid, record))
+        jobs_done += 1
+        if max_jobs and jobs_done >= max_jobs:
+            break
+        if max_rss_mb and _current_rss_mb() > max_rss_mb:
+            break
+    result_queue.put(("retired", pid, {"jobs": jobs_done, "cache": cache.stats() if cache else None}))
+
+
+def run_batch(input_files, output_dir, workers=DEFAULT_WORKERS, max_jobs_per_worker=DEFAULT_MAX_JOBS_PER_WORKER,
+              max_rss_mb=DEFAULT_MAX_RSS_MB, report_path=None, cache_dir=None,
+              cache_max_bytes=None, subset_cache_dir=None):
+    """Renders every resume in input_files across a pool of worker processes.
+
+    Tasks are fed to the workers a few at a time, so JSON Lines inputs with
+    millions of records are never held in memory. Every input gets its own
+    PDF name (see output_names()). Jobs a worker was given but hadn't started
+    when it retired or died are rendered by another worker; one it died on is
+    reported as failed, as is one whose worker died before saying it started
+    it, MAX_ATTEMPTS times over. Workers are replaced after
+    max_jobs_per_worker jobs or once their RSS passes max_rss_mb. One JSON record
+    per job is written to report_path (JSON Lines) if given. Returns a summary
+    dict with counts and throughput.
+
+    With cache_dir, workers share an on-disk RenderCache and resumes whose
+    normalized data was rendered before are not rendered again. Font subsets
+    are always reused within a worker; subset_cache_dir keeps them across runs.
+    """
+    if cache_dir and cache_max_bytes is None:
+        from render_cache import DEFAULT_MAX_BYTES
+        cache_max_bytes = DEFAULT_MAX_BYTES
+    os.makedirs(output_dir, exist_ok=True)
+    import multiprocessing # imported here so collect_input_files() stays cheap to import
+
+    ctx = multiprocessing.get_context()
+    result_queue = ctx.Queue()
+    tasks = enumerate(iter_tasks(input_files))
+    workers = max(1, workers)
+    # Each worker has its own task queue, so it is always known which jobs a worker holds: when it
+    # retires or dies, the ones it hadn't started go to the other workers
+    processes = {}  # pid -> process
+    task_queues = {}  # pid -> that worker's task queue
+    assigned = {}  # pid -> {job index: task} given to that worker and not done yet
+    started = {}  # pid -> index of the job the worker said it started
+    attempts = collections.Counter()  # job index -> workers that died before saying they started it
+    pending = collections.deque()  # (index, task) not given to any worker yet
+    more_tasks = True
+
+    def has_pending():
+        nonlocal more_tasks
+        if not pending and more_tasks:
+            item = next(tasks, None)
+            if item is None:
+                more_tasks = False
+            else:
+                pending.append(item)
+        return bool(pending)
+
+    def feed(pid):
+        jobs = assigned[pid]
+        while len(jobs) < JOBS_PER_WORKER and has_pending():
+            index, task = pending.popleft()
+            jobs[index] = task
+            task_queues[pid].put((index, task))
+
+    def spawn():
+        task_queue = ctx.Queue()
+        proc = ctx.Process(target=_worker_main,
+                           args=(task_queue, result_queue, output_dir, max_jobs_per_worker, max_rss_mb,
+                                 cache_dir, cache_max_bytes, subset_cache_dir),
+                           daemon=True)
+        proc.start()
+        processes[proc.pid] = proc
+        task_queues[proc.pid] = task_queue
+        assigned[proc.pid] = {}
+        feed(proc.pid)
+
+    def release(pid, died=False):
+        # Drops a worker that retired or died. Returns (index, task) of the job it died on, if any;
+        # the jobs it was given but never started are handed out again.
+        processes.pop(pid).join()
+        task_queue = task_queues.pop(pid)
+        task_queue.cancel_join_thread()  # nobody will read what is left in it
+        task_queue.close()
+        jobs = assigned.pop(pid)
+        index = started.pop(pid, None)
+        lost = (index, jobs.pop(index)) if index in jobs else None
+        if died and lost is None and jobs:
+            # It died before saying it started anything, maybe on the first job it was given (its
+            # queue is first in, first out): that one gets another worker until it runs out of attempts
+            index = next(iter(jobs))
+            attempts[index] += 1
+            if attempts[index] >= MAX_ATTEMPTS:
+                lost = (index, jobs.pop(index))
+        pending.extendleft(reversed(list(jobs.items())))
+        if has_pending():
+            spawn()
+            for other in processes:
+                feed(other)
+        return lost
+
+    report = open(report_path, "w", encoding="utf-8") if report_path else None
+    succeeded = failed = recycled = 0
+    cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def add_cache_stats(retired):
+        if retired["cache"]:
+            for name in cache_stats:
+                cache_stats[name] += retired["cache"][name]
+
+    def handle(kind, pid, payload):
+        nonlocal succeeded, failed, recycled
+        if pid not in processes:
+            return
+        if kind == "started":
+            started[pid] = payload
+        elif kind == "done":
+            assigned[pid].pop(payload["job"], None)
+            started.pop(pid, None)
+            if payload["status"] == "ok":
+                succeeded += 1
+            else:
+                failed += 1
+            if report:
+                report.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            feed(pid)
+        elif kind == "retired":
+            add_cache_stats(payload)
+            release(pid)
+            recycled += 1
+
+    def reap_dead_workers():
+        # A worker that died without retiring (segfault, OOM kill) takes the job it was on with it
+        nonlocal failed
+        dead = [pid for pid, proc in processes.items() if not proc.is_alive() and proc.exitcode not in (0, None)]
+        if not dead:
+            return
+        # What it sent before dying is read first, so its finished jobs and the one it started are known
+        while True:
+            try:
+                handle(*result_queue.get_nowait())
+            except queue.Empty:
+                break
+        for pid in dead:
+            if pid not in processes:
+                continue
+            exitcode = processes[pid].exitcode
+            lost = release(pid, died=True)
+            if lost is not None:
+                index, task = lost
+                error = f"worker exited with code {exitcode}"
+                if attempts[index]:
+                    error += f" ({attempts[index]} attempts)"
+                record = dict(task, job=index, pid=pid, status="failed", error=error)
+                if report:
+                    report.write(json.dumps(record, ensure_ascii=False) + "\n")
+                failed += 1
+
+    start = time.perf_counter()
+    try:
+        while len(processes) < workers and has_pending():
+            spawn()
+
+        while any(assigned.values()):
+            try:
+                handle(*result_queue.get(timeout=1.0))
+            except queue.Empty:
+                pass
+            # Checked on every pass: other workers' results don't hide a crash
+            reap_dead_workers()
+
+        for task_queue in task_queues.values():
+            task_queue.put(None)
+        # Drain the final "retired" messages so no worker blocks flushing its queue on exit
+        while any(proc.is_alive() for proc in processes.values()):
+            try:
+                kind, pid, payload = result_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if kind == "retired":
+                add_cache_stats(payload)
+        for proc in processes.values():
+            proc.join()
+    finally:
+        if report:
+            report.close()
+        for proc in processes.values():
+            if proc.is_alive():
+                proc.terminate()
+
+    elapsed = time.perf_counter() - start
+    total = succeeded + failed
+    summary = {
+        "total": total,
+        "succeeded": succeeded,
+        "failed": failed,
+        "workers": workers,
+        "workers_recycled": recycled,
+        "seconds": round(elapsed, 3),
+        "resumes_per_sec": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    if cache_dir:
+        summary["cache"] = cache_stats
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render many resume JSON files to PDF in parallel.")
+    parser.add_argument("inputs", nargs="+", help="directories, glob patterns, manifest files (.txt/.lst), JSON or JSON Lines files")
+    parser.add_argument("-o", "--output-dir", default="pdf_output", help="where to write the PDFs (default: pdf_output)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="number of worker processes")
+    parser.add_argument("--max-jobs-per-worker", type=int, default=DEFAULT_MAX_JOBS_PER_WORKER,
+                        help="replace a worker after this many jobs (0 = never)")
+    parser.add_argument("--max-rss-mb", type=float, default=DEFAULT_MAX_RSS_MB,
+                        help="replace a worker once its RSS passes this many MB (0 = never)")
+    parser.add_argument("--report", help="write one JSON record per job to this JSON Lines file")
+    parser.add_argument("--cache-dir", help="reuse PDFs from this render cache directory for unchanged resumes")
+    parser.add_argument("--cache-max-mb", type=float, default=512, help="size limit of the render cache (default: 512)")
+    parser.add_argument("--subset-cache-dir", help="keep font subsets in this directory so later runs can reuse them")
+    args = parser.parse_args(argv)
+
+    input_files = collect_input_files(args.inputs)
+    if not input_files:
+        print("No resume files found.")
+        return 1
+
+    summary = run_batch(input_files, args.output_dir, workers=args.workers,
+                        max_jobs_per_worker=args.max_jobs_per_worker, max_rss_mb=args.max_rss_mb,
+                        report_path=args.report, cache_dir=args.cache_dir,
+                        cache_max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                        subset_cache_dir=args.subset_cache_dir)
+    print(f"Rendered {summary['succeeded']}/{summary['total']} resumes ({summary['failed']} failed) "
+          f"in {summary['seconds']}s with {summary['workers']} workers: {summary['resumes_per_sec']} resumes/sec")
+    if "cache" in summary:
+        print(f"Render cache: {summary['cache']['hits']} hits, {summary['cache']['misses']} misses, "
+              f"{summary['cache']['evictions']} evictions")
+    return 0 if summary["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""Performance benchmarks for the resume renderer.
+
+Run ``python -m benchmarks`` from the repository root; see benchmarks/run.py.
+"""
@@ -0,0 +1,253 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import PROFILES, generate_profile
+
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.10  # a phase regresses when its median gets this much slower than the baseline
+DEFAULT_MIN_DELTA_MS = 1.0  # ... and by at least this many milliseconds, so sub-millisecond noise isn't flagged
+
+# Phases timed for every profile, in the order they are reported
+PHASES = ("fonts", "load", "layout", "subsetting", "output", "output_cached_subsets")
+
+
+class _TimedSubsetCache:
+    # Wraps a SubsetCache and adds up the time spent in subset(), so subsetting can be
+    # reported separately from the rest of FPDF.output()
+    def __init__(self, cache):
+        self.cache = cache
+        self.seconds = 0.0
+
+    def subset(self, font):
+        start = time.perf_counter()
+        try:
+            return self.cache.subset(font)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+def _producer_with(subset_cache):
+    from subset_cache import SubsetCachingOutputProducer
+    return type("BenchmarkOutputProducer", (SubsetCachingOutputProducer,), {"subset_cache": subset_cache})
+
+
+def _new_pdf():
+    from render_cache import FIXED_CREATION_DATE
+    from resume_generator import ResumePDF
+
+    pdf_instance = ResumePDF(unit="mm", format="A4")
+    pdf_instance.set_creation_date(FIXED_CREATION_DATE)
+    return pdf_instance
+
+
+def _run_once(json_path, warm_subsets):
+    # One full pass over every phase; returns {phase: seconds} and the page count
+    from font_registry import FontRegistry
+    from resume_generator import generate_resume_pdf, load_resume_data
+    from subset_cache import SubsetCache
+
+    timings = {}
+    start = time.perf_counter()
+    FontRegistry().warm_up()
+    timings["fonts"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # load_resume_data prints a status line
+        loaded = load_resume_data(json_path)
+    timings["load"] = time.perf_counter() - start
+
+    pdf_instance = _new_pdf()
+    start = time.perf_counter()
+    generate_resume_pdf(loaded, pdf_instance)
+    timings["layout"] = time.perf_counter() - start
+    pages = pdf_instance.pages_count
+
+    # Cold subset cache: fontTools runs, and its share of output() is reported as "subsetting"
+    cold = _TimedSubsetCache(SubsetCache())
+    start = time.perf_counter()
+    pdf_instance.output(output_producer_class=_producer_with(cold))
+    timings["subsetting"] = cold.seconds
+    timings["output"] = time.perf_counter() - start - cold.seconds
+
+    # Warm subset cache: what repeated renders of the same resume pay
+    pdf_instance = _new_pdf()
+    generate_resume_pdf(loaded, pdf_instance)
+    start = time.perf_counter()
+    pdf_instance.output(output_producer_class=_producer_with(warm_subsets))
+    timings["output_cached_subsets"] = time.perf_counter() - start
+    return timings, pages
+
+
+def _peak_memory_kb(json_path):
+    # Peak traced allocation of one load + layout + output, measured apart from the timed runs
+    from resume_generator import generate_resume_pdf, load_resume_data
+    from subset_cache import SubsetCache
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded = load_resume_data(json_path)
+        pdf_instance = _new_pdf()
+        generate_resume_pdf(loaded, pdf_instance)
+        pdf_instance.output(output_producer_class=_producer_with(SubsetCache()))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def _section_breakdown(data):
+    # Milliseconds and call counts per resume section, from one instrumented layout
+    from render_metrics import RenderInstrumentation
+    from resume_generator import generate_resume_pdf
+
+    instrumentation = RenderInstrumentation()
+    generate_resume_pdf(data, _new_pdf(), instrumentation)
+    return {record["section"]: {
+        "ms": round(record["seconds"] * 1000, 3),
+        "cells": record["cells"],
+        "multi_cells": record["multi_cells"],
+        "page_breaks": record["page_breaks"],
+    } for record in instrumentation.records}
+
+
+def benchmark_profile(profile, repeats=DEFAULT_REPEATS, seed=0):
+    from font_registry import FONT_REGISTRY
+    from resume_generator import generate_resume_pdf, save_resume_data
+    from subset_cache import SubsetCache
+
+    data = generate_profile(profile, seed=seed)
+    FONT_REGISTRY.warm_up()  # layout uses the shared registry; cold font parsing is timed on its own
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, f"{profile}.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            save_resume_data(data, json_path)
+
+        warm_subsets = SubsetCache()
+        pdf_instance = _new_pdf()
+        generate_resume_pdf(data, pdf_instance)
+        pdf_instance.output(output_producer_class=_producer_with(warm_subsets))  # warm-up run, fills the cache
+
+        samples = {phase: [] for phase in PHASES}
+        for _ in range(repeats):
+            timings, pages = _run_once(json_path, warm_subsets)
+            for phase, seconds in timings.items():
+                samples[phase].append(seconds * 1000)
+        peak_kb = _peak_memory_kb(json_path)
+        sections = _section_breakdown(data)
+        json_bytes = os.path.getsize(json_path)
+
+    return {
+        "pages": pages,
+        "json_bytes": json_bytes,
+        "peak_memory_kb": peak_kb,
+        "phases": {phase: {
+            "median_ms": round(statistics.median(values), 3),
+            "min_ms": round(min(values), 3),
+            "max_ms": round(max(values), 3),
+        } for phase, values in samples.items()},
+        "sections": sections,
+    }
+
+
+def run(profiles=None, repeats=DEFAULT_REPEATS, seed=0):
+    import fpdf
+
+    results = {}
+    for profile in profiles or PROFILES:
+        results[profile] = benchmark_profile(profile, repeats=repeats, seed=seed)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fpdf": fpdf.__version__,
+            "repeats": repeats,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    # Returns one dict per phase (and peak memory) measured in both runs, with "regression" set when
+    # the current value is more than `threshold` worse than the baseline (and, for timings, min_delta_ms slower)
+    rows = []
+    for profile, result in current["results"].items():
+        old = baseline.get("results", {}).get(profile)
+        if old is None:
+            continue
+        pairs = [(phase, old["phases"][phase]["median_ms"], stats["median_ms"])
+                 for phase, stats in result["phases"].items() if phase in old.get("phases", {})]
+        if "peak_memory_kb" in old:
+            pairs.append(("peak_memory_kb", old["peak_memory_kb"], result["peak_memory_kb"]))
+        for metric, before, after in pairs:
+            change = (after - before) / before if before else 0.0
+            regression = change > threshold and (metric == "peak_memory_kb" or after - before >= min_delta_ms)
+            rows.append({"profile": profile, "metric": metric, "baseline": before, "current": after,
+                         "change": round(change, 4), "regression": regression})
+    return rows
+
+
+def print_results(report):
+    for profile, result in report["results"].items():
+        print(f"{profile}: {result['pages']} page(s), {result['json_bytes']} bytes of JSON, "
+              f"peak {result['peak_memory_kb']:.0f} KB")
+        for phase, stats in result["phases"].items():
+            print(f"  {phase:<22} {stats['median_ms']:9.2f} ms  (min {stats['min_ms']:.2f}, max {stats['max_ms']:.2f})")
+        slowest = sorted(result["sections"].items(), key=lambda item: item[1]["ms"], reverse=True)[:3]
+        print("  slowest sections: " + ", ".join(f"{name} {stats['ms']:.1f} ms" for name, stats in slowest))
+
+
+def print_comparison(rows, threshold):
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"  {row['profile']:<13} {row['metric']:<22} {row['baseline']:>10.2f} -> {row['current']:>10.2f} "
+              f"({row['change'] * 100:+6.1f}%) {flag}")
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{regressions} regression(s) over {threshold * 100:.0f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Time resume loading, layout, output, fonts and subsetting.")
+    parser.add_argument("-p", "--profile", action="append", choices=sorted(PROFILES),
+                        help="workload to run (repeatable; default: all)")
+    parser.add_argument("-n", "--repeats", type=int, default=DEFAULT_REPEATS, help="timed runs per profile")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic resumes")
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default: 0.10)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="smallest slowdown in ms that counts as a regression (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    report = run(args.profile, repeats=args.repeats, seed=args.seed)
+    print_results(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to '{args.output}'")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold, args.min_delta_ms)
+        print(f"Compared with '{args.compare}':")
+        print_comparison(rows, args.threshold)
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
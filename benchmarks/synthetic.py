@@ -0,0 +1,90 @@
+import random
+
+# Text pools. Every character here is covered by the bundled DejaVu fonts, so Unicode-heavy
+# resumes exercise multi-byte text and larger font subsets without triggering missing-glyph warnings.
+ASCII_WORDS = (
+    "built designed migrated scaled led owned shipped reduced improved automated platform service "
+    "pipeline latency throughput cluster billing search payments analytics dashboard team customers "
+    "reliability on-call incident review roadmap backend frontend api database cache queue release"
+).split()
+UNICODE_WORDS = (
+    "Zürich München Kraków Łódź São Paulo Ærøskøbing naïve façade résumé coöperate "
+    "Αθήνα Θεσσαλονίκη λογισμικό Москва Новосибирск разработка Київ Ереван "
+    "→ • ★ ✓ ± × ≈ ≤ ≥ € £ ¥ № ½ ¾ ™ ©"
+).split()
+SKILL_POOL = (
+    "Python", "Go", "Rust", "Java", "Kotlin", "TypeScript", "SQL", "PostgreSQL", "Redis", "Kafka",
+    "Kubernetes", "Terraform", "AWS", "GCP", "Docker", "React", "Spark", "Airflow", "gRPC", "Linux",
+)
+
+# Named workloads: how many entries, how long the text is and how much of it is non-ASCII
+PROFILES = {
+    "small": {"entries": 2, "bullets": 3, "bullet_words": 12, "skills": 8, "unicode_ratio": 0.0},
+    "medium": {"entries": 6, "bullets": 5, "bullet_words": 20, "skills": 20, "unicode_ratio": 0.0},
+    "large": {"entries": 25, "bullets": 8, "bullet_words": 30, "skills": 60, "unicode_ratio": 0.0},
+    "unicode": {"entries": 6, "bullets": 5, "bullet_words": 20, "skills": 20, "unicode_ratio": 0.5},
+    "long_bullets": {"entries": 4, "bullets": 4, "bullet_words": 150, "skills": 10, "unicode_ratio": 0.1},
+}
+
+
+def _words(rng, count, unicode_ratio):
+    return " ".join(rng.choice(UNICODE_WORDS) if rng.random() < unicode_ratio else rng.choice(ASCII_WORDS)
+                    for _ in range(count))
+
+
+def _sentence(rng, count, unicode_ratio):
+    text = _words(rng, count, unicode_ratio)
+    return text[:1].upper() + text[1:] + "."
+
+
+def _dates(rng):
+    start = rng.randint(1995, 2022)
+    return f"{start} - {rng.choice([str(start + rng.randint(1, 4)), 'Present'])}"
+
+
+def generate_resume(seed=0, entries=6, bullets=5, bullet_words=20, skills=20, unicode_ratio=0.0):
+    """Returns a resume dict in the shape generate_resume_pdf() reads.
+
+    The same arguments always give the same resume. `entries` sets the number of
+    experience entries; the other sections scale with it.
+    """
+    rng = random.Random(seed)
+    name = _words(rng, 2, unicode_ratio).title()
+
+    def described(count, fields):
+        return [dict({key: make(rng) for key, make in fields.items()},
+                     description=[_sentence(rng, bullet_words, unicode_ratio) for _ in range(bullets)])
+                for _ in range(count)]
+
+    return {
+        "name": name,
+        "email": f"candidate{seed}@example.com",
+        "phone": f"555-{rng.randint(0, 9999):04d}",
+        "linkedin": f"linkedin.com/in/candidate{seed}",
+        "summary": " ".join(_sentence(rng, 15, unicode_ratio) for _ in range(3)),
+        "education": [{"degree": _words(rng, 4, unicode_ratio).title(), "university": _words(rng, 3, unicode_ratio).title(),
+                       "year": str(rng.randint(1990, 2024))} for _ in range(max(1, entries // 4))],
+        "experience": described(entries, {
+            "title": lambda r: _words(r, 2, unicode_ratio).title(),
+            "company": lambda r: _words(r, 2, unicode_ratio).title(),
+            "dates": _dates,
+        }),
+        "projects": described(max(1, entries // 2), {
+            "name": lambda r: _words(r, 3, unicode_ratio).title(),
+            "link": lambda r: f"github.com/candidate{seed}/project{r.randint(0, 999)}",
+            "dates": _dates,
+        }),
+        "awards": [{"name": _words(rng, 3, unicode_ratio).title(), "body": _words(rng, 3, unicode_ratio).title(),
+                    "date": str(rng.randint(2000, 2024))} for _ in range(max(1, entries // 3))],
+        "volunteer_work": described(max(1, entries // 3), {
+            "role": lambda r: _words(r, 2, unicode_ratio).title(),
+            "organization": lambda r: _words(r, 3, unicode_ratio).title(),
+            "dates": _dates,
+        }),
+        "skills": rng.sample(SKILL_POOL, min(skills, len(SKILL_POOL)))
+                  + [f"{rng.choice(SKILL_POOL)} {i}" for i in range(len(SKILL_POOL), skills)],
+    }
+
+
+def generate_profile(profile, seed=0):
+    return generate_resume(seed=seed, **PROFILES[profile])
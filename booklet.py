@@ -0,0 +1,50 @@
+from resume_generator import check_resume, generate_resume_pdf, prepare_resume_text, resolve_layout
+
+
+def render_booklet(resumes, stream=None, layout=None, title=None, on_error=None, creation_date=None):
+    """Lays out many resumes, one after another, in a single PDF with a bookmark per candidate.
+
+    resumes is an iterable of resume dicts, or of (label, dict) pairs where
+    the label names the resume in error reports. Each resume starts on a new
+    page and is drawn exactly as generate_resume_pdf draws it alone, but all
+    of them go into one document: every font face is embedded once, with one
+    subset holding the glyphs of every page, instead of once per resume as
+    when separately rendered PDFs are concatenated. The outline has one entry
+    per candidate, named after them, pointing at their first page, and the
+    viewer opens with it shown.
+
+    Resumes that fail check_resume() are left out and reported to
+    on_error(label, message), labelled by their position (from 1) when no
+    label is given; without on_error the first one raises ValueError.
+    Returns (bytes or bytes written to `stream`, number of resumes included).
+    """
+    from resume_generator import ResumePDF
+
+    layout = resolve_layout(layout)
+    pdf_instance = ResumePDF(unit="mm", format=layout["format"])
+    pdf_instance.page_mode = "USE_OUTLINES"
+    if title:
+        pdf_instance.set_title(title)
+    if creation_date is not None:
+        pdf_instance.set_creation_date(creation_date)
+
+    included = 0
+    for position, item in enumerate(resumes, 1):
+        label, data = item if isinstance(item, tuple) else (str(position), item)
+        data, problems = check_resume(data)
+        if problems:
+            message = "invalid resume data: " + "; ".join(problems)
+            if on_error is None:
+                raise ValueError(f"{label}: {message}")
+            on_error(label, message)
+            continue
+        # Fonts are installed on the first resume only (FONT_REGISTRY.install skips faces the document
+        # already has), so every later one keeps adding glyphs to the same subsets
+        generate_resume_pdf(data, pdf_instance, layout=layout, prepared=prepare_resume_text(data),
+                            bookmark=data["name"])
+        included += 1
+    if not included:
+        raise ValueError("no resumes to put in the booklet")
+    if stream is None:
+        return bytes(pdf_instance.output()), included
+    return pdf_instance.output_to(stream), included
@@ -0,0 +1,207 @@
+import copy
+import hashlib
+import os
+import threading
+import time
+from array import array
+from io import BytesIO
+from types import SimpleNamespace
+
+from fontTools import ttLib
+from fpdf.fonts import SubsetMap, TTFFont
+
+FONT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (family, style, file) for every face generate_resume_pdf uses
+RESUME_FONTS = (
+    ("DejaVu", "", "DejaVuSans.ttf"),
+    ("DejaVu", "B", "DejaVuSans-Bold.ttf"),
+)
+
+
+def _resolve_font_path(fname):
+    # Same lookup order as FPDF.add_font (current directory first), then the script directory
+    if os.path.exists(fname):
+        return fname
+    return os.path.join(FONT_DIR, fname)
+
+
+# Width tables cover the Basic Multilingual Plane; rarer characters are looked up in the font's dict
+WIDTH_TABLE_SIZE = 0x10000
+# Words whose widths are remembered per face; the memo is emptied when it grows past this
+WORD_MEMO_SIZE = 100000
+
+
+class TableWidthTTFFont(TTFFont):
+    """TTFFont that measures text with an array-backed glyph width table.
+
+    fpdf2's line breaking re-measures the current line once per character
+    added to it, and TTFFont.get_text_width() looks every character up in the
+    cw dict from Python, which dominates the layout of long bullet lists.
+    Here the widths (in 1/1000 em, from hmtx via cw) sit in an array indexed
+    by code point and are summed with map() in C. The result is the same
+    integer sum, scaled the same way, so lines break exactly where they did.
+
+    Widths are kept unscaled, one table per face rather than per font size:
+    scaling happens on the summed integer exactly as fpdf2 does it, which keeps
+    every width bit-for-bit equal to fpdf2's. word_units() adds a memo of
+    whole-word widths for text_layout.break_lines().
+    """
+
+    widths = None  # set per face by FontRegistry
+    word_memo = None  # shared by a face's copies, like widths
+    file_digest = None  # sha256 of the font file bytes the face was parsed from
+
+    def get_text_width(self, text, font_size_pt, text_shaping_params):
+        if text_shaping_params:
+            return super().get_text_width(text, font_size_pt, text_shaping_params)
+        return (len(text), self.text_units(text) * font_size_pt * 0.001)
+
+    def text_units(self, text):
+        # Width of `text` (a string or list of characters) in 1/1000 em
+        try:
+            return sum(map(self.widths.__getitem__, map(ord, text)))
+        except IndexError:
+            return sum(self.cw[ord(c)] for c in text)
+
+    def char_units(self, character):
+        code_point = ord(character)
+        return self.widths[code_point] if code_point < WIDTH_TABLE_SIZE else self.cw[code_point]
+
+    def word_units(self, word):
+        units = self.word_memo.get(word)
+        if units is None:
+            units = self.text_units(word)
+            if len(self.word_memo) >= WORD_MEMO_SIZE:
+                self.word_memo.clear()
+            self.word_memo[word] = units
+        return units
+
+
+def build_width_table(font):
+    # Glyph widths of `font` (a TTFFont) for every BMP code point; characters the font lacks get its default width
+    default_width = font.cw.default_factory()
+    widths = array("H", [default_width]) * WIDTH_TABLE_SIZE
+    for code_point, width in font.cw.items():
+        if code_point < WIDTH_TABLE_SIZE:
+            widths[code_point] = width
+    return widths
+
+
+class FontRegistry:
+    """Parses each TTF face once per process and hands per-document copies to FPDF instances.
+
+    fpdf2 subsets and closes ``font.ttfont`` when a document is written, and keeps
+    per-document glyph mappings on the font object, so documents cannot share one
+    TTFFont. What they can share is the expensive part of TTFFont.__init__: the
+    cmap, the width table and the font descriptor. Each installed copy gets those
+    by reference plus a fresh SubsetMap and a lazily opened TTFont over the
+    in-memory file bytes.
+    """
+
+    def __init__(self):
+        self._faces = {}  # (family, style) -> (template TTFFont, raw font bytes)
+        self._lock = threading.Lock()
+        self.parse_count = 0
+
+    def warm_up(self, fonts=RESUME_FONTS):
+        # Parses any face in `fonts` that isn't loaded yet. Safe to call repeatedly.
+        for family, style, fname in fonts:
+            self._get_face(family, style, fname)
+
+    def invalidate(self, family=None):
+        # Drops parsed faces (all of them, or one family) so the next install re-reads the files
+        with self._lock:
+            if family is None:
+                self._faces.clear()
+            else:
+                for key in [k for k in self._faces if k[0] == family]:
+                    del self._faces[key]
+
+    def is_loaded(self, family, style=""):
+        return (family, style) in self._faces
+
+    def install(self, pdf_obj, fonts=RESUME_FONTS):
+        # Equivalent to calling pdf_obj.add_font() for each face, without re-parsing the files
+        for family, style, fname in fonts:
+            fontkey = f"{family.lower()}{style}"
+            if fontkey in pdf_obj.fonts:
+                continue
+            template, raw = self._get_face(family, style, fname)
+            pdf_obj.fonts[fontkey] = self._clone_for(pdf_obj, template, raw)
+
+    def _get_face(self, family, style, fname):
+        key = (family, style)
+        face = self._faces.get(key)
+        if face is not None:
+            return face
+        with self._lock:
+            face = self._faces.get(key)
+            if face is None:
+                path = _resolve_font_path(fname)
+                with open(path, "rb") as f:
+                    raw = f.read()
+                fontkey = f"{family.lower()}{style}"
+                template = TableWidthTTFFont(SimpleNamespace(fonts={}), path, fontkey, style)
+                template.widths = build_width_table(template)
+                template.word_memo = {}
+                template.file_digest = hashlib.sha256(raw).hexdigest()  # keys its subsets in SubsetCache
+                face = (template, raw)
+                self._faces[key] = face
+                self.parse_count += 1
+        return face
+
+    @staticmethod
+    def _clone_for(pdf_obj, template, raw):
+        font = copy.copy(template)
+        font.i = len(pdf_obj.fonts) + 1
+        # Output mutates the descriptor (font_name, object id), so it can't be shared
+        font.desc = copy.copy(template.desc)
+        font.missing_glyphs = []
+        font.ttfont = ttLib.TTFont(BytesIO(raw), recalcTimestamp=False, fontNumber=0, lazy=True)
+        font.subset = SubsetMap(font)
+        return font
+
+
+# Shared by every render in this process
+FONT_REGISTRY = FontRegistry()
+
+
+def _benchmark(renders=20):
+    # Compares add_font() against registry installs on the sample resume layout
+    from fpdf import FPDF
+    from resume_generator import generate_resume_pdf
+
+    sample = {
+        "name": "Jane Doe", "email": "jane@example.com", "phone": "555-0100",
+        "linkedin": "linkedin.com/in/janedoe", "summary": "Engineer. " * 20,
+        "education": [{"degree": "BSc Computer Science", "university": "State University", "year": "2015"}],
+        "experience": [{"title": "Developer", "company": "Acme", "dates": "2015 - 2024",
+                        "description": ["Built things"] * 5}],
+        "projects": [], "awards": [], "volunteer_work": [], "skills": ["Python", "SQL"],
+    }
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        pdf = FPDF(unit="mm", format="A4")
+        for family, style, fname in RESUME_FONTS:
+            pdf.add_font(family, style, _resolve_font_path(fname))
+        generate_resume_pdf(sample, pdf)
+        pdf.output()
+    cold = time.perf_counter() - start
+
+    FONT_REGISTRY.warm_up()
+    start = time.perf_counter()
+    for _ in range(renders):
+        pdf = FPDF(unit="mm", format="A4")
+        generate_resume_pdf(sample, pdf)
+        pdf.output()
+    warm = time.perf_counter() - start
+
+    print(f"add_font per render: {cold / renders * 1000:.1f} ms/resume")
+    print(f"font registry:       {warm / renders * 1000:.1f} ms/resume")
+    print(f"speedup:             {cold / warm:.2f}x")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,69 @@
+import threading
+
+
+class FormModel:
+    """Cached resume data dict for the GUI form, kept up to date one section at a time.
+
+    Each section (personal info, summary, education, ...) has a reader that
+    returns that section's part of the data dict from the widgets. Widget change
+    events call mark_dirty(section); get_data() re-reads only the dirty sections
+    and reuses the cached values of the rest. The model doesn't know about Tk,
+    so it can be driven by any widget toolkit (or none).
+
+    The returned dicts share their lists with the cache: treat them as read-only.
+    """
+
+    def __init__(self, readers):
+        # readers: {section name: callable returning a dict of data keys}, in data-key order
+        self._readers = dict(readers)
+        self._cache = {}
+        self._dirty = set(self._readers)
+        self._listeners = []
+        self._lock = threading.Lock()
+        self.version = 0 # bumped on every change
+        self.saved_version = 0 # version of the data last written to disk
+
+    def subscribe(self, listener):
+        # listener(section) is called after every mark_dirty
+        self._listeners.append(listener)
+
+    def mark_dirty(self, section):
+        with self._lock:
+            self._dirty.add(section)
+            self.version += 1
+        for listener in self._listeners:
+            listener(section)
+
+    def mark_all_dirty(self):
+        with self._lock:
+            self._dirty.update(self._readers)
+            self.version += 1
+
+    def is_dirty(self, section=None):
+        if section is None:
+            return bool(self._dirty)
+        return section in self._dirty
+
+    def get_data(self):
+        # Must be called on the thread that owns the widgets, since dirty sections are re-read from them
+        with self._lock:
+            dirty = list(self._dirty)
+            self._dirty.clear()
+        for section in dirty:
+            self._cache[section] = self._readers[section]()
+        data = {}
+        for section in self._readers:
+            data.update(self._cache[section])
+        return data
+
+    def has_unsaved_changes(self):
+        return self.version != self.saved_version
+
+    def mark_saved(self, version=None):
+        # Records that the data as of `version` (default: now) has been written to disk. A save that
+        # finishes after a newer one (a slow autosave) doesn't move saved_version back.
+        with self._lock:
+            if version is None:
+                self.saved_version = self.version
+            else:
+                self.saved_version = max(self.saved_version, version)
@@ -0,0 +1,218 @@
+import time
+
+from resume_generator import resolve_layout
+
+# Steps searched by fit_layout(), largest first. Font scale multiplies every font size (and the line
+# pitch with it); spacing scale multiplies line pitch and the gaps between sections and entries.
+# Below 0.75 spacing, lines of text would start to touch.
+FONT_SCALES = tuple(round(1 - 0.025 * i, 3) for i in range(13))  # 100% down to 70%
+SPACING_SCALES = (1.0, 0.95, 0.9, 0.85, 0.8, 0.75)
+
+
+def scaled_layout(layout, font_scale, spacing_scale):
+    # Returns the full settings of `layout` with fonts and spacing scaled
+    settings = dict(resolve_layout(layout))
+    for key in ("name_size", "contact_size", "header_size", "body_size", "bullet_indent"):
+        settings[key] = round(settings[key] * font_scale, 3)
+    for key in ("line_height", "name_height", "header_height"):
+        settings[key] = round(settings[key] * font_scale * spacing_scale, 3)
+    for key in ("header_gap", "entry_gap"):
+        settings[key] = round(settings[key] * spacing_scale, 3)
+    return settings
+
+
+class PageMeasurer:
+    """Counts the pages generate_resume_pdf would produce, without drawing anything.
+
+    measure() replays the renderer's vertical layout (cells, line feeds, page
+    breaks) from the same compiled plan (render_plan.py), with plain
+    arithmetic. Paragraphs are wrapped by text_layout.break_lines(), the same
+    line breaking ResumePDF draws with, so a measurement costs a few percent
+    of a render. Wrapped line counts are
+    memoized by (text, font size, width), so probes that only change spacing,
+    and repeated measurements of the same resume, reuse them. Use one instance
+    per thread.
+    """
+
+    def __init__(self):
+        from fpdf.line_break import SOFT_HYPHEN
+        from font_registry import FONT_REGISTRY
+        from resume_generator import ResumePDF
+        from text_layout import break_lines
+
+        pdf_obj = ResumePDF(unit="mm")
+        FONT_REGISTRY.install(pdf_obj)
+        self._break_lines = break_lines
+        self._font = pdf_obj.fonts["dejavu"]  # the regular face every paragraph is set in
+        self._k = pdf_obj.k
+        self._c_margin = pdf_obj.c_margin
+        self._default_margin = pdf_obj.l_margin
+        self._soft_hyphen = SOFT_HYPHEN
+        self._page_sizes = {}
+        self._fallback_pdf = None
+        self._lines = {}
+        self.measurements = 0
+
+    def _page_size(self, page_format):
+        size = self._page_sizes.get(page_format)
+        if size is None:
+            from fpdf import FPDF
+            pdf_obj = FPDF(unit="mm", format=page_format)
+            size = self._page_sizes[page_format] = (pdf_obj.w, pdf_obj.h)
+        return size
+
+    def count_lines(self, text, size, max_width):
+        # Number of lines multi_cell(w, h, text) wraps `text` into at font `size` when the cell is
+        # `max_width` wide, and whether it ends with a newline (which adds a line feed)
+        key = (text, size, max_width)
+        result = self._lines.get(key)
+        if result is None:
+            result = self._lines[key] = self._wrap(text, size, max_width)
+        return result
+
+    def _wrap(self, text, size, cell_width):
+        text = text.replace("\r", "")
+        if self._soft_hyphen in text:
+            return self._wrap_with_fpdf(text, size, cell_width)
+        lines = self._break_lines(text, self._font, size, self._k, cell_width - self._c_margin - self._c_margin)
+        if lines is None:
+            raise ValueError("not enough horizontal space to render a single character")
+        return max(len(lines), 1), text.endswith("\n")
+
+    def _wrap_with_fpdf(self, text, size, cell_width):
+        # Soft hyphens (rare in resumes) get fpdf's own, slower, line breaking
+        from resume_generator import ResumePDF
+        from font_registry import FONT_REGISTRY
+
+        if self._fallback_pdf is None:
+            self._fallback_pdf = ResumePDF(unit="mm")
+            FONT_REGISTRY.install(self._fallback_pdf)
+            self._fallback_pdf.add_page()
+        self._fallback_pdf.set_font("DejaVu", size=size)
+        lines = self._fallback_pdf.multi_cell(cell_width, 5, text, dry_run=True, output="LINES")
+        return len(lines), text.endswith("\n")
+
+    def measure(self, prepared, layout=None):
+        # Returns the page count of generate_resume_pdf(data, pdf, layout=layout) for prepared
+        # text from prepare_resume_text(). Walks the same compiled plan (see render_plan.py).
+        from render_plan import get_plan
+
+        layout = resolve_layout(layout)
+        self.measurements += 1
+        page_width, page_height = self._page_size(layout["format"])
+        if layout["margins"] is None:
+            left = top = right = self._default_margin
+        else:
+            left, top, right = layout["margins"]
+        trigger = page_height - layout["page_break_margin"]
+        y = top
+        pages = 1
+
+        def cell(height):
+            nonlocal y, pages
+            if y + height > trigger:
+                pages += 1
+                y = top
+            y += height
+
+        def multi_cell(text, x, height, size):
+            nonlocal y
+            lines, trailing_newline = self.count_lines(text, size, page_width - right - x)
+            for _ in range(lines):
+                cell(height)
+            if trailing_newline:
+                y += height
+
+        def run_steps(steps, source):
+            # Only what moves the cursor down matters here; fonts, colors and rules are skipped
+            nonlocal y
+            for step in steps:
+                kind = step[0]
+                if kind == "cell" or kind == "label":
+                    cell(step[1])
+                elif kind == "ln":
+                    y += step[1]
+                elif kind == "paragraph":
+                    multi_cell(source[step[2]], left, step[1], step[3])
+                elif kind == "bullets":
+                    for item in source[step[2]] or ():
+                        multi_cell(item, left + step[3], step[1], step[4])
+
+        header_steps, sections = get_plan(layout)
+        run_steps(header_steps, prepared)
+        for section_name, first_steps, repeat_steps in sections:
+            content = prepared[section_name]
+            if not content:
+                continue
+            if repeat_steps is None:
+                run_steps(first_steps, (content,))
+                continue
+            run_steps(first_steps, content[0])
+            for entry in content[1:]:
+                run_steps(repeat_steps, entry)
+        return pages
+
+
+def fit_layout(data, pages=1, layout=None, measurer=None):
+    """Finds the largest fonts and spacing that fit a resume on `pages` pages.
+
+    Starts from `layout` (a LAYOUTS name or settings dict) and only ever
+    shrinks it: if the resume already fits, the layout is returned unchanged.
+    Otherwise the font scale is binary-searched at the tightest spacing, then
+    the spacing at that font scale, measuring each probe with a PageMeasurer
+    instead of rendering it. Returns (settings, report); report has the
+    scales chosen, the measured page count, whether it fits (False when even
+    the smallest settings need more pages; the smallest are returned then),
+    the number of probes and the seconds spent.
+    """
+    from resume_generator import prepare_resume_text
+    from resume_schema import check_resume
+
+    start = time.perf_counter()
+    data, problems = check_resume(data)
+    if problems:
+        raise ValueError("invalid resume data: " + "; ".join(problems))
+    if pages < 1:
+        raise ValueError("pages must be at least 1")
+    measurer = measurer or PageMeasurer()
+    prepared = prepare_resume_text(data)
+    base = resolve_layout(layout)
+    probes = {}
+
+    def probe(font_scale, spacing_scale):
+        key = (font_scale, spacing_scale)
+        if key not in probes:
+            settings = base if key == (1.0, 1.0) else scaled_layout(base, font_scale, spacing_scale)
+            probes[key] = (measurer.measure(prepared, settings), settings)
+        return probes[key][0] <= pages
+
+    def largest_fitting(scales, fits):
+        # Index of the first (largest) scale for which fits() holds, assuming it keeps holding below it
+        low, high = 0, len(scales) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if fits(scales[middle]):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    tightest = SPACING_SCALES[-1]
+    if probe(1.0, 1.0):
+        chosen = (1.0, 1.0)
+    elif not probe(FONT_SCALES[-1], tightest):
+        chosen = (FONT_SCALES[-1], tightest)
+    else:
+        font_scale = FONT_SCALES[largest_fitting(FONT_SCALES, lambda scale: probe(scale, tightest))]
+        spacing_scale = SPACING_SCALES[largest_fitting(SPACING_SCALES, lambda scale: probe(font_scale, scale))]
+        chosen = (font_scale, spacing_scale)
+
+    measured_pages, settings = probes[chosen]
+    return settings, {
+        "font_scale": chosen[0],
+        "spacing_scale": chosen[1],
+        "pages": measured_pages,
+        "fits": measured_pages <= pages,
+        "probes": len(probes),
+        "seconds": time.perf_counter() - start,
+    }
@@ -0,0 +1,82 @@
+import hashlib
+from functools import partial
+
+from subset_cache import SubsetCachingOutputProducer
+
+# Small objects are gathered into one write of about this size; larger ones are written straight through
+CHUNK_SIZE = 64 * 1024
+
+
+class StreamBuffer:
+    """Stands in for OutputProducer.buffer and writes the document to a stream as it is serialized.
+
+    fpdf2 only appends to its output buffer (buffer += data) and asks for its
+    length (object offsets for the xref table) and, for the default /ID, its
+    MD5, so this keeps a running byte count and hash instead of the bytes. Small
+    appends are collected in one reused bytearray and written in CHUNK_SIZE
+    pieces. Like io.RawIOBase.write, stream.write must not keep a reference to
+    the buffer it is given.
+    """
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.md5 = hashlib.new("md5", usedforsecurity=False)
+        self._pending = bytearray()
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def __iadd__(self, data):
+        self.size += len(data)
+        self.md5.update(data)
+        if len(data) >= self.chunk_size:
+            self.flush()
+            self.stream.write(data)
+        else:
+            self._pending += data
+            if len(self._pending) >= self.chunk_size:
+                self.flush()
+        return self
+
+    def flush(self):
+        if self._pending:
+            self.stream.write(self._pending)
+            self._pending.clear()
+
+
+class StreamingOutputProducer(SubsetCachingOutputProducer):
+    """SubsetCachingOutputProducer that writes to a stream instead of building a bytearray.
+
+    Pass it to FPDF.output() bound to a stream, as ResumePDF.output_to() does:
+    output(output_producer_class=partial(StreamingOutputProducer, stream=f)).
+    Signed documents need the whole buffer and are not supported.
+    """
+
+    def __init__(self, fpdf, stream):
+        super().__init__(fpdf)
+        if fpdf._sign_key:
+            raise ValueError("signed PDFs can't be streamed; use output() instead")
+        self.buffer = StreamBuffer(stream)
+
+    def bufferize(self):
+        buffer = super().bufferize()
+        buffer.flush()
+        return buffer
+
+
+def streaming_producer(stream):
+    return partial(StreamingOutputProducer, stream=stream)
+
+
+def stream_file_id(fpdf, buffer):
+    # Same value as FPDF._default_file_id() (fpdf2 2.8.3) computes from the whole buffer
+    id_hash = buffer.md5.copy()
+    if fpdf.creation_date:
+        id_hash.update(fpdf.creation_date.strftime("%Y%m%d%H%M%S").encode("utf8"))
+    hash_hex = id_hash.hexdigest().upper()
+    return f"<{hash_hex}><{hash_hex}>"
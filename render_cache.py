@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from font_registry import RESUME_FONTS, _resolve_font_path
+
+DEFAULT_CACHE_DIR = ".render_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Cached PDFs carry this creation date instead of "now", so identical input gives identical bytes
+FIXED_CREATION_DATE = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# Identifies the page setup generate_resume_pdf is driven with by default (the "classic" A4 layout)
+TEMPLATE_ID = "classic-a4"
+
+
+def normalize_resume_data(data):
+    # Keeps only the fields generate_resume_pdf reads, in a fixed order, so unrelated keys
+    # (e.g. hobbies), key order and left-out optional fields don't change the cache key
+    from resume_schema import RESUME_FIELDS, check_resume
+
+    normalized, problems = check_resume(data)
+    if not problems:
+        return normalized
+    normalized = {}
+    for field, entry_keys in RESUME_FIELDS.items():
+        value = data.get(field)
+        if entry_keys is not None and isinstance(value, list):
+            value = [{k: entry.get(k) for k in entry_keys} if isinstance(entry, dict) else entry for entry in value]
+        normalized[field] = value
+    return normalized
+
+
+@lru_cache(maxsize=None)
+def _font_set_fingerprint(fonts=RESUME_FONTS):
+    digest = hashlib.sha256()
+    for family, style, fname in fonts:
+        digest.update(f"{family}/{style}:".encode("utf-8"))
+        with open(_resolve_font_path(fname), "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def layout_template_id(layout=None):
+    # TEMPLATE_ID for the default layout (so existing cache entries stay valid), otherwise a hash of its settings
+    from resume_generator import LAYOUTS, DEFAULT_LAYOUT, resolve_layout
+
+    settings = resolve_layout(layout)
+    if settings == LAYOUTS[DEFAULT_LAYOUT]:
+        return TEMPLATE_ID
+    encoded = json.dumps(settings, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return "layout-" + hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def render_key(data, template_id=TEMPLATE_ID):
+    # Stable hash of the normalized data, the template, the font files and the library versions
+    import fpdf
+    from resume_generator import RENDERER_VERSION
+
+    digest = hashlib.sha256()
+    digest.update(f"renderer={RENDERER_VERSION};fpdf={fpdf.__version__};template={template_id};".encode("utf-8"))
+    digest.update(f"fonts={_font_set_fingerprint()};".encode("utf-8"))
+    digest.update(json.dumps(normalize_resume_data(data), sort_keys=True, ensure_ascii=False,
+                             separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def render_pdf_bytes(data, layout=None):
+    # Renders deterministically: the same data always produces the same bytes
+    from resume_generator import ResumePDF, generate_resume_pdf, resolve_layout
+
+    pdf_instance = ResumePDF(unit="mm", format=resolve_layout(layout)["format"])
+    pdf_instance.set_creation_date(FIXED_CREATION_DATE)
+    generate_resume_pdf(data, pdf_instance, layout=layout)
+    return bytes(pdf_instance.output())
+
+
+class RenderCache:
+    """On-disk cache of rendered PDFs keyed by render_key(), evicted least-recently-used.
+
+    Entries are stored as <key>.pdf files under cache_dir; a hit bumps the file's
+    mtime, and once the directory grows past max_bytes the oldest entries are
+    removed. Several processes may share a directory: writes are atomic renames
+    and a file that disappears under us is just treated as a miss.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".pdf")
+
+    def _entries(self):
+        # (mtime, path, size) for every cached PDF
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pdf"):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, entry.path, st.st_size))
+        return entries
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return pdf_bytes
+
+    def put(self, key, pdf_bytes):
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            with self._lock:
+                # Rewriting an entry replaces its old file, so only the difference is added
+                try:
+                    replaced = os.stat(path).st_size
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp_path, path)
+                self._size += len(pdf_bytes) - replaced
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Rescans the directory (other processes may have written to it) and drops the oldest entries
+        entries = sorted(self._entries())
+        self._size = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+            self.evictions += 1
+
+    def render(self, data, layout=None):
+        # Returns the PDF bytes for data, rendering and storing them only on a miss
+        key = render_key(data, layout_template_id(layout))
+        pdf_bytes = self.get(key)
+        if pdf_bytes is None:
+            pdf_bytes = render_pdf_bytes(data, layout)
+            self.put(key, pdf_bytes)
+        return pdf_bytes
+
+    def render_targets(self, data, targets):
+        # Like resume_generator.render_targets(): returns {name: PDF bytes}, rendering the misses in one call
+        from resume_generator import render_targets, target_name
+
+        keys = [render_key(data, layout_template_id(target)) for target in targets]
+        cached = [self.get(key) for key in keys]
+        missing = [target for target, pdf_bytes in zip(targets, cached) if pdf_bytes is None]
+        rendered = iter(render_targets(data, missing, creation_date=FIXED_CREATION_DATE).values()) if missing else None
+        results = {}
+        for i, (target, key, pdf_bytes) in enumerate(zip(targets, keys, cached)):
+            if pdf_bytes is None:
+                pdf_bytes = next(rendered)
+                self.put(key, pdf_bytes)
+            results[target_name(target, i)] = pdf_bytes
+        return results
+
+    def render_to_file(self, data, output_path):
+        from resume_journal import write_atomic
+
+        write_atomic(output_path, self.render(data))
+
+    def clear(self):
+        with self._lock:
+            for _, path, _ in self._entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries()),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
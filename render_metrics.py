@@ -0,0 +1,175 @@
+import json
+import threading
+import time
+
+# Sections of generate_resume_pdf, in render order ("header" is the page setup, name and contact line)
+SECTIONS = ("header", "summary", "education", "experience", "projects", "awards", "volunteer_work", "skills")
+
+# Methods of the FPDF instance whose calls are counted per section
+COUNTED_METHODS = ("cell", "multi_cell")
+
+
+def _tracemalloc():
+    # Only imported when memory tracing is asked for (it pulls in a few modules of its own)
+    import tracemalloc
+    return tracemalloc
+
+
+def no_section(name):
+    # Stand-in for RenderInstrumentation.section() when a render isn't instrumented
+    pass
+
+
+class RenderInstrumentation:
+    """Collects per-section statistics for one generate_resume_pdf() call.
+
+    Pass an instance as generate_resume_pdf(data, pdf_obj, instrumentation=...).
+    The renderer calls section(name) as it starts each section; every section
+    then gets a record with its wall time, the number of cell()/multi_cell()
+    calls, the page breaks it triggered and, with trace_memory=True, the memory
+    it allocated (via tracemalloc). on_section(record) is called as each
+    section finishes; all records are in .records afterwards.
+
+    Use a new instance for every render.
+    """
+
+    def __init__(self, on_section=None, trace_memory=False):
+        self.on_section = on_section
+        self.trace_memory = trace_memory
+        self.records = []
+        self.pages = 0
+        self._pdf = None
+        self._current = None
+        self._started_tracing = False
+
+    def begin(self, pdf_obj):
+        # Called by generate_resume_pdf before anything is drawn
+        self._pdf = pdf_obj
+        self._counts = dict.fromkeys(COUNTED_METHODS, 0)
+        for method in COUNTED_METHODS:
+            setattr(pdf_obj, method, self._counting(method, getattr(pdf_obj, method)))
+        if self.trace_memory and not _tracemalloc().is_tracing():
+            _tracemalloc().start()
+            self._started_tracing = True
+
+    def _counting(self, method, original):
+        counts = self._counts
+
+        def counted(*args, **kwargs):
+            counts[method] += 1
+            return original(*args, **kwargs)
+        return counted
+
+    def section(self, name):
+        # Closes the running section (if any) and starts timing `name`
+        now = time.perf_counter()
+        self._close(now)
+        if self.trace_memory:
+            _tracemalloc().reset_peak()
+            memory = _tracemalloc().get_traced_memory()[0]
+        else:
+            memory = 0
+        # The document's first page doesn't count as a page break
+        self._current = (name, now, self._pdf.page or 1, dict(self._counts), memory)
+
+    def _close(self, now):
+        if self._current is None:
+            return
+        name, started, page, counts, memory = self._current
+        self._current = None
+        record = {
+            "section": name,
+            "seconds": now - started,
+            "cells": self._counts["cell"] - counts["cell"],
+            "multi_cells": self._counts["multi_cell"] - counts["multi_cell"],
+            "page_breaks": self._pdf.page - page,
+        }
+        if self.trace_memory:
+            current, peak = _tracemalloc().get_traced_memory()
+            record["allocated_bytes"] = current - memory
+            record["peak_bytes"] = peak - memory
+        self.records.append(record)
+        if self.on_section is not None:
+            self.on_section(record)
+
+    def end(self):
+        # Called by generate_resume_pdf when the layout is done; restores the FPDF instance
+        self._close(time.perf_counter())
+        for method in COUNTED_METHODS:
+            self._pdf.__dict__.pop(method, None)
+        self.pages = self._pdf.pages_count
+        if self._started_tracing:
+            _tracemalloc().stop()
+            self._started_tracing = False
+
+    def total_seconds(self):
+        return sum(record["seconds"] for record in self.records)
+
+    def slowest(self):
+        return max(self.records, key=lambda record: record["seconds"], default=None)
+
+
+# --- Exporters ---
+
+def log_line(instrumentation, **fields):
+    # One JSON object per render, for structured logs; extra fields (e.g. input=...) are included as-is
+    entry = {"event": "resume_rendered", **fields,
+             "pages": instrumentation.pages,
+             "layout_ms": round(instrumentation.total_seconds() * 1000, 3),
+             "sections": {}}
+    for record in instrumentation.records:
+        values = {key: value for key, value in record.items() if key != "section"}
+        values["ms"] = round(values.pop("seconds") * 1000, 3)
+        entry["sections"][record["section"]] = values
+    return json.dumps(entry, ensure_ascii=False)
+
+
+class SectionMetrics:
+    """Running per-section totals over many renders, exported in the Prometheus text format.
+
+    observe() takes the records of one render (RenderInstrumentation.records,
+    which are plain dicts and can come from another process). Thread safe.
+    """
+
+    def __init__(self):
+        self.renders = 0
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def observe(self, records):
+        with self._lock:
+            self.renders += 1
+            for record in records:
+                totals = self._totals.setdefault(record["section"], dict.fromkeys(
+                    ("seconds", "cells", "multi_cells", "page_breaks", "allocated_bytes"), 0))
+                for key in totals:
+                    totals[key] += record.get(key, 0)
+
+    def prometheus_lines(self):
+        with self._lock:
+            totals = {section: dict(values) for section, values in self._totals.items()}
+            renders = self.renders
+        metrics = (
+            ("resume_section_seconds_total", "seconds", "counter", "Time spent laying out each resume section."),
+            ("resume_section_cells_total", "cells", "counter", "cell() calls per resume section."),
+            ("resume_section_multi_cells_total", "multi_cells", "counter", "multi_cell() calls per resume section."),
+            ("resume_section_page_breaks_total", "page_breaks", "counter", "Page breaks triggered per resume section."),
+            ("resume_section_allocated_bytes_total", "allocated_bytes", "counter",
+             "Memory allocated per resume section (only when memory tracing is on)."),
+        )
+        lines = [
+            "# HELP resume_layouts_total Resume layouts with section instrumentation.",
+            "# TYPE resume_layouts_total counter",
+            f"resume_layouts_total {renders}",
+        ]
+        for name, key, kind, help_text in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for section in sorted(totals, key=lambda s: SECTIONS.index(s) if s in SECTIONS else len(SECTIONS)):
+                value = totals[section][key]
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f'{name}{{section="{section}"}} {value}')
+        return lines
+
+    def prometheus_text(self):
+        return "\n".join(self.prometheus_lines()) + "\n"
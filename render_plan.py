@@ -0,0 +1,223 @@
+from resume_generator import (SECTION_HEADER_COLOR, SECTION_TITLES, TEXT_COLOR, _BULLET_INDENT_ADJUST,
+                              resolve_layout)
+
+# What generate_resume_pdf draws, as data. Each step is (operation, *arguments): strings naming layout
+# settings ("name_size") are looked up when the plan is compiled, and the text a step draws is a key
+# into what it is drawn from (prepare_resume_text()'s dict for the page header, an entry tuple for
+# entries, a 1-tuple holding the paragraph for summary and skills).
+PAGE_HEADER = (
+    ("font", "B", "name_size"),
+    ("cell", "name_height", "name", "C"),
+    ("font", "", "contact_size"),
+    ("cell", "line_height", "contact", "C"),
+    ("ln", "name_height"),
+)
+SECTION_HEADER = (
+    ("ln", "header_gap"),
+    ("font", "B", "header_size"),
+    ("color", SECTION_HEADER_COLOR),
+    ("title", "header_height"),
+    ("rule",),
+    ("ln", "header_gap"),
+    ("font", "", "body_size"),
+    ("color", TEXT_COLOR),
+)
+PARAGRAPH = (
+    ("paragraph", "line_height", 0),
+)
+PARAGRAPH_SECTIONS = ("summary", "skills")  # the rest are lists of entries
+ENTRY = (
+    ("font", "B", "body_size"),
+    ("cell", "line_height", 0, "L"),
+    ("font", "", "body_size"),
+    ("cell", "line_height", 1, "L"),
+    ("bullets", "line_height", 2),
+    ("ln", "entry_gap"),
+)
+
+# Steps that draw text with the current font and color; the others don't depend on them
+_TEXT_STEPS = ("cell", "label", "paragraph", "bullets")
+
+# Compiled plans kept per process, by layout; emptied when it grows past this many layouts
+PLAN_CACHE_SIZE = 64
+_plans = {}
+
+
+def _compile_steps(steps, layout, section_name, state):
+    # Resolves layout settings in `steps` and tracks the font and color they leave behind.
+    # state is {"font": (style, size) or None, "color": rgb or None}; None means unknown.
+    compiled = []
+    for step in steps:
+        kind = step[0]
+        if kind == "font":
+            state["font"] = (step[1], layout[step[2]])
+            compiled.append(("font", step[1], layout[step[2]]))
+        elif kind == "color":
+            state["color"] = step[1]
+            compiled.append(step)
+        elif kind == "cell":
+            compiled.append(("cell", layout[step[1]], step[2], step[3]))
+        elif kind == "title":
+            compiled.append(("label", layout[step[1]], SECTION_TITLES[section_name], "L"))
+        elif kind == "ln":
+            compiled.append(("ln", layout[step[1]]))
+        elif kind == "paragraph":
+            compiled.append(("paragraph", layout[step[1]], step[2], state["font"][1]))
+        elif kind == "bullets":
+            indent = layout["bullet_indent"] + _BULLET_INDENT_ADJUST.get(section_name, 0)
+            compiled.append(("bullets", layout[step[1]], step[2], indent, state["font"][1]))
+        else:
+            compiled.append(step)
+    return compiled
+
+
+def _elide(compiled, state):
+    # Drops font and color changes that no text is drawn with (another change of the same kind
+    # follows first), then the ones that set what is already current
+    kept = []
+    overridden = set()
+    for step in reversed(compiled):
+        kind = step[0]
+        if kind in ("font", "color"):
+            if kind in overridden:
+                continue
+            overridden.add(kind)
+        elif kind in _TEXT_STEPS:
+            overridden.clear()
+        kept.append(step)
+    kept.reverse()
+    result = []
+    for step in kept:
+        kind = step[0]
+        if kind in ("font", "color"):
+            value = step[1:] if kind == "font" else step[1]
+            if state[kind] == value:
+                continue
+            state[kind] = value
+        result.append(step)
+    return tuple(result)
+
+
+def _join(states):
+    # The state known at a point several paths lead to: what they all agree on
+    return {kind: states[0][kind] if all(s[kind] == states[0][kind] for s in states) else None
+            for kind in ("font", "color")}
+
+
+def _end_state(steps, layout, section_name, state):
+    state = dict(state)
+    _compile_steps(steps, layout, section_name, state)
+    return state
+
+
+def compile_plan(layout):
+    """Compiles the page header and every section of `layout` into flat step lists.
+
+    Returns (header_steps, sections): sections is a tuple of
+    (section_name, first_steps, repeat_steps), where first_steps draws the
+    section header and the paragraph or first entry, and repeat_steps
+    (None for paragraph sections) every further entry. Layout settings are
+    resolved, and set_font/set_text_color steps that would change nothing
+    (the state is already current, or is changed again before any text is
+    drawn) are left out. The page header starts from TEXT_COLOR and no font.
+    """
+    header_state = {"font": None, "color": TEXT_COLOR}
+    header_steps = _elide(_compile_steps(PAGE_HEADER, layout, None, dict(header_state)), header_state)
+
+    # A section can follow the page header or any section before it (empty ones are skipped), so it
+    # starts from what all of those leave behind
+    section_ends = [header_state]
+    sections = []
+    for section_name in layout["section_order"]:
+        start = _join(section_ends)
+        body = PARAGRAPH if section_name in PARAGRAPH_SECTIONS else ENTRY
+        state = dict(start)
+        first_steps = _elide(_compile_steps(SECTION_HEADER + body, layout, section_name, dict(state)), state)
+        repeat_steps = None
+        if body is ENTRY:
+            # Further entries follow the first one or another further entry
+            repeat_start = _join([state, _end_state(ENTRY, layout, section_name, state)])
+            end = dict(repeat_start)
+            repeat_steps = _elide(_compile_steps(ENTRY, layout, section_name, dict(repeat_start)), end)
+            state = _join([state, end])
+        sections.append((section_name, first_steps, repeat_steps))
+        section_ends.append(state)
+    return header_steps, tuple(sections)
+
+
+def _layout_key(layout):
+    return tuple((key, tuple(value) if isinstance(value, list) else value) for key, value in sorted(layout.items()))
+
+
+def get_plan(layout=None):
+    # The compiled plan for a LAYOUTS name or settings dict, compiled once per process
+    layout = resolve_layout(layout)
+    key = _layout_key(layout)
+    plan = _plans.get(key)
+    if plan is None:
+        if len(_plans) >= PLAN_CACHE_SIZE:
+            _plans.clear()
+        plan = _plans[key] = compile_plan(layout)
+    return plan
+
+
+def run_steps(pdf_obj, steps, source):
+    # Draws compiled steps on pdf_obj, taking text from `source`
+    from fpdf import XPos, YPos
+
+    for step in steps:
+        kind = step[0]
+        if kind == "cell":
+            pdf_obj.cell(0, step[1], source[step[2]], align=step[3], new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        elif kind == "bullets":
+            bullets = source[step[2]]
+            if bullets is not None:
+                original_x = pdf_obj.get_x()
+                for item in bullets:
+                    pdf_obj.set_x(original_x + step[3])
+                    pdf_obj.multi_cell(0, step[1], item)
+                pdf_obj.set_x(original_x)
+        elif kind == "font":
+            pdf_obj.set_font("DejaVu", step[1], size=step[2])
+        elif kind == "ln":
+            pdf_obj.ln(step[1])
+        elif kind == "paragraph":
+            pdf_obj.multi_cell(0, step[1], source[step[2]])
+        elif kind == "color":
+            pdf_obj.set_text_color(*step[1])
+        elif kind == "label":
+            pdf_obj.cell(0, step[1], step[2], align=step[3], new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        elif kind == "rule":
+            pdf_obj.line(pdf_obj.get_x(), pdf_obj.get_y(), pdf_obj.w - pdf_obj.r_margin, pdf_obj.get_y())
+
+
+def run_plan(pdf_obj, plan, prepared, section, section_memo=None):
+    # Draws the name, contact line and every non-empty section; section(name) is called as each starts.
+    # With a section_memo.SectionMemo, sections drawn before in the same situation are replayed from it.
+    header_steps, sections = plan
+    if section_memo is None:
+        run_steps(pdf_obj, header_steps, prepared)
+    else:
+        header = (prepared["name"], prepared["contact"])
+        section_memo.draw(pdf_obj, "header", header_steps, header, (),
+                          lambda: run_steps(pdf_obj, header_steps, prepared))
+    for section_name, first_steps, repeat_steps in sections:
+        section(section_name)
+        content = prepared[section_name]
+        if not content:
+            continue
+        if section_memo is None:
+            _run_section(pdf_obj, first_steps, repeat_steps, content)
+        else:
+            labels = [step[2] for step in first_steps if step[0] == "label"]
+            section_memo.draw(pdf_obj, section_name, (first_steps, repeat_steps), content, labels,
+                              lambda: _run_section(pdf_obj, first_steps, repeat_steps, content))
+
+
+def _run_section(pdf_obj, first_steps, repeat_steps, content):
+    if repeat_steps is None:
+        run_steps(pdf_obj, first_steps, (content,))
+        return
+    run_steps(pdf_obj, first_steps, content[0])
+    for entry in content[1:]:
+        run_steps(pdf_obj, repeat_steps, entry)
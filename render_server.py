@@ -0,0 +1,403 @@
+import argparse
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from render_metrics import SectionMetrics
+from resume_schema import check_resume
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_TIMEOUT = 30.0
+MAX_BODY_BYTES = 5 * 1024 * 1024
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _warm_worker():
+    from font_registry import FONT_REGISTRY
+    FONT_REGISTRY.warm_up()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _render_in_worker(data):
+    # Runs in a pool process: fonts and font subsets stay cached between requests.
+    # The PDF is streamed into a spool file rather than sent back through the pool, so neither
+    # process holds the whole document; returns its path, its size and the per-section records
+    # for /metrics. The caller removes the file.
+    from render_metrics import RenderInstrumentation
+    from resume_generator import ResumePDF, generate_resume_pdf
+
+    instrumentation = RenderInstrumentation()
+    pdf_instance = ResumePDF(unit="mm", format="A4")
+    generate_resume_pdf(data, pdf_instance, instrumentation)
+    fd, spool_path = tempfile.mkstemp(prefix="resume-", suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            size = pdf_instance.output_to(f)
+    except BaseException:
+        os.remove(spool_path)
+        raise
+    return spool_path, size, instrumentation.records
+
+
+class NoWorkerAvailable(Exception):
+    # No worker became free within the timeout: every one is busy with slow or hung renders
+    pass
+
+
+def _discard_spool(future):
+    if not future.cancelled() and future.exception() is None:
+        os.remove(future.result()[0])
+
+
+class LatencyHistogram:
+    # Cumulative-bucket histogram in the Prometheus style; thread safe
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.total += seconds
+            self.count += 1
+
+    def prometheus_lines(self, name, labels=""):
+        with self._lock:
+            counts, total, count = list(self.counts), self.total, self.count
+        lines = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            sep = "," if labels else ""
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {running}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {total:.6f}")
+        lines.append(f"{name}_count{suffix} {count}")
+        return lines
+
+
+class RenderService:
+    """Renders resume dicts to PDF bytes on a pool of warm worker processes.
+
+    At most workers + queue_size renders are admitted at once; beyond that
+    try_acquire() refuses immediately so callers can shed load instead of queueing
+    without bound. A render keeps its place until the worker is done with it,
+    even when the request has already timed out, so renders still running on
+    the pool count against the limit. An admitted render waits at most
+    `timeout` seconds for a free worker. If a worker process dies, the pool is
+    rebuilt and /health reports it until a worker answers again.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        # Renders handed to the pool; the rest wait in render() so a render starts as soon as it's submitted
+        self._free_workers = threading.BoundedSemaphore(workers)
+        self._executor = self._new_executor()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.started_at = time.time()
+        self.pool_restarts = 0
+        self.pool_error = None  # why the pool last broke, until a worker of the new one answers
+        self.counters = {"ok": 0, "bad_request": 0, "render_error": 0, "rejected": 0, "timeout": 0,
+                         "no_worker": 0, "worker_crash": 0}
+        self.render_latency = LatencyHistogram()
+        self.request_latency = LatencyHistogram()
+        self.section_metrics = SectionMetrics()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+
+    def warm_up(self):
+        # Starts every worker now so the first requests don't pay for process start-up and font parsing
+        for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def count(self, outcome):
+        with self._lock:
+            self.counters[outcome] += 1
+
+    def try_acquire(self):
+        if not self._slots.acquire(blocking=False):
+            self.count("rejected")
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        # Gives back a slot from try_acquire() without rendering
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _release(self, future=None):
+        # Gives back a slot from try_acquire() and the worker the render ran on
+        self._free_workers.release()
+        self.release()
+
+    def _pool_broke(self, executor, error):
+        # A worker process died (killed, out of memory, crashed): the pool is unusable, so start a new one
+        with self._lock:
+            if self._executor is not executor:
+                return  # another request already replaced it
+            self._executor = self._new_executor()
+            self.pool_restarts += 1
+            self.pool_error = f"{type(error).__name__}: {error}"
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def render(self, data):
+        # Caller must hold a slot from try_acquire(); it is given back when the render finishes, which
+        # after a timeout is later than this returns. The timeout counts from when a worker takes the
+        # render, not while it waits for one. Returns (spool_path, size) of the rendered PDF; the caller
+        # sends and removes the file. Raises NoWorkerAvailable (the slot is given back) if no worker
+        # frees up within the timeout, and BrokenProcessPool if the worker died.
+        if not self._free_workers.acquire(timeout=self.timeout):
+            self.release()
+            raise NoWorkerAvailable(f"no render worker became free within {self.timeout}s")
+        executor = self._executor
+        try:
+            future = executor.submit(_render_in_worker, data)
+        except BaseException as e:
+            self._release()
+            if isinstance(e, BrokenProcessPool):
+                self._pool_broke(executor, e)
+            raise
+        future.add_done_callback(self._release)
+        start = time.perf_counter()
+        try:
+            spool_path, size, section_records = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # The worker still finishes the render; drop its file when it does
+            future.add_done_callback(_discard_spool)
+            raise
+        except BrokenProcessPool as e:
+            self._pool_broke(executor, e)
+            raise
+        self.render_latency.observe(time.perf_counter() - start)
+        self.section_metrics.observe(section_records)
+        with self._lock:
+            if self._executor is executor:
+                self.pool_error = None
+        return spool_path, size
+
+    def check_pool(self, timeout=5.0):
+        # After a worker died, asks the new pool for a worker's pid so /health can tell when it's back
+        with self._lock:
+            executor, error = self._executor, self.pool_error
+        if error is None:
+            return
+        try:
+            executor.submit(_ping).result(timeout=timeout)
+        except BrokenProcessPool as e:
+            self._pool_broke(executor, e)
+        except FutureTimeoutError:
+            pass  # every worker is busy; it still counts as failing until one answers
+        else:
+            with self._lock:
+                if self._executor is executor:
+                    self.pool_error = None
+
+    def health(self):
+        self.check_pool()
+        with self._lock:
+            return {
+                "status": "ok" if self.pool_error is None else "degraded",
+                "pool_error": self.pool_error,
+                "pool_restarts": self.pool_restarts,
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self.in_flight,
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "requests": dict(self.counters),
+            }
+
+    def metrics_text(self):
+        lines = [
+            "# HELP resume_render_seconds Time spent rendering a resume in a worker process.",
+            "# TYPE resume_render_seconds histogram",
+            *self.render_latency.prometheus_lines("resume_render_seconds"),
+            "# HELP resume_request_seconds End-to-end time of POST /render requests.",
+            "# TYPE resume_request_seconds histogram",
+            *self.request_latency.prometheus_lines("resume_request_seconds"),
+            "# HELP resume_requests_total Render requests by outcome.",
+            "# TYPE resume_requests_total counter",
+        ]
+        with self._lock:
+            for outcome, value in self.counters.items():
+                lines.append(f'resume_requests_total{{outcome="{outcome}"}} {value}')
+            lines.append("# HELP resume_renders_in_flight Renders currently admitted.")
+            lines.append("# TYPE resume_renders_in_flight gauge")
+            lines.append(f"resume_renders_in_flight {self.in_flight}")
+        lines.extend(self.section_metrics.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ResumeRenderServer/1.0"
+    service = None  # set by make_server()
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type="application/json", extra_headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+        elif isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, path, size, content_type):
+        # Streams a spooled file to the client with sendfile(), without reading it into memory
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        with open(path, "rb") as f:
+            self.connection.sendfile(f)
+
+    def do_GET(self):
+        if self.path == "/health":
+            health = self.service.health()
+            self._send(200 if health["status"] == "ok" else 503, health)
+        elif self.path == "/metrics":
+            self._send(200, self.service.metrics_text(), content_type="text/plain; version=0.0.4")
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/render":
+            self._send(404, {"error": "not found"})
+            return
+        start = time.perf_counter()
+        try:
+            self._handle_render()
+        finally:
+            self.service.request_latency.observe(time.perf_counter() - start)
+
+    def _handle_render(self):
+        service = self.service
+        if self.headers.get("Content-Length") is None:
+            service.count("bad_request")
+            self._send(411, {"error": "Content-Length is required"})
+            return
+        try:
+            length = int(self.headers["Content-Length"])
+        except ValueError:
+            length = -1
+        if length <= 0 or length > MAX_BODY_BYTES:
+            service.count("bad_request")
+            self._send(413 if length > MAX_BODY_BYTES else 400, {"error": "request body must be 1 byte to 5 MB of resume JSON"})
+            return
+        try:
+            data = json.loads(self.rfile.read(length).decode("utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+        except (ValueError, UnicodeDecodeError) as e:
+            service.count("bad_request")
+            self._send(400, {"error": f"invalid resume JSON: {e}"})
+            return
+        # Checked here, in microseconds, so invalid resumes never hold a slot or a worker
+        data, problems = check_resume(data)
+        if problems:
+            service.count("bad_request")
+            self._send(400, {"error": "invalid resume data", "problems": problems})
+            return
+
+        if not service.try_acquire():
+            self._send(503, {"error": "render queue is full"}, extra_headers={"Retry-After": "1"})
+            return
+        try:
+            spool_path, size = service.render(data)
+        except NoWorkerAvailable as e:
+            service.count("no_worker")
+            self._send(503, {"error": str(e)}, extra_headers={"Retry-After": "1"})
+            return
+        except FutureTimeoutError:
+            service.count("timeout")
+            self._send(504, {"error": f"render took longer than {service.timeout}s"})
+            return
+        except BrokenProcessPool:
+            service.count("worker_crash")
+            self._send(503, {"error": "render worker crashed; try again"}, extra_headers={"Retry-After": "1"})
+            return
+        except Exception as e:
+            service.count("render_error")
+            self._send(422, {"error": f"failed to render resume: {type(e).__name__}: {e}"})
+            return
+        service.count("ok")
+        try:
+            self._send_file(spool_path, size, "application/pdf")
+        finally:
+            os.remove(spool_path)
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, service=None, quiet=False):
+    # Builds (but doesn't start) an HTTP server bound to host:port around a RenderService
+    service = service or RenderService()
+    handler = type("BoundRenderRequestHandler", (RenderRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume PDF rendering over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="render worker processes")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="renders that may wait for a worker before requests get 503")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-render timeout in seconds")
+    parser.add_argument("--quiet", action="store_true", help="don't log every request")
+    args = parser.parse_args(argv)
+
+    service = RenderService(workers=args.workers, queue_size=args.queue_size, timeout=args.timeout)
+    service.warm_up()
+    server = make_server(args.host, args.port, service, quiet=args.quiet)
+    print(f"Serving resume rendering on http://{args.host}:{args.port} "
+          f"(POST /render, GET /health, GET /metrics) with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
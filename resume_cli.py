@@ -0,0 +1,367 @@
+import argparse
+import io
+import json
+import os
+import sys
+
+# Only the standard library is imported up front: fpdf, fontTools and Pillow are imported by the
+# commands that make PDFs, so --help, validate and convert start in a few tens of milliseconds.
+# Nothing here imports tkinter.
+
+
+def _label(path, line):
+    return path if line is None else f"{path}:{line}"
+
+
+def iter_input_records(sources, on_error):
+    # Yields (path, line, data) for every resume in the given files, directories, globs or manifests;
+    # line is the line number within a .jsonl file and None for .json files.
+    # Unreadable files and records go to on_error(label, message).
+    from batch_render import collect_input_files
+    from resume_generator import iter_jsonl_lines, parse_resume_record
+    from resume_journal import load_journaled
+
+    for input_path in collect_input_files(sources):
+        if input_path.endswith(".jsonl"):
+            try:
+                for line_number, _, raw_line in iter_jsonl_lines(input_path):
+                    try:
+                        data = parse_resume_record(raw_line)
+                    except (ValueError, UnicodeDecodeError) as e:
+                        on_error(_label(input_path, line_number), str(e))
+                        continue
+                    yield input_path, line_number, data
+            except OSError as e:
+                on_error(input_path, str(e))
+            continue
+        try:
+            data = load_journaled(input_path)
+        except (OSError, ValueError) as e:
+            on_error(input_path, str(e))
+            continue
+        yield input_path, None, data
+
+
+def _print_error(label, message):
+    print(f"{label}: {message}", file=sys.stderr)
+
+
+def cmd_validate(args):
+    from resume_generator import validate_resume_data
+
+    checked = 0
+    invalid = 0
+
+    def unreadable(label, message):
+        nonlocal checked, invalid
+        checked += 1
+        invalid += 1
+        _print_error(label, message)
+
+    for path, line, data in iter_input_records(args.inputs, unreadable):
+        label = _label(path, line)
+        checked += 1
+        problems = validate_resume_data(data)
+        if problems:
+            invalid += 1
+            for problem in problems:
+                _print_error(label, problem)
+        elif args.verbose:
+            print(f"{label}: ok")
+    print(f"{checked} resume(s) checked, {invalid} invalid")
+    return 1 if invalid or not checked else 0
+
+
+def _load_single(input_path, line=None):
+    # One resume from a .json file, from line `line` of a .jsonl file, or from stdin for "-"
+    from resume_generator import iter_jsonl_lines, parse_resume_record
+    from resume_journal import load_journaled
+
+    if input_path == "-":
+        if line is not None:
+            raise ValueError("--line can't be used with stdin")
+        return parse_resume_record(sys.stdin.buffer.read())
+    if line is None:
+        if input_path.endswith(".jsonl"):
+            raise ValueError("pick a record of a JSON Lines file with --line")
+        return load_journaled(input_path)
+    for line_number, _, raw_line in iter_jsonl_lines(input_path):
+        if line_number == line:
+            return parse_resume_record(raw_line)
+    raise ValueError(f"no record on line {line}")
+
+
+def cmd_render(args):
+    from resume_generator import resolve_layout, target_name, validate_resume_data
+
+    try:
+        for layout in args.layout:
+            resolve_layout(layout)
+    except ValueError as e:
+        _print_error("--layout", str(e))
+        return 1
+    if args.fit_pages is not None and args.fit_pages < 1:
+        _print_error("--fit-pages", "must be at least 1")
+        return 1
+
+    try:
+        data = _load_single(args.input, args.line)
+    except (OSError, ValueError) as e:
+        _print_error(args.input, str(e))
+        return 1
+    problems = validate_resume_data(data)
+    if problems:
+        for problem in problems:
+            _print_error(args.input, problem)
+        return 1
+
+    targets = list(args.layout)
+    if args.fit_pages is not None:
+        targets = _fit_targets(data, targets or ["classic"], args.fit_pages)
+    if len(targets) > 1:
+        return _render_layouts(data, args, targets)
+    layout = targets[0] if targets else None
+    output_path = args.output or ("-" if args.input == "-" else
+                                  os.path.splitext(os.path.basename(args.input))[0] + ".pdf")
+    output_path = output_path.replace("{layout}", target_name(layout, 0) if layout else "classic")
+    if output_path == "-":
+        # The PDF goes to stdout, so status messages go to stderr
+        _render_to(data, sys.stdout.buffer, args.cache_dir, layout)
+        sys.stdout.buffer.flush()
+        print("Resume PDF written to stdout", file=sys.stderr)
+        return 0
+    from resume_journal import atomic_output
+
+    # Rendered into a temp file that replaces output_path only once the PDF is complete
+    with atomic_output(output_path) as f:
+        _render_to(data, f, args.cache_dir, layout)
+    print(f"Resume PDF generated successfully as '{output_path}'")
+    return 0
+
+
+def _render_to(data, stream, cache_dir=None, layout=None):
+    if cache_dir:
+        from render_cache import RenderCache
+        stream.write(RenderCache(cache_dir).render(data, layout))
+    else:
+        from resume_generator import ResumePDF, generate_resume_pdf, resolve_layout
+        pdf_instance = ResumePDF(unit="mm", format=resolve_layout(layout)["format"])
+        generate_resume_pdf(data, pdf_instance, layout=layout)
+        pdf_instance.output_to(stream)
+
+
+def _fit_targets(data, layouts, pages):
+    # Shrinks each layout until the resume fits on `pages` pages (see page_fit.py); status goes to stderr
+    from page_fit import PageMeasurer, fit_layout
+
+    measurer = PageMeasurer()
+    fitted = []
+    for name in layouts:
+        settings, report = fit_layout(data, pages, name, measurer)
+        scales = f"{report['font_scale']:.0%} font size, {report['spacing_scale']:.0%} spacing"
+        if report["fits"]:
+            print(f"{name}: fits on {report['pages']} page(s) at {scales}", file=sys.stderr)
+        else:
+            print(f"{name}: needs {report['pages']} page(s) even at {scales}; rendering it that way",
+                  file=sys.stderr)
+        fitted.append(dict(settings, name=name))
+    return fitted
+
+
+def _render_layouts(data, args, targets):
+    # Several --layout options: one PDF per layout, rendered together (see render_targets)
+    from resume_generator import render_targets
+    from resume_journal import write_atomic
+
+    stem = "resume" if args.input == "-" else os.path.splitext(os.path.basename(args.input))[0]
+    pattern = args.output or stem + "-{layout}.pdf"
+    if "{layout}" not in pattern:
+        _print_error(pattern, "with several layouts, -o must contain {layout}")
+        return 1
+    if args.cache_dir:
+        from render_cache import RenderCache
+        rendered = RenderCache(args.cache_dir).render_targets(data, targets)
+    else:
+        rendered = render_targets(data, targets)
+    for layout, pdf_bytes in rendered.items():
+        output_path = pattern.replace("{layout}", layout)
+        write_atomic(output_path, pdf_bytes)
+        print(f"Resume PDF generated successfully as '{output_path}'")
+    return 0
+
+
+def _is_directory_target(path):
+    return os.path.isdir(path) or path.endswith(os.sep) or not os.path.splitext(path)[1]
+
+
+def cmd_convert(args):
+    # .json/.jsonl inputs -> a .jsonl file, a single .json file, a directory of .json files, or a
+    # plain text, Markdown or HTML export (one file, or a directory with --format)
+    failed = 0
+
+    def unreadable(label, message):
+        nonlocal failed
+        failed += 1
+        _print_error(label, message)
+
+    records = iter_input_records(args.inputs, unreadable)
+    try:
+        written = _write_records(records, args.output, args.format, unreadable)
+    except (OSError, ValueError) as e:
+        _print_error(args.output, str(e))
+        return 1
+    print(f"Converted {written} resume(s) to '{args.output}'" + (f", {failed} failed" if failed else ""))
+    return 1 if failed else 0
+
+
+def _write_records(records, output, format="json", on_error=_print_error):
+    # Writes (path, line, data) records to `output` according to its kind; returns how many were written.
+    # Text exports (see resume_export.py) skip records that can't be rendered, reporting them to on_error.
+    from resume_export import export_resume, writer_for
+    from resume_journal import serialize_snapshot, write_atomic
+
+    written = 0
+    if _is_directory_target(output):
+        os.makedirs(output, exist_ok=True)
+        for path, line, data in records:
+            stem = os.path.splitext(os.path.basename(path))[0] + ("" if line is None else f"-{line:06d}")
+            if format == "json":
+                payload = serialize_snapshot(data)
+            else:
+                buffer = io.StringIO()
+                try:
+                    export_resume(data, buffer, "." + format)
+                except ValueError as e:
+                    on_error(_label(path, line), str(e))
+                    continue
+                payload = buffer.getvalue().encode("utf-8")
+            write_atomic(os.path.join(output, f"{stem}.{format}"), payload)
+            written += 1
+    elif writer_for(output) is not None:
+        # Every resume in one file, written as it is read
+        with open(output, "w", encoding="utf-8") as f:
+            writer = writer_for(output)(f)
+            writer.begin()
+            for path, line, data in records:
+                try:
+                    writer.write(data)
+                except ValueError as e:
+                    on_error(_label(path, line), str(e))
+            writer.end()
+        written = writer.written
+    elif output.endswith(".jsonl"):
+        with open(output, "w", encoding="utf-8") as f:
+            for _, _, data in records:
+                f.write(json.dumps(data, ensure_ascii=False) + "\n")
+                written += 1
+    elif output.endswith(".json"):
+        collected = list(records)
+        if len(collected) != 1:
+            raise ValueError(f"a .json file holds one resume, got {len(collected)}; "
+                             "write to a .jsonl file or a directory instead")
+        write_atomic(output, serialize_snapshot(collected[0][2]))
+        written = 1
+    else:
+        raise ValueError("unsupported output format (use .json, .jsonl, .txt, .md, .html or a directory)")
+    return written
+
+
+def cmd_booklet(args):
+    # Many resumes -> one PDF with a bookmark per candidate (see booklet.py)
+    from resume_generator import resolve_layout
+
+    try:
+        resolve_layout(args.layout)
+    except ValueError as e:
+        _print_error("--layout", str(e))
+        return 1
+    from booklet import render_booklet
+    from resume_journal import atomic_output
+
+    failed = 0
+
+    def skipped(label, message):
+        nonlocal failed
+        failed += 1
+        _print_error(label, message)
+
+    records = ((_label(path, line), data) for path, line, data in iter_input_records(args.inputs, skipped))
+    try:
+        with atomic_output(args.output) as f:
+            _, included = render_booklet(records, f, args.layout, args.title, skipped)
+    except (OSError, ValueError) as e:
+        _print_error(args.output, str(e))
+        return 1
+    print(f"Booklet of {included} resume(s) written to '{args.output}'" + (f", {failed} skipped" if failed else ""))
+    return 1 if failed else 0
+
+
+def cmd_new(args):
+    # The original interactive flow: answer the prompts, save the JSON and optionally render it
+    from resume_generator import collect_resume_data, save_resume_data
+
+    data = collect_resume_data()
+    save_resume_data(data, args.output)
+    if args.pdf:
+        from resume_generator import ResumePDF, generate_resume_pdf
+        from resume_journal import atomic_output
+        pdf_instance = ResumePDF(unit="mm", format="A4")
+        generate_resume_pdf(data, pdf_instance)
+        with atomic_output(args.pdf) as f:
+            pdf_instance.output_to(f)
+        print(f"Resume PDF generated successfully as '{args.pdf}'")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="resume_cli.py", description="Headless resume tools: render, validate, convert, booklet.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render_parser = commands.add_parser("render", help="render one resume JSON file to PDF")
+    render_parser.add_argument("input", help="resume .json file (or .jsonl with --line); - reads JSON from stdin")
+    render_parser.add_argument("-o", "--output",
+                               help="PDF to write, - for stdout (default: <input name>.pdf, or stdout when reading stdin)")
+    render_parser.add_argument("--line", type=int, help="line of a .jsonl file to render")
+    render_parser.add_argument("--layout", action="append", default=[],
+                               help="page layout: classic (A4, the default), letter or condensed; repeat it to "
+                                    "render several in one pass (-o then takes a {layout} placeholder)")
+    render_parser.add_argument("--fit-pages", type=int, metavar="N",
+                               help="shrink fonts and spacing (never below 70%%) until the resume fits on N pages")
+    render_parser.add_argument("--cache-dir", help="reuse and store renders in this render cache directory")
+    render_parser.set_defaults(func=cmd_render)
+
+    validate_parser = commands.add_parser("validate", help="check that resumes can be rendered")
+    validate_parser.add_argument("inputs", nargs="+", help="files, directories, glob patterns or manifests")
+    validate_parser.add_argument("-v", "--verbose", action="store_true", help="also list valid resumes")
+    validate_parser.set_defaults(func=cmd_validate)
+
+    convert_parser = commands.add_parser("convert", help="convert between .json files and .jsonl exports, "
+                                                               "or export plain text, Markdown or HTML")
+    convert_parser.add_argument("inputs", nargs="+", help="files, directories, glob patterns or manifests")
+    convert_parser.add_argument("-o", "--output", required=True,
+                                help=".jsonl or .json file, .txt, .md or .html export, or directory")
+    convert_parser.add_argument("--format", choices=("json", "txt", "md", "html"), default="json",
+                                help="kind of file written for each resume when -o is a directory (default: json)")
+    convert_parser.set_defaults(func=cmd_convert)
+
+    booklet_parser = commands.add_parser("booklet", help="lay out many resumes in one PDF, bookmarked per candidate")
+    booklet_parser.add_argument("inputs", nargs="+", help="files, directories, glob patterns or manifests")
+    booklet_parser.add_argument("-o", "--output", required=True, help="PDF to write")
+    booklet_parser.add_argument("--layout", help="page layout: classic (A4, the default), letter or condensed")
+    booklet_parser.add_argument("--title", help="document title shown by PDF viewers")
+    booklet_parser.set_defaults(func=cmd_booklet)
+
+    new_parser = commands.add_parser("new", help="enter a resume interactively")
+    new_parser.add_argument("-o", "--output", default="resume_data.json", help="JSON file to save")
+    new_parser.add_argument("--pdf", help="also render it to this PDF")
+    new_parser.set_defaults(func=cmd_new)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
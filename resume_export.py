@@ -0,0 +1,214 @@
+import re
+from html import escape
+
+from resume_generator import SECTION_TITLES, check_resume, prepare_resume_text, resolve_layout
+
+# Plain text, Markdown and HTML versions of a resume, for applicant tracking systems and web pages.
+# They draw from the same section model as generate_resume_pdf (prepare_resume_text() and the
+# layout's section order), so every section and field is there in the same order, but they only
+# need the standard library: nothing here imports fpdf or fontTools.
+
+
+class ResumeWriter:
+    """Writes resumes to a text stream, one after another, as each is given to write().
+
+    Call begin() once, write(data) for each resume and end() once (or use
+    export_resume() for a single one). Every section the layout's
+    section_order lists is written in that order, empty sections skipped,
+    exactly as generate_resume_pdf draws them. write() raises ValueError
+    for data check_resume() rejects, before anything is written.
+    """
+
+    separator = "\n"  # written between two resumes
+
+    def __init__(self, stream, layout=None):
+        self.stream = stream
+        self.section_order = resolve_layout(layout)["section_order"]
+        self.written = 0
+
+    def begin(self):
+        pass
+
+    def end(self):
+        pass
+
+    def write(self, data):
+        data, problems = check_resume(data)
+        if problems:
+            raise ValueError("invalid resume data: " + "; ".join(problems))
+        prepared = prepare_resume_text(data, bullet="")
+        if self.written:
+            self.stream.write(self.separator)
+        self.resume_start(prepared["name"], prepared["contact"])
+        for section_name in self.section_order:
+            content = prepared[section_name]
+            if not content:
+                continue
+            self.section_start(SECTION_TITLES[section_name])
+            if isinstance(content, str):
+                self.paragraph(content)
+            else:
+                for bold_line, plain_line, bullets in content:
+                    self.entry(bold_line, plain_line, bullets or ())
+            self.section_end()
+        self.resume_end()
+        self.written += 1
+
+    # What a format writes for each part of the resume
+    def resume_start(self, name, contact):
+        raise NotImplementedError
+
+    def section_start(self, title):
+        raise NotImplementedError
+
+    def paragraph(self, text):
+        raise NotImplementedError
+
+    def entry(self, bold_line, plain_line, bullets):
+        raise NotImplementedError
+
+    def section_end(self):
+        pass
+
+    def resume_end(self):
+        pass
+
+
+class TextWriter(ResumeWriter):
+    # Plain text with underlined headings and "•" bullets; resumes are separated by a form feed
+    separator = "\f\n"
+
+    def resume_start(self, name, contact):
+        self.stream.write(f"{name}\n{contact}\n")
+
+    def section_start(self, title):
+        self.stream.write(f"\n{title}\n{'-' * len(title)}\n")
+        self._entry_gap = False
+
+    def paragraph(self, text):
+        self.stream.write(f"{text}\n")
+
+    def entry(self, bold_line, plain_line, bullets):
+        write = self.stream.write
+        if self._entry_gap:
+            write("\n")
+        write(f"{bold_line}\n{plain_line}\n")
+        for item in bullets:
+            write(f"  • {item}\n")
+        self._entry_gap = True
+
+
+# Characters Markdown would read as formatting anywhere in a line, and line starts it would read as a
+# heading, list item, quote or rule
+_MARKDOWN_INLINE = re.compile(r"([\\`*_\[\]<>])")
+_MARKDOWN_LINE_START = re.compile(r"^(\s*)([#+=>-]|\d+[.)])", re.MULTILINE)
+
+
+def markdown_escape(text):
+    text = _MARKDOWN_INLINE.sub(r"\\\1", text)
+    text = _MARKDOWN_LINE_START.sub(lambda m: m.group(1) + m.group(2)[:-1] + "\\" + m.group(2)[-1], text)
+    return text.replace("\n", "  \n")  # line breaks within a field stay line breaks
+
+
+class MarkdownWriter(ResumeWriter):
+    # The name as the title, sections as ## headings and entries with a bold first line and a bullet list
+    separator = "\n---\n\n"
+
+    def resume_start(self, name, contact):
+        self.stream.write(f"# {markdown_escape(name)}\n\n{markdown_escape(contact)}\n")
+
+    def section_start(self, title):
+        self.stream.write(f"\n## {markdown_escape(title)}\n")
+
+    def paragraph(self, text):
+        self.stream.write(f"\n{markdown_escape(text)}\n")
+
+    def entry(self, bold_line, plain_line, bullets):
+        write = self.stream.write
+        write(f"\n**{markdown_escape(bold_line)}**  \n{markdown_escape(plain_line)}\n")
+        if bullets:
+            write("\n")
+            for item in bullets:
+                write(f"- {markdown_escape(item)}\n")
+
+
+def _html(text):
+    return escape(text).replace("\n", "<br>\n")
+
+
+class HtmlWriter(ResumeWriter):
+    # A standalone UTF-8 page with one <article> per resume; the colors are the PDF's
+    separator = ""
+    style = ("body{font-family:'DejaVu Sans',Verdana,sans-serif;color:rgb(30,30,30);max-width:50em;margin:2em auto}"
+             "h1,.contact{text-align:center}h1{margin-bottom:0}.contact{font-size:.8em}"
+             "h2{color:#000;border-bottom:1px solid #000;font-size:1.2em}"
+             ".entry p{margin:0}.entry{margin-bottom:.5em}article+article{margin-top:3em}")
+
+    def __init__(self, stream, layout=None, title="Resume"):
+        super().__init__(stream, layout)
+        self.title = title
+
+    def begin(self):
+        self.stream.write(f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{escape(self.title)}</title>\n'
+                          f"<style>{self.style}</style>\n</head>\n<body>\n")
+
+    def end(self):
+        self.stream.write("</body>\n</html>\n")
+
+    def resume_start(self, name, contact):
+        self.stream.write(f'<article>\n<h1>{_html(name)}</h1>\n<p class="contact">{_html(contact)}</p>\n')
+
+    def section_start(self, title):
+        self.stream.write(f"<section>\n<h2>{escape(title)}</h2>\n")
+
+    def paragraph(self, text):
+        self.stream.write(f"<p>{_html(text)}</p>\n")
+
+    def entry(self, bold_line, plain_line, bullets):
+        write = self.stream.write
+        write(f'<div class="entry">\n<p><strong>{_html(bold_line)}</strong></p>\n<p>{_html(plain_line)}</p>\n')
+        if bullets:
+            write("<ul>\n")
+            for item in bullets:
+                write(f"<li>{_html(item)}</li>\n")
+            write("</ul>\n")
+        write("</div>\n")
+
+    def section_end(self):
+        self.stream.write("</section>\n")
+
+    def resume_end(self):
+        self.stream.write("</article>\n")
+
+
+# Writers by file extension
+WRITERS = {
+    ".txt": TextWriter,
+    ".md": MarkdownWriter,
+    ".html": HtmlWriter,
+    ".htm": HtmlWriter,
+}
+
+
+def writer_for(path):
+    # The writer class for a file name's extension, or None if it isn't a text export
+    for extension, writer in WRITERS.items():
+        if path.lower().endswith(extension):
+            return writer
+    return None
+
+
+def export_resume(data, stream, kind, layout=None):
+    # Writes one resume to `stream` as kind ".txt", ".md" or ".html" (or a file name ending in one)
+    writer_class = writer_for(kind)
+    if writer_class is None:
+        raise ValueError(f"unsupported export format '{kind}' (use {', '.join(WRITERS)})")
+    data, problems = check_resume(data)  # before the HTML head or anything else is written
+    if problems:
+        raise ValueError("invalid resume data: " + "; ".join(problems))
+    writer = writer_class(stream, layout)
+    if writer_class is HtmlWriter:
+        writer.title = data["name"]
+    writer.begin()
+    writer.write(data)
+    writer.end()
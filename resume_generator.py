@@ -1,24 +1,32 @@
-from fpdf import FPDF, XPos, YPos
 import json 
 import os   # Import os module for file path operations
 
+from render_metrics import no_section
+from resume_journal import journal_path, load_journaled, serialize_snapshot, write_atomic
+from resume_schema import check_resume
+
+# fpdf (and through it Pillow and fontTools) is only imported once a PDF is actually made, so loading,
+# validating and converting resume data starts fast. See generate_resume_pdf() and ResumePDF below.
+
 def save_resume_data(data, filename="resume_data.json"):
     # Saves the resume data to a JSON file.
+    # The file is written to a temp file and renamed over the target, so a crash never leaves it truncated.
+    # A full save supersedes any change journal next to the file (see resume_journal.py).
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        write_atomic(filename, serialize_snapshot(data))
+        if os.path.exists(journal_path(filename)):
+            os.remove(journal_path(filename))
         print(f"Resume data saved successfully to '{filename}'")
     except IOError as e:
         print(f"Error saving data to '{filename}': {e}")
 
 def load_resume_data(filename="resume_data.json"):
-    # Loads resume data from a JSON file.
+    # Loads resume data from a JSON file, replaying any change journal saved next to it.
     if not os.path.exists(filename):
         print(f"File '{filename}' not found.")
         return None
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_journaled(filename)
         print(f"Resume data loaded successfully from '{filename}'")
         return data
     except json.JSONDecodeError as e:
@@ -28,6 +36,49 @@ def load_resume_data(filename="resume_data.json"):
         print(f"Error loading data from '{filename}': {e}")
         return None
 
+def iter_jsonl_lines(filename):
+    # Yields (line_number, byte_offset, raw_line) for every non-blank line of a JSON Lines file.
+    # Reads one line at a time, so memory use doesn't depend on the file size.
+    with open(filename, 'rb') as f:
+        offset = 0
+        for line_number, raw_line in enumerate(f, start=1):
+            if raw_line.strip():
+                yield line_number, offset, raw_line
+            offset += len(raw_line)
+
+def parse_resume_record(raw_line):
+    # Parses one JSON Lines record into a resume dict; raises ValueError if it isn't one
+    data = json.loads(raw_line.decode('utf-8'))
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    return data
+
+def read_resume_record(filename, offset):
+    # Reads the single record starting at byte `offset` of a JSON Lines file
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        return parse_resume_record(f.readline())
+
+def iter_resume_records(filename, on_error=None, with_position=False):
+    # Streams resume dicts from a JSON Lines file (one resume per line) without loading the whole file.
+    # A bad record doesn't stop the stream: it's passed to on_error as a dict with the line number,
+    # byte offset and error message (printed if no on_error is given) and skipped.
+    # With with_position=True, yields (line_number, byte_offset, data) instead of just data.
+    for line_number, offset, raw_line in iter_jsonl_lines(filename):
+        try:
+            data = parse_resume_record(raw_line)
+        except (ValueError, UnicodeDecodeError) as e:  # json.JSONDecodeError is a ValueError
+            error = {"file": filename, "line": line_number, "offset": offset, "error": str(e)}
+            if on_error is None:
+                print(f"Skipping bad record in '{filename}' at line {line_number} (byte {offset}): {e}")
+            else:
+                on_error(error)
+            continue
+        if with_position:
+            yield line_number, offset, data
+        else:
+            yield data
+
 def collect_resume_data():
     # Collects all resume data from the user via command-line input.
     data = {}
@@ -160,121 +211,293 @@ def collect_resume_data():
 
 pdf_global_instance = None # Will be initialized in main
 
+# Bump whenever a change to generate_resume_pdf alters the output for the same data,
+# so cached renders (see render_cache.py) are not reused across layouts
+RENDERER_VERSION = "1"
+
+def validate_resume_data(data):
+    # Returns a list of problems that would stop generate_resume_pdf from rendering `data` (empty if none).
+    # Fields that may be left out (see resume_schema.FIELD_DEFAULTS) aren't problems.
+    return check_resume(data)[1]
+
+def _define_resume_pdf():
+    from fpdf import FPDF, Align, XPos, YPos
+    from fpdf.line_break import NBSP, SOFT_HYPHEN, Fragment, TextLine
+    from fpdf.util import Padding
+    from font_registry import TableWidthTTFFont
+    from pdf_stream import StreamBuffer, stream_file_id, streaming_producer
+    from subset_cache import SubsetCachingOutputProducer
+    from text_layout import break_lines
+
+    no_padding = Padding(0, 0, 0, 0)
+
+    class ResumePDF(FPDF):
+        # FPDF that reuses cached font subsets (see subset_cache.py) when the document is written,
+        # and breaks plain paragraphs into lines with text_layout.break_lines().
+        # Use it wherever a resume is rendered; plain FPDF still works but is slower.
+        def multi_cell(self, w, h=None, text="", *args, **kwargs):
+            # multi_cell(w, h, text) as the renderer calls it, in a registry font: the lines come from
+            # break_lines() and are drawn exactly as FPDF.multi_cell (fpdf2 2.8.3) draws them.
+            # Any other option, or text needing fpdf's own handling, goes to FPDF.multi_cell.
+            lines = None
+            if (not args and not kwargs and text and self.page and isinstance(self.current_font, TableWidthTTFFont)
+                    and not self.text_shaping and not self._fallback_font_ids and self.char_spacing == 0
+                    and self.font_stretching == 100 and SOFT_HYPHEN not in text
+                    and not (self.str_alias_nb_pages and self.str_alias_nb_pages in text)):
+                text = text.replace("\r", "")
+                cell_width = w or self.w - self.r_margin - self.x
+                lines = break_lines(text, self.current_font, self.font_size_pt, self.k,
+                                    cell_width - self.c_margin - self.c_margin)
+            if not lines:
+                return super().multi_cell(w, h, text, *args, **kwargs)
+
+            if h is None:
+                h = self.font_size
+            graphics_state = self._get_current_graphics_state()
+            font_height = self.font_size_pt / self.k
+            page_break_triggered = False
+            last = len(lines) - 1
+            for index, (start, end, units, spaces, justified, trailing_newline) in enumerate(lines):
+                line_text = text[start:end]
+                if NBSP in line_text:
+                    line_text = line_text.replace(NBSP, " ")
+                text_line = TextLine(
+                    fragments=[Fragment(line_text, graphics_state, self.k)] if line_text or justified else [],
+                    text_width=units * self.font_size_pt * 0.001 / self.k,
+                    number_of_spaces=spaces,
+                    align=Align.J if justified else Align.L,
+                    height=font_height,
+                    max_width=cell_width,
+                    trailing_nl=trailing_newline,
+                    trailing_form_feed=text[end:end + 1] == "\f",
+                    indent=0,
+                )
+                if self._perform_page_break_if_need_be(h):
+                    page_break_triggered = True
+                self._render_styled_text_line(
+                    text_line,
+                    h=h,
+                    new_x=XPos.RIGHT if index == last else XPos.LEFT,
+                    new_y=YPos.NEXT,
+                    border=0,
+                    fill=False,
+                    link="",
+                    padding=no_padding,
+                    prevent_font_change=False,
+                )
+            if lines[-1][5]:
+                self.ln()
+            return page_break_triggered
+
+        def output(self, name="", dest="", linearize=False, output_producer_class=SubsetCachingOutputProducer):
+            return super().output(name, dest, linearize=linearize, output_producer_class=output_producer_class)
+
+        def output_to(self, stream):
+            # Writes the PDF to any writable binary stream (open file, socket file, BytesIO, sys.stdout.buffer)
+            # as it is serialized, instead of building it in memory first; returns the number of bytes written.
+            # Like output(), it can only be called once per document.
+            return len(self.output(output_producer_class=streaming_producer(stream)))
+
+        def _default_file_id(self, buffer):
+            if isinstance(buffer, StreamBuffer):
+                return stream_file_id(self, buffer)
+            return super()._default_file_id(buffer)
+
+    return ResumePDF
+
+def __getattr__(name):
+    # Defines ResumePDF on first use (`from resume_generator import ResumePDF` works as usual)
+    if name == "ResumePDF":
+        globals()["ResumePDF"] = _define_resume_pdf()
+        return globals()["ResumePDF"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 TEXT_COLOR = (30, 30, 30)
 SECTION_HEADER_COLOR = (0, 0, 0)
 
-def add_section_header(pdf_obj, text):
-    pdf_obj.ln(5)
-    pdf_obj.set_font("DejaVu", "B", size=12)
+# Headings of the sections after the name and contact line; the keys are also their default order
+SECTION_TITLES = {
+    "summary": "Summary",
+    "education": "Education",
+    "experience": "Experience",
+    "projects": "Projects",
+    "awards": "Awards & Honors",
+    "volunteer_work": "Volunteer Work",
+    "skills": "Skills",
+}
+
+# Page and type settings a resume is laid out with. "margins" is (left, top, right) in mm, or None
+# for fpdf's default of 1 cm; sizes are in points, spacing in mm. "classic" is the original layout.
+LAYOUTS = {
+    "classic": {
+        "format": "A4",
+        "margins": None,
+        "page_break_margin": 15,
+        "name_size": 20,
+        "contact_size": 8,
+        "header_size": 12,
+        "body_size": 10,
+        "line_height": 5,
+        "name_height": 10,
+        "header_height": 10,
+        "header_gap": 5,
+        "entry_gap": 2,
+        "bullet_indent": 5,
+        "section_order": tuple(SECTION_TITLES),
+    },
+}
+LAYOUTS["a4"] = LAYOUTS["classic"]
+LAYOUTS["letter"] = dict(LAYOUTS["classic"], format="Letter")
+LAYOUTS["condensed"] = dict(LAYOUTS["classic"], margins=(8, 8, 8), page_break_margin=8, name_size=16,
+                            contact_size=7.5, header_size=10.5, body_size=8.5, line_height=3.8, name_height=7,
+                            header_height=6, header_gap=1.5, entry_gap=1, bullet_indent=3)
+DEFAULT_LAYOUT = "classic"
+
+def resolve_layout(layout=None):
+    # Returns the full settings for a layout name, a dict of settings, or None (the default layout).
+    # A dict may name a "base" layout (default "classic") and override any of its settings.
+    if layout is None:
+        layout = DEFAULT_LAYOUT
+    if isinstance(layout, str):
+        if layout not in LAYOUTS:
+            raise ValueError(f"unknown layout '{layout}' (choose from {', '.join(sorted(LAYOUTS))})")
+        return LAYOUTS[layout]
+    settings = dict(resolve_layout(layout.get("base")))
+    unknown = set(layout) - set(settings) - {"base", "name"}
+    if unknown:
+        raise ValueError(f"unknown layout setting(s): {', '.join(sorted(unknown))}")
+    settings.update((key, value) for key, value in layout.items() if key not in ("base", "name"))
+    for section_name in settings["section_order"]:
+        if section_name not in SECTION_TITLES:
+            raise ValueError(f"unknown section '{section_name}' in section_order")
+    return settings
+
+# Experience entries have always been indented a little less than the other sections' bullets
+_BULLET_INDENT_ADJUST = {"experience": -1}
+
+def prepare_resume_text(data, bullet="• "):
+    # Builds every string generate_resume_pdf draws, once, so several layouts of the same resume
+    # can share it (see render_targets). `data` must be normalized by check_resume() first.
+    # Entries are (bold line, plain line, bullets or None); each bullet starts with `bullet`.
+    def entries(field, bold, plain, described=True):
+        return [(f"{entry[bold]}", plain(entry), [f"{bullet}{item}" for item in entry["description"]] if described else None)
+                for entry in data[field]]
+
+    contact_info = f"{data['phone']} | {data['email']}"
+    if data["linkedin"]:
+        contact_info += f" | {data['linkedin']}"
+    return {
+        "name": data["name"],
+        "contact": contact_info,
+        "summary": data["summary"],
+        "education": entries("education", "degree", lambda e: f"{e['university']} - {e['year']}", described=False),
+        "experience": entries("experience", "title", lambda e: f"{e['company']} | {e['dates']}"),
+        "projects": entries("projects", "name",
+                            lambda e: f"{e['dates']} | {e['link']}" if e["link"] else f"{e['dates']}"),
+        "awards": entries("awards", "name", lambda e: f"{e['body']} - {e['date']}", described=False),
+        "volunteer_work": entries("volunteer_work", "role", lambda e: f"{e['organization']} | {e['dates']}"),
+        "skills": ", ".join(data["skills"]),
+    }
+
+def add_section_header(pdf_obj, text, layout=None):
+    # Draws one section heading and its rule. generate_resume_pdf draws them from its compiled plan
+    # (SECTION_HEADER in render_plan.py); this is for callers that add sections of their own.
+    from fpdf import XPos, YPos
+
+    layout = resolve_layout(layout)
+    pdf_obj.ln(layout["header_gap"])
+    pdf_obj.set_font("DejaVu", "B", size=layout["header_size"])
     pdf_obj.set_text_color(*SECTION_HEADER_COLOR)
-    pdf_obj.cell(0, 10, text, align="L", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf_obj.cell(0, layout["header_height"], text, align="L", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf_obj.line(pdf_obj.get_x(), pdf_obj.get_y(), pdf_obj.w - pdf_obj.r_margin, pdf_obj.get_y())
-    pdf_obj.ln(5)
-    pdf_obj.set_font("DejaVu", size=10)
+    pdf_obj.ln(layout["header_gap"])
+    pdf_obj.set_font("DejaVu", size=layout["body_size"])
     pdf_obj.set_text_color(*TEXT_COLOR)
 
-def generate_resume_pdf(data, pdf_obj):
+def generate_resume_pdf(data, pdf_obj, instrumentation=None, layout=None, prepared=None, section_memo=None,
+                        bookmark=None):
+    # instrumentation: optional render_metrics.RenderInstrumentation that records timings and counts per section
+    # layout: a LAYOUTS name or settings dict (see resolve_layout); the page format itself is chosen when
+    # pdf_obj is created, e.g. ResumePDF(unit="mm", format="Letter")
+    # prepared: the result of prepare_resume_text() on the checked data, when the caller already has it
+    # section_memo: a section_memo.SectionMemo kept across renders, so sections that haven't changed since
+    # the last render are replayed instead of laid out again
+    # bookmark: a document outline entry to add for the resume's first page (see booklet.py)
+    from font_registry import FONT_REGISTRY
+    from render_plan import get_plan, run_plan
+
+    layout = resolve_layout(layout)
+    if prepared is None:
+        # Checked up front, so a bad record fails with every problem listed before any page is drawn
+        data, problems = check_resume(data)
+        if problems:
+            raise ValueError("invalid resume data: " + "; ".join(problems))
+        prepared = prepare_resume_text(data)
+    if instrumentation is not None:
+        instrumentation.begin(pdf_obj)
+        section = instrumentation.section
+    else:
+        section = no_section
+    section("header")
+    if layout["margins"] is not None:
+        pdf_obj.set_margins(*layout["margins"])
     pdf_obj.add_page() # Add page at the start of generation
-    pdf_obj.set_auto_page_break(auto=True, margin=15)
+    if bookmark is not None:
+        pdf_obj.start_section(bookmark)
+    pdf_obj.set_auto_page_break(auto=True, margin=layout["page_break_margin"])
 
-    # Add a Unicode font (DejaVuSans.ttf needs to be in the same directory as this script)
-    pdf_obj.add_font("DejaVu", "", "DejaVuSans.ttf", uni=True)
-    pdf_obj.add_font("DejaVu", "B", "DejaVuSans-Bold.ttf", uni=True)
+    # Add the Unicode DejaVu fonts. They are parsed once per process by the font registry
+    # (DejaVuSans.ttf needs to be in the working directory or next to this script)
+    FONT_REGISTRY.install(pdf_obj)
     pdf_obj.set_text_color(*TEXT_COLOR) # Ensure text color is set for this PDF instance
 
-    # Name and Contact Info
-    pdf_obj.set_font("DejaVu", "B", size=20)
-    pdf_obj.cell(0, 10, data["name"], align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf_obj.set_font("DejaVu", size=8)
-    contact_info = f"{data['phone']} | {data['email']}"
-    if data["linkedin"]:
-        contact_info += f" | {data['linkedin']}"
-    pdf_obj.cell(0, 5, contact_info, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-    pdf_obj.ln(10)
-
-    # Summary
-    if data["summary"]:
-        add_section_header(pdf_obj, "Summary")
-        pdf_obj.multi_cell(0, 5, data["summary"])
-
-    # Education
-    if data["education"]:
-        add_section_header(pdf_obj, "Education") 
-        for edu in data["education"]:
-            pdf_obj.set_font("DejaVu", "B", size=10)
-            pdf_obj.cell(0, 5, f"{edu['degree']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf_obj.set_font("DejaVu", size=10)
-            pdf_obj.cell(0, 5, f"{edu['university']} - {edu['year']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf_obj.ln(2)
-
-
-    # Experience
-    if data["experience"]:
-        add_section_header(pdf_obj, "Experience") 
-        for exp in data["experience"]:
-            pdf_obj.set_font("DejaVu", "B", size=10)
-            pdf_obj.cell(0, 5, f"{exp['title']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf_obj.set_font("DejaVu", size=10)
-            pdf_obj.cell(0, 5, f"{exp['company']} | {exp['dates']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-            original_x = pdf_obj.get_x()
-            indent_amount = 4
-            for item in exp["description"]:
-                pdf_obj.set_x(original_x + indent_amount)
-                pdf_obj.multi_cell(0, 5, f"• {item}")
-            pdf_obj.set_x(original_x)
-            pdf_obj.ln(2)
-
-    # Projects
-    if data["projects"]:
-        add_section_header(pdf_obj, "Projects") 
-        for proj in data["projects"]:
-            pdf_obj.set_font("DejaVu", "B", size=10)
-            pdf_obj.cell(0, 5, f"{proj['name']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf_obj.set_font("DejaVu", size=10)
-            if proj["link"]:
-                pdf_obj.cell(0, 5, f"{proj['dates']} | {proj['link']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            else:
-                pdf_obj.cell(0, 5, f"{proj['dates']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-            original_x = pdf_obj.get_x()
-            indent_amount = 5
-            for item in proj["description"]:
-                pdf_obj.set_x(original_x + indent_amount)
-                pdf_obj.multi_cell(0, 5, f"• {item}")
-            pdf_obj.set_x(original_x)
-            pdf_obj.ln(2)
-
-    # Awards
-    if data["awards"]:
-        add_section_header(pdf_obj, "Awards & Honors") 
-        for award in data["awards"]:
-            pdf_obj.set_font("DejaVu", "B", size=10)
-            pdf_obj.cell(0, 5, f"{award['name']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf_obj.set_font("DejaVu", size=10)
-            pdf_obj.cell(0, 5, f"{award['body']} - {award['date']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf_obj.ln(2)
-
-    # Volunteer Work
-    if data["volunteer_work"]:
-        add_section_header(pdf_obj, "Volunteer Work") 
-        for vol in data["volunteer_work"]:
-            pdf_obj.set_font("DejaVu", "B", size=10)
-            pdf_obj.cell(0, 5, f"{vol['role']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf_obj.set_font("DejaVu", size=10)
-            pdf_obj.cell(0, 5, f"{vol['organization']} | {vol['dates']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-            original_x = pdf_obj.get_x()
-            indent_amount = 5
-            for item in vol["description"]:
-                pdf_obj.set_x(original_x + indent_amount)
-                pdf_obj.multi_cell(0, 5, f"• {item}")
-            pdf_obj.set_x(original_x)
-            pdf_obj.ln(2)
-
-    # Skills
-    if data["skills"]:
-        add_section_header(pdf_obj, "Skills") 
-        skills_text = ", ".join(data["skills"])
-        pdf_obj.multi_cell(0, 5, skills_text)
+    # Name and contact info, then Summary, Education, Experience, Projects, Awards, Volunteer Work and
+    # Skills in the layout's order, drawn from the layout's compiled plan (see render_plan.py)
+    run_plan(pdf_obj, get_plan(layout), prepared, section, section_memo)
+
+    if instrumentation is not None:
+        instrumentation.end()
+
+def target_name(target, index):
+    # Label of the index-th target given to render_targets: the layout name, or a dict's "name"
+    return target if isinstance(target, str) else target.get("name", f"target{index + 1}")
+
+def render_targets(data, targets, streams=None, creation_date=None):
+    """Renders one resume in several layouts in a single call.
+
+    targets is a list of LAYOUTS names or layout dicts (a dict's "name" labels
+    its output). The data is validated and its text prepared once, the fonts
+    come from the shared registry, and every variant after the first reuses
+    the font subsets of the one before, since they draw the same glyphs.
+    Returns {name: PDF bytes}, or {name: bytes written} when a matching list
+    of writable streams is given.
+    """
+    pdf_class = globals().get("ResumePDF") or __getattr__("ResumePDF")
+    data, problems = check_resume(data)
+    if problems:
+        raise ValueError("invalid resume data: " + "; ".join(problems))
+    if streams is not None and len(streams) != len(targets):
+        raise ValueError("give one stream per target")
+    named = [(target_name(target, i), resolve_layout(target)) for i, target in enumerate(targets)]
+    if len({name for name, _ in named}) != len(named):
+        raise ValueError("target names must be unique")
+
+    prepared = prepare_resume_text(data)
+    results = {}
+    for i, (name, layout) in enumerate(named):
+        pdf_instance = pdf_class(unit="mm", format=layout["format"])
+        if creation_date is not None:
+            pdf_instance.set_creation_date(creation_date)
+        generate_resume_pdf(data, pdf_instance, layout=layout, prepared=prepared)
+        if streams is None:
+            results[name] = bytes(pdf_instance.output())
+        else:
+            results[name] = pdf_instance.output_to(streams[i])
+    return results
 
+if __name__ == "__main__":
+    # `python resume_generator.py` runs the headless CLI (see resume_cli.py); with no arguments it asks
+    # for a new resume interactively, as it always has
+    import sys
+    from resume_cli import main
+    sys.exit(main(sys.argv[1:] or ["new", "--pdf", "resume.pdf"]))
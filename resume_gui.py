@@ -2,9 +2,330 @@ import customtkinter as ctk
 import tkinter as tk # We might still need some basic tkinter constants/exceptions
 from tkinter import filedialog, messagebox # For file dialogs and pop-up messages
 import os
+import queue
+import threading
+
+
+from form_model import FormModel
+from resume_history import ResumeHistory
+from resume_journal import JournaledResumeStore, atomic_output
+from resume_store import DEFAULT_DB_PATH, ResumeStore
+from section_memo import SectionMemo
+from resume_generator import collect_resume_data, generate_resume_pdf, load_resume_data, ResumePDF # Import ResumePDF as well
+
+# Autosave runs this long after the last edit (only if something changed since the last save)
+AUTOSAVE_DELAY_MS = 2000
+
+# Widget events that mean the user edited a field
+EDIT_EVENTS = ("<KeyRelease>", "<<Paste>>", "<<Cut>>")
+
+# Number of entry rows each multi-entry section builds at once; "Show more" reveals the next batch
+ENTRY_PAGE_SIZE = 20
+
+# Field layout of each multi-entry section: (data key, label, widget kind)
+EDUCATION_FIELDS = [("degree", "Degree:", "entry"), ("university", "University:", "entry"), ("year", "Year:", "entry")]
+EXPERIENCE_FIELDS = [("title", "Title:", "entry"), ("company", "Company:", "entry"), ("dates", "Dates:", "entry"),
+                     ("description", "Description:", "text")]
+PROJECT_FIELDS = [("name", "Name:", "entry"), ("link", "Link:", "entry"), ("dates", "Dates:", "entry"),
+                  ("description", "Description:", "text")]
+AWARD_FIELDS = [("name", "Award Name:", "entry"), ("body", "Awarding Body:", "entry"), ("date", "Date Received:", "entry")]
+VOLUNTEER_FIELDS = [("role", "Role:", "entry"), ("organization", "Organization:", "entry"), ("dates", "Dates:", "entry"),
+                    ("description", "Description:", "text")]
+
+
+class _PdfJobCancelled(Exception):
+    # Raised inside atomic_output() when Generate is cancelled mid-write, so the temp file is dropped
+    pass
+
+
+class EntryListSection:
+    """One multi-entry section (Education, Experience, ...) of the form.
+
+    Entries are kept as plain dicts. Only the first `visible_count` of them get a
+    collapsed summary row, and only expanded entries get editor widgets, so
+    loading a resume with hundreds of entries builds a fixed number of widgets.
+    Rows and editors that are no longer shown go back to a pool and are reused.
+    Tk widgets can't be re-parented, so rows and editors are both children of
+    the entries container and an editor is packed right after its row.
+
+    set_values() reconciles instead of rebuilding: entries are matched by
+    entry_key(), matched ones are updated in place (only changed fields are
+    written to their widgets), and only added or removed entries cost widget work.
+
+    An entry added while some are hidden gets a row after the shown page
+    without revealing the ones in between; rows are always packed in entry order.
+    """
+
+    def __init__(self, section_frame, container, fields, page_size=ENTRY_PAGE_SIZE, on_change=None,
+                 scroll_to=None):
+        self.section_frame = section_frame
+        self.container = container
+        self.fields = fields
+        self.on_change = on_change # called whenever the user edits, adds or removes an entry
+        self.scroll_to = scroll_to # called with a widget to bring into view (the new entry's row)
+        self.page_size = page_size
+        self.visible_count = page_size
+        self.entries = [] # {"values": dict, "row": row widgets or None, "editor": editor widgets or None}
+        self._packed = [] # entries whose rows are packed, in packing order
+        self._row_pool = []
+        self._editor_pool = []
+
+        self.show_more_button = ctk.CTkButton(section_frame, text="", fg_color="transparent", border_width=1,
+                                              command=self.show_more)
+        self.show_more_button.grid(row=3, column=0, sticky="w", pady=(0, 5))
+        self._update_show_more()
+
+    # --- Data ---
+
+    def _empty_values(self):
+        return {key: [] if kind == "text" else "" for key, _, kind in self.fields}
+
+    def get_values(self):
+        # Current data of every entry, reading editor widgets for the expanded ones
+        for entry in self.entries:
+            if entry["editor"] is not None:
+                self._read_editor(entry)
+        return [dict(entry["values"]) for entry in self.entries]
+
+    def entry_key(self, values):
+        # Identity of an entry for reconciliation: its first two fields (degree + university, title + company, ...)
+        return tuple(str(values.get(key) or "") for key, _, _ in self.fields[:2])
+
+    def set_values(self, values_list):
+        # Makes the section show values_list, reusing entries (and their widgets) whose key matches
+        existing = {}
+        for entry in self.entries:
+            if entry["editor"] is not None:
+                self._read_editor(entry)
+            existing.setdefault(self.entry_key(entry["values"]), []).append(entry)
+
+        new_entries = []
+        for values in values_list:
+            values = self._normalize(values)
+            matches = existing.get(self.entry_key(values))
+            if matches:
+                entry = matches.pop(0)
+                self._update(entry, values)
+            else:
+                entry = {"values": values, "row": None, "editor": None}
+            new_entries.append(entry)
+
+        for unmatched in existing.values():
+            for entry in unmatched:
+                self._hide(entry)
+        self.entries = new_entries
+        self.visible_count = max(self.page_size, min(self.visible_count, len(new_entries)))
+        self._layout()
+        self._update_show_more()
+
+    def _normalize(self, values):
+        normalized = self._empty_values()
+        if values:
+            normalized.update({key: values.get(key, normalized[key]) for key, _, _ in self.fields})
+        return normalized
+
+    def _update(self, entry, values):
+        changed = [key for key, _, _ in self.fields if entry["values"].get(key) != values[key]]
+        if not changed:
+            return
+        entry["values"] = values
+        if entry["editor"] is not None:
+            self._write_editor(entry["editor"], values, changed)
+        if entry["row"] is not None:
+            entry["row"]["label"].configure(text=self.summary_text(values))
+
+    def _layout(self):
+        # Shows rows for the visible entries and releases the rest; re-packs only if the order changed
+        visible = self.entries[:self.visible_count]
+        for entry in self.entries[self.visible_count:]:
+            self._hide(entry)
+        for entry in visible:
+            self._show_row(entry)
+        if self._packed != visible:
+            for entry in self._packed:
+                entry["row"]["frame"].pack_forget()
+                if entry["editor"] is not None:
+                    entry["editor"]["frame"].pack_forget()
+            self._packed = []
+            for entry in visible:
+                self._pack_row(entry)
+
+    def add(self, initial_values=None):
+        # Adds an entry at the end and opens its editor (used by the "Add New ..." buttons). Only the new
+        # entry gets a row; entries hidden behind "Show more" stay hidden.
+        entry = self._append(initial_values)
+        self.expand(entry)
+        self._update_show_more()
+        if self.scroll_to is not None:
+            self.scroll_to(entry["row"]["frame"])
+        self._changed()
+        return entry
+
+    def remove(self, entry):
+        self._hide(entry)
+        self.entries.remove(entry)
+        # Keep the page full: reveal the entry that just moved into the visible range
+        if len(self.entries) >= self.visible_count:
+            self._show_row(self.entries[self.visible_count - 1])
+        self._update_show_more()
+        self._changed()
+
+    def _changed(self, event=None):
+        if self.on_change is not None:
+            self.on_change()
+
+    def _append(self, values):
+        entry = {"values": self._normalize(values), "row": None, "editor": None}
+        self.entries.append(entry)
+        if len(self.entries) <= self.visible_count:
+            self._show_row(entry)
+        return entry
+
+    def summary_text(self, values):
+        parts = [str(values.get(key, "")).strip() for key, _, kind in self.fields if kind == "entry"]
+        parts = [part for part in parts[:3] if part]
+        return " | ".join(parts) if parts else "(empty entry)"
+
+    # --- Rows ---
+
+    def show_more(self):
+        start = self.visible_count
+        self.visible_count += self.page_size
+        for entry in self.entries[start:self.visible_count]:
+            self._show_row(entry)
+        self._update_show_more()
+
+    def _update_show_more(self):
+        # Entries past the page that were added since it was shown already have rows
+        hidden = sum(1 for entry in self.entries[self.visible_count:] if entry["row"] is None)
+        if hidden > 0:
+            self.show_more_button.configure(text=f"Show {min(hidden, self.page_size)} more ({hidden} hidden)")
+            self.show_more_button.grid()
+        else:
+            self.show_more_button.grid_remove()
 
+    def _show_row(self, entry):
+        if entry["row"] is not None:
+            return
+        row = self._row_pool.pop() if self._row_pool else self._build_row()
+        row["entry"] = entry
+        row["label"].configure(text=self.summary_text(entry["values"]))
+        row["toggle"].configure(text="Collapse" if entry["editor"] is not None else "Edit")
+        entry["row"] = row
+        self._pack_row(entry, before=self._next_row(entry))
+
+    def _next_row(self, entry):
+        # The first shown entry that comes after `entry` (only an entry added past the page can), or None
+        position = self.entries.index(entry)
+        following = None
+        for shown in reversed(self._packed):
+            if self.entries.index(shown) < position:
+                break
+            following = shown
+        return following
+
+    def _pack_row(self, entry, before=None):
+        # Packs entry's row (and editor) at the end, or just before the row of entry `before`
+        if before is None:
+            entry["row"]["frame"].pack(fill="x", padx=5, pady=(5, 0))
+            self._packed.append(entry)
+        else:
+            entry["row"]["frame"].pack(fill="x", padx=5, pady=(5, 0), before=before["row"]["frame"])
+            self._packed.insert(self._packed.index(before), entry)
+        if entry["editor"] is not None:
+            entry["editor"]["frame"].pack(fill="x", padx=5, pady=(0, 5), after=entry["row"]["frame"])
+
+    def _build_row(self):
+        frame = ctk.CTkFrame(self.container, border_width=1, corner_radius=8)
+        frame.grid_columnconfigure(0, weight=1)
+        row = {"frame": frame, "entry": None}
+        row["label"] = ctk.CTkLabel(frame, text="", anchor="w")
+        row["label"].grid(row=0, column=0, sticky="ew", padx=8, pady=4)
+        row["toggle"] = ctk.CTkButton(frame, text="Edit", width=80, command=lambda: self.toggle(row["entry"]))
+        row["toggle"].grid(row=0, column=1, padx=4, pady=4)
+        remove_button = ctk.CTkButton(frame, text="Remove", width=80, command=lambda: self.remove(row["entry"]))
+        remove_button.grid(row=0, column=2, padx=4, pady=4)
+        return row
+
+    def _hide(self, entry):
+        self.collapse(entry)
+        row = entry["row"]
+        if row is not None:
+            row["frame"].pack_forget()
+            row["entry"] = None
+            self._row_pool.append(row)
+            self._packed.remove(entry)
+            entry["row"] = None
+
+    # --- Editors ---
+
+    def toggle(self, entry):
+        if entry["editor"] is None:
+            self.expand(entry)
+        else:
+            self.collapse(entry)
+
+    def expand(self, entry):
+        if entry["editor"] is not None:
+            return
+        self._show_row(entry)
+        editor = self._editor_pool.pop() if self._editor_pool else self._build_editor()
+        self._write_editor(editor, entry["values"])
+        editor["frame"].pack(fill="x", padx=5, pady=(0, 5), after=entry["row"]["frame"])
+        entry["editor"] = editor
+        entry["row"]["toggle"].configure(text="Collapse")
+
+    def collapse(self, entry):
+        editor = entry["editor"]
+        if editor is None:
+            return
+        self._read_editor(entry)
+        editor["frame"].pack_forget()
+        self._editor_pool.append(editor)
+        entry["editor"] = None
+        if entry["row"] is not None:
+            entry["row"]["label"].configure(text=self.summary_text(entry["values"]))
+            entry["row"]["toggle"].configure(text="Edit")
+
+    def _build_editor(self):
+        frame = ctk.CTkFrame(self.container, fg_color="transparent")
+        frame.grid_columnconfigure(1, weight=1)
+        editor = {"frame": frame}
+        for row_num, (key, label, kind) in enumerate(self.fields):
+            ctk.CTkLabel(frame, text=label).grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
+            if kind == "text":
+                widget = ctk.CTkTextbox(frame, height=70, wrap="word")
+            else:
+                widget = ctk.CTkEntry(frame)
+            widget.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
+            for event in EDIT_EVENTS:
+                widget.bind(event, self._changed, add="+")
+            editor[key] = widget
+        return editor
+
+    def _write_editor(self, editor, values, keys=None):
+        for key, _, kind in self.fields:
+            if keys is not None and key not in keys:
+                continue
+            widget = editor[key]
+            if kind == "text":
+                widget.delete("0.0", "end")
+                # Join list of points with newline for textbox
+                widget.insert("0.0", "\n".join(values.get(key) or []))
+            else:
+                widget.delete(0, ctk.END)
+                widget.insert(0, values.get(key) or "")
+
+    def _read_editor(self, entry):
+        editor = entry["editor"]
+        for key, _, kind in self.fields:
+            widget = editor[key]
+            if kind == "text":
+                text = widget.get("0.0", "end").strip()
+                entry["values"][key] = [p.strip() for p in text.split('\n') if p.strip()]
+            else:
+                entry["values"][key] = widget.get()
 
-from resume_generator import collect_resume_data, generate_resume_pdf, save_resume_data, load_resume_data, FPDF # Import FPDF as well
 
 class ResumeBuilderApp(ctk.CTk):
     def __init__(self):
@@ -34,6 +355,24 @@ class ResumeBuilderApp(ctk.CTk):
         self.generate_pdf_button = ctk.CTkButton(self.control_frame, text="Generate PDF", command=self.generate_pdf_gui)
         self.generate_pdf_button.grid(row=0, column=2, padx=5, pady=5, sticky="e")
 
+        self.library_button = ctk.CTkButton(self.control_frame, text="Open from Library", command=self.load_from_library_gui)
+        self.library_button.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+
+        self.save_version_button = ctk.CTkButton(self.control_frame, text="Save Version", command=self.save_version_gui)
+        self.save_version_button.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+
+        self.open_version_button = ctk.CTkButton(self.control_frame, text="Open Version", command=self.open_version_gui)
+        self.open_version_button.grid(row=2, column=2, padx=5, pady=5, sticky="e")
+
+        # Progress row for background PDF generation (hidden until a PDF is being generated)
+        self.pdf_status_label = ctk.CTkLabel(self.control_frame, text="")
+        self.pdf_status_label.grid(row=1, column=0, padx=5, sticky="w")
+        self.pdf_progress_bar = ctk.CTkProgressBar(self.control_frame, mode="indeterminate")
+        self.pdf_progress_bar.grid(row=1, column=1, padx=5, sticky="ew")
+        self.cancel_pdf_button = ctk.CTkButton(self.control_frame, text="Cancel", command=self.cancel_pdf_gui)
+        self.cancel_pdf_button.grid(row=1, column=2, padx=5, pady=5, sticky="e")
+        self._show_pdf_progress(False)
+
         # --- Scrollable Frame for Resume Sections ---
         # This will hold all our input fields
         self.scrollable_frame = ctk.CTkScrollableFrame(self, label_text="Resume Details")
@@ -43,6 +382,13 @@ class ResumeBuilderApp(ctk.CTk):
         # --- Data Storage ---
         self.resume_data = {} # This will hold the current resume data (similar to the dict in CLI)
         self.current_json_filename = None # To track which file we loaded/saved from
+        self._autosave_after_id = None # Pending debounced autosave
+        self._autosave_thread = None # Autosave currently writing to disk, if any
+        self._journal_store = None # Appends autosaves to current_json_filename's journal; reset on load/save
+        self._history = None # Version history of current_json_filename, opened on first use
+        self._pdf_job = None # The PDF generation currently running in the background, if any
+        self._pending_pdf_request = None # Re-generation requested while a job was running
+        self._section_memo = SectionMemo() # Sections unchanged since the last Generate are replayed, not laid out again
 
         # --- Build the UI for sections (placeholders for now) ---
         self._create_personal_info_section()
@@ -54,6 +400,32 @@ class ResumeBuilderApp(ctk.CTk):
         self._create_volunteer_section()  # Will need dynamic handling
         self._create_skills_section()
 
+        # --- Form model: caches the data dict and re-reads only the sections that were edited ---
+        self.form_model = FormModel({
+            "personal": self._read_personal_info,
+            "summary": self._read_summary,
+            "education": lambda: {"education": self.education_section.get_values()},
+            "experience": lambda: {"experience": self.experience_section.get_values()},
+            "projects": lambda: {"projects": self.projects_section.get_values()},
+            "awards": lambda: {"awards": self.awards_section.get_values()},
+            "volunteer_work": lambda: {"volunteer_work": self.volunteer_section.get_values()},
+            "skills": self._read_skills,
+        })
+        for widget in (self.name_entry, self.email_entry, self.phone_entry, self.linkedin_entry):
+            self._watch(widget, "personal")
+        self._watch(self.summary_textbox, "summary")
+        self._watch(self.skills_entry, "skills")
+        for section_name, section in (("education", self.education_section), ("experience", self.experience_section),
+                                      ("projects", self.projects_section), ("awards", self.awards_section),
+                                      ("volunteer_work", self.volunteer_section)):
+            section.on_change = lambda name=section_name: self.form_model.mark_dirty(name)
+        self.form_model.subscribe(self._schedule_autosave)
+
+    def _watch(self, widget, section):
+        # Marks `section` dirty in the form model whenever the user edits `widget`
+        for event in EDIT_EVENTS:
+            widget.bind(event, lambda e: self.form_model.mark_dirty(section), add="+")
+
     def _create_personal_info_section(self):
         # We'll create a new frame for each section to keep them organized
         personal_info_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
@@ -89,315 +461,68 @@ class ResumeBuilderApp(ctk.CTk):
         self.summary_textbox.grid(row=1, column=0, sticky="ew", padx=5, pady=2)
 
 
-    def _create_education_section(self):
-        # Education and other list-based sections will be more complex.
-        # We'll use a frame to hold existing entries and an "Add New" button.
-        self.education_frames = [] # To keep track of individual education entry frames
+    def _create_entry_list_section(self, name, title, add_text, add_command, fields):
+        # Builds a multi-entry section: title, container for the entries, "Add New" and "Show more" buttons.
+        section_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
+        section_frame.pack(fill="x", padx=10, pady=5)
+        section_frame.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(section_frame, text=title, font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, sticky="w", pady=(0,5))
 
-        self.education_section_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
-        self.education_section_frame.pack(fill="x", padx=10, pady=5)
-        self.education_section_frame.grid_columnconfigure(0, weight=1)
+        # Frame to hold the dynamic entries
+        entries_container = ctk.CTkFrame(section_frame, fg_color="transparent")
+        entries_container.grid(row=1, column=0, sticky="ew")
+        entries_container.grid_columnconfigure(0, weight=1)
 
-        ctk.CTkLabel(self.education_section_frame, text="Education", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, sticky="w", pady=(0,5))
+        add_button = ctk.CTkButton(section_frame, text=add_text, command=add_command)
+        add_button.grid(row=2, column=0, sticky="w", pady=5)
 
-        # Frame to hold dynamic education entries
-        self.education_entries_container = ctk.CTkFrame(self.education_section_frame, fg_color="transparent")
-        self.education_entries_container.grid(row=1, column=0, sticky="ew")
-        self.education_entries_container.grid_columnconfigure(0, weight=1)
+        setattr(self, f"{name}_section_frame", section_frame)
+        setattr(self, f"{name}_entries_container", entries_container)
+        setattr(self, f"add_{name}_button", add_button)
+        return EntryListSection(section_frame, entries_container, fields, scroll_to=self._scroll_into_view)
 
+    def _scroll_into_view(self, widget):
+        # Scrolls the form so `widget` (a row inside it) is at the top of the visible area
+        self.update_idletasks()
+        content_height = self.scrollable_frame.winfo_height()
+        if content_height > 0:
+            top = widget.winfo_rooty() - self.scrollable_frame.winfo_rooty()
+            self.scrollable_frame._parent_canvas.yview_moveto(max(0.0, top / content_height))
 
-        self.add_education_button = ctk.CTkButton(self.education_section_frame, text="Add New Education", command=self._add_education_entry_gui)
-        self.add_education_button.grid(row=2, column=0, sticky="w", pady=5)
+    def _create_education_section(self):
+        self.education_section = self._create_entry_list_section(
+            "education", "Education", "Add New Education", self._add_education_entry_gui, EDUCATION_FIELDS)
 
     def _add_education_entry_gui(self, initial_values=None):
-        # Creates a new set of input fields for one education entry
-        # initial_values will be a dict if loading, or None if adding new
-        entry_frame = ctk.CTkFrame(self.education_entries_container, border_width=1, corner_radius=8)
-        entry_frame.pack(fill="x", padx=5, pady=5)
-        entry_frame.grid_columnconfigure(1, weight=1)
-
-        row_num = 0
-        ctk.CTkLabel(entry_frame, text="Degree:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        degree_entry = ctk.CTkEntry(entry_frame)
-        degree_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="University:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        university_entry = ctk.CTkEntry(entry_frame)
-        university_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Year:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        year_entry = ctk.CTkEntry(entry_frame)
-        year_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        if initial_values: # Populate if initial data is provided (e.g., from loading)
-            degree_entry.insert(0, initial_values.get("degree", ""))
-            university_entry.insert(0, initial_values.get("university", ""))
-            year_entry.insert(0, initial_values.get("year", ""))
-
-        # Button to remove this specific entry
-        remove_button = ctk.CTkButton(entry_frame, text="Remove", command=lambda: self._remove_education_entry_gui(entry_frame))
-        remove_button.grid(row=row_num, column=0, columnspan=2, pady=5, sticky="e")
-
-        self.education_frames.append({
-            "frame": entry_frame,
-            "degree": degree_entry,
-            "university": university_entry,
-            "year": year_entry
-        })
+        self.education_section.add(initial_values)
 
-    def _remove_education_entry_gui(self, entry_frame_to_remove):
-        entry_frame_to_remove.destroy() # Remove the frame from the UI
-        # Also remove it from our internal tracking list
-        self.education_frames = [
-            item for item in self.education_frames if item["frame"] != entry_frame_to_remove
-        ]
-
-    # --- Placeholder methods for other sections (will be similar to education) ---
     def _create_experience_section(self):
-        # Similar structure to education, but with textbox for description
-        self.experience_frames = []
-        self.experience_section_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
-        self.experience_section_frame.pack(fill="x", padx=10, pady=5)
-        self.experience_section_frame.grid_columnconfigure(0, weight=1)
-        ctk.CTkLabel(self.experience_section_frame, text="Experience", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, sticky="w", pady=(0,5))
-        self.experience_entries_container = ctk.CTkFrame(self.experience_section_frame, fg_color="transparent")
-        self.experience_entries_container.grid(row=1, column=0, sticky="ew")
-        self.experience_entries_container.grid_columnconfigure(0, weight=1)
-        self.add_experience_button = ctk.CTkButton(self.experience_section_frame, text="Add New Experience", command=self._add_experience_entry_gui)
-        self.add_experience_button.grid(row=2, column=0, sticky="w", pady=5)
+        self.experience_section = self._create_entry_list_section(
+            "experience", "Experience", "Add New Experience", self._add_experience_entry_gui, EXPERIENCE_FIELDS)
 
     def _add_experience_entry_gui(self, initial_values=None):
-        entry_frame = ctk.CTkFrame(self.experience_entries_container, border_width=1, corner_radius=8)
-        entry_frame.pack(fill="x", padx=5, pady=5)
-        entry_frame.grid_columnconfigure(1, weight=1)
-
-        row_num = 0
-        ctk.CTkLabel(entry_frame, text="Title:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        title_entry = ctk.CTkEntry(entry_frame)
-        title_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Company:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        company_entry = ctk.CTkEntry(entry_frame)
-        company_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Dates:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        dates_entry = ctk.CTkEntry(entry_frame)
-        dates_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Description:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        description_textbox = ctk.CTkTextbox(entry_frame, height=70, wrap="word")
-        description_textbox.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        if initial_values:
-            title_entry.insert(0, initial_values.get("title", ""))
-            company_entry.insert(0, initial_values.get("company", ""))
-            dates_entry.insert(0, initial_values.get("dates", ""))
-            if initial_values.get("description"):
-                # Join list of points with newline for textbox
-                description_textbox.insert("0.0", "\n".join(initial_values["description"]))
-
-        remove_button = ctk.CTkButton(entry_frame, text="Remove", command=lambda: self._remove_experience_entry_gui(entry_frame))
-        remove_button.grid(row=row_num, column=0, columnspan=2, pady=5, sticky="e")
-
-        self.experience_frames.append({
-            "frame": entry_frame,
-            "title": title_entry,
-            "company": company_entry,
-            "dates": dates_entry,
-            "description": description_textbox
-        })
-
-
-    def _remove_experience_entry_gui(self, entry_frame_to_remove):
-        entry_frame_to_remove.destroy()
-        self.experience_frames = [
-            item for item in self.experience_frames if item["frame"] != entry_frame_to_remove
-        ]
+        self.experience_section.add(initial_values)
 
     def _create_projects_section(self):
-        self.projects_frames = []
-        self.projects_section_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
-        self.projects_section_frame.pack(fill="x", padx=10, pady=5)
-        self.projects_section_frame.grid_columnconfigure(0, weight=1)
-        ctk.CTkLabel(self.projects_section_frame, text="Projects", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, sticky="w", pady=(0,5))
-        self.projects_entries_container = ctk.CTkFrame(self.projects_section_frame, fg_color="transparent")
-        self.projects_entries_container.grid(row=1, column=0, sticky="ew")
-        self.projects_entries_container.grid_columnconfigure(0, weight=1)
-        self.add_projects_button = ctk.CTkButton(self.projects_section_frame, text="Add New Project", command=self._add_project_entry_gui)
-        self.add_projects_button.grid(row=2, column=0, sticky="w", pady=5)
+        self.projects_section = self._create_entry_list_section(
+            "projects", "Projects", "Add New Project", self._add_project_entry_gui, PROJECT_FIELDS)
 
     def _add_project_entry_gui(self, initial_values=None):
-        entry_frame = ctk.CTkFrame(self.projects_entries_container, border_width=1, corner_radius=8)
-        entry_frame.pack(fill="x", padx=5, pady=5)
-        entry_frame.grid_columnconfigure(1, weight=1)
-        
-        # Project Name, Link, Dates, Description (similar to experience)
-        row_num = 0
-        ctk.CTkLabel(entry_frame, text="Name:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        name_entry = ctk.CTkEntry(entry_frame)
-        name_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Link:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        link_entry = ctk.CTkEntry(entry_frame)
-        link_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Dates:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        dates_entry = ctk.CTkEntry(entry_frame)
-        dates_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Description:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        description_textbox = ctk.CTkTextbox(entry_frame, height=70, wrap="word")
-        description_textbox.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        if initial_values:
-            name_entry.insert(0, initial_values.get("name", ""))
-            link_entry.insert(0, initial_values.get("link", ""))
-            dates_entry.insert(0, initial_values.get("dates", ""))
-            if initial_values.get("description"):
-                description_textbox.insert("0.0", "\n".join(initial_values["description"]))
-
-        remove_button = ctk.CTkButton(entry_frame, text="Remove", command=lambda: self._remove_project_entry_gui(entry_frame))
-        remove_button.grid(row=row_num, column=0, columnspan=2, pady=5, sticky="e")
-
-        self.projects_frames.append({
-            "frame": entry_frame,
-            "name": name_entry,
-            "link": link_entry,
-            "dates": dates_entry,
-            "description": description_textbox
-        })
-    def _remove_project_entry_gui(self, entry_frame_to_remove):
-        entry_frame_to_remove.destroy()
-        self.projects_frames = [
-            item for item in self.projects_frames if item["frame"] != entry_frame_to_remove
-        ]
+        self.projects_section.add(initial_values)
 
     def _create_awards_section(self):
-        self.awards_frames = []
-        self.awards_section_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
-        self.awards_section_frame.pack(fill="x", padx=10, pady=5)
-        self.awards_section_frame.grid_columnconfigure(0, weight=1)
-        ctk.CTkLabel(self.awards_section_frame, text="Awards & Honors", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, sticky="w", pady=(0,5))
-        self.awards_entries_container = ctk.CTkFrame(self.awards_section_frame, fg_color="transparent")
-        self.awards_entries_container.grid(row=1, column=0, sticky="ew")
-        self.awards_entries_container.grid_columnconfigure(0, weight=1)
-        self.add_awards_button = ctk.CTkButton(self.awards_section_frame, text="Add New Award", command=self._add_award_entry_gui)
-        self.add_awards_button.grid(row=2, column=0, sticky="w", pady=5)
+        self.awards_section = self._create_entry_list_section(
+            "awards", "Awards & Honors", "Add New Award", self._add_award_entry_gui, AWARD_FIELDS)
 
     def _add_award_entry_gui(self, initial_values=None):
-        entry_frame = ctk.CTkFrame(self.awards_entries_container, border_width=1, corner_radius=8)
-        entry_frame.pack(fill="x", padx=5, pady=5)
-        entry_frame.grid_columnconfigure(1, weight=1)
-        
-        # Award Name, Body, Date (similar to education)
-        row_num = 0
-        ctk.CTkLabel(entry_frame, text="Award Name:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        name_entry = ctk.CTkEntry(entry_frame)
-        name_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Awarding Body:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        body_entry = ctk.CTkEntry(entry_frame)
-        body_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Date Received:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        date_entry = ctk.CTkEntry(entry_frame)
-        date_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        if initial_values:
-            name_entry.insert(0, initial_values.get("name", ""))
-            body_entry.insert(0, initial_values.get("body", ""))
-            date_entry.insert(0, initial_values.get("date", ""))
-
-        remove_button = ctk.CTkButton(entry_frame, text="Remove", command=lambda: self._remove_award_entry_gui(entry_frame))
-        remove_button.grid(row=row_num, column=0, columnspan=2, pady=5, sticky="e")
-
-        self.awards_frames.append({
-            "frame": entry_frame,
-            "name": name_entry,
-            "body": body_entry,
-            "date": date_entry
-        })
-    def _remove_award_entry_gui(self, entry_frame_to_remove):
-        entry_frame_to_remove.destroy()
-        self.awards_frames = [
-            item for item in self.awards_frames if item["frame"] != entry_frame_to_remove
-        ]
+        self.awards_section.add(initial_values)
 
     def _create_volunteer_section(self):
-        self.volunteer_frames = []
-        self.volunteer_section_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
-        self.volunteer_section_frame.pack(fill="x", padx=10, pady=5)
-        self.volunteer_section_frame.grid_columnconfigure(0, weight=1)
-        ctk.CTkLabel(self.volunteer_section_frame, text="Volunteer Work", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, sticky="w", pady=(0,5))
-        self.volunteer_entries_container = ctk.CTkFrame(self.volunteer_section_frame, fg_color="transparent")
-        self.volunteer_entries_container.grid(row=1, column=0, sticky="ew")
-        self.volunteer_entries_container.grid_columnconfigure(0, weight=1)
-        self.add_volunteer_button = ctk.CTkButton(self.volunteer_section_frame, text="Add New Volunteer Work", command=self._add_volunteer_entry_gui)
-        self.add_volunteer_button.grid(row=2, column=0, sticky="w", pady=5)
+        self.volunteer_section = self._create_entry_list_section(
+            "volunteer", "Volunteer Work", "Add New Volunteer Work", self._add_volunteer_entry_gui, VOLUNTEER_FIELDS)
 
     def _add_volunteer_entry_gui(self, initial_values=None):
-        entry_frame = ctk.CTkFrame(self.volunteer_entries_container, border_width=1, corner_radius=8)
-        entry_frame.pack(fill="x", padx=5, pady=5)
-        entry_frame.grid_columnconfigure(1, weight=1)
-        
-        # Role, Organization, Dates, Description (similar to experience)
-        row_num = 0
-        ctk.CTkLabel(entry_frame, text="Role:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        role_entry = ctk.CTkEntry(entry_frame)
-        role_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Organization:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        org_entry = ctk.CTkEntry(entry_frame)
-        org_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Dates:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        dates_entry = ctk.CTkEntry(entry_frame)
-        dates_entry.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        ctk.CTkLabel(entry_frame, text="Description:").grid(row=row_num, column=0, sticky="w", padx=5, pady=2)
-        description_textbox = ctk.CTkTextbox(entry_frame, height=70, wrap="word")
-        description_textbox.grid(row=row_num, column=1, sticky="ew", padx=5, pady=2)
-        row_num += 1
-
-        if initial_values:
-            role_entry.insert(0, initial_values.get("role", ""))
-            org_entry.insert(0, initial_values.get("organization", ""))
-            dates_entry.insert(0, initial_values.get("dates", ""))
-            if initial_values.get("description"):
-                description_textbox.insert("0.0", "\n".join(initial_values["description"]))
-
-        remove_button = ctk.CTkButton(entry_frame, text="Remove", command=lambda: self._remove_volunteer_entry_gui(entry_frame))
-        remove_button.grid(row=row_num, column=0, columnspan=2, pady=5, sticky="e")
-
-        self.volunteer_frames.append({
-            "frame": entry_frame,
-            "role": role_entry,
-            "organization": org_entry,
-            "dates": dates_entry,
-            "description": description_textbox
-        })
-    def _remove_volunteer_entry_gui(self, entry_frame_to_remove):
-        entry_frame_to_remove.destroy()
-        self.volunteer_frames = [
-            item for item in self.volunteer_frames if item["frame"] != entry_frame_to_remove
-        ]
+        self.volunteer_section.add(initial_values)
 
     def _create_skills_section(self):
         skills_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="transparent")
@@ -411,142 +536,103 @@ class ResumeBuilderApp(ctk.CTk):
     # --- Methods to get data from GUI and set data to GUI ---
 
     def _get_data_from_gui(self):
-        """Collects all data from the GUI widgets into a dictionary."""
-        data = {}
-
-        # Personal Info
-        data["name"] = self.name_entry.get()
-        data["email"] = self.email_entry.get()
-        data["phone"] = self.phone_entry.get()
-        data["linkedin"] = self.linkedin_entry.get()
-
-        # Summary
-        data["summary"] = self.summary_textbox.get("0.0", "end").strip() # Get all text from textbox
-
-        # Education
-        education_entries = []
-        for edu_item in self.education_frames:
-            education_entries.append({
-                "degree": edu_item["degree"].get(),
-                "university": edu_item["university"].get(),
-                "year": edu_item["year"].get()
-            })
-        data["education"] = education_entries
-
-        # Experience
-        experience_entries = []
-        for exp_item in self.experience_frames:
-            description_text = exp_item["description"].get("0.0", "end").strip()
-            description_points = [p.strip() for p in description_text.split('\n') if p.strip()]
-            experience_entries.append({
-                "title": exp_item["title"].get(),
-                "company": exp_item["company"].get(),
-                "dates": exp_item["dates"].get(),
-                "description": description_points
-            })
-        data["experience"] = experience_entries
-
-        # Projects
-        projects_entries = []
-        for proj_item in self.projects_frames:
-            description_text = proj_item["description"].get("0.0", "end").strip()
-            description_points = [p.strip() for p in description_text.split('\n') if p.strip()]
-            projects_entries.append({
-                "name": proj_item["name"].get(),
-                "link": proj_item["link"].get(),
-                "dates": proj_item["dates"].get(),
-                "description": description_points
-            })
-        data["projects"] = projects_entries
-
-        # Awards
-        awards_entries = []
-        for award_item in self.awards_frames:
-            awards_entries.append({
-                "name": award_item["name"].get(),
-                "body": award_item["body"].get(),
-                "date": award_item["date"].get()
-            })
-        data["awards"] = awards_entries
-
-        # Volunteer Work
-        volunteer_entries = []
-        for vol_item in self.volunteer_frames:
-            description_text = vol_item["description"].get("0.0", "end").strip()
-            description_points = [p.strip() for p in description_text.split('\n') if p.strip()]
-            volunteer_entries.append({
-                "role": vol_item["role"].get(),
-                "organization": vol_item["organization"].get(),
-                "dates": vol_item["dates"].get(),
-                "description": description_points
-            })
-        data["volunteer_work"] = volunteer_entries
-
-        # Skills
-        skills_text = self.skills_entry.get().strip()
-        data["skills"] = [s.strip() for s in skills_text.split(',') if s.strip()]
+        """Collects all data from the GUI into a dictionary (only edited sections are re-read)."""
+        return self.form_model.get_data()
 
-        return data
+    def _read_personal_info(self):
+        return {
+            "name": self.name_entry.get(),
+            "email": self.email_entry.get(),
+            "phone": self.phone_entry.get(),
+            "linkedin": self.linkedin_entry.get(),
+        }
+
+    def _read_summary(self):
+        return {"summary": self.summary_textbox.get("0.0", "end").strip()} # Get all text from textbox
+
+    def _read_skills(self):
+        skills_text = self.skills_entry.get().strip()
+        return {"skills": [s.strip() for s in skills_text.split(',') if s.strip()]}
 
     def _set_data_to_gui(self, data):
         """Populates GUI widgets with data from a dictionary (e.g., loaded data)."""
-        # Clear existing multi-entry sections before populating
-        self._clear_all_multi_entries()
+        # Only widgets whose value actually changed are rewritten
+        self._set_entry_text(self.name_entry, data.get("name", ""))
+        self._set_entry_text(self.email_entry, data.get("email", ""))
+        self._set_entry_text(self.phone_entry, data.get("phone", ""))
+        self._set_entry_text(self.linkedin_entry, data.get("linkedin", ""))
+
+        summary = data.get("summary", "")
+        if self.summary_textbox.get("0.0", "end").strip() != summary.strip():
+            self.summary_textbox.delete("0.0", "end")
+            self.summary_textbox.insert("0.0", summary)
+
+        # Reconcile multi-entry sections: matching entries are updated in place, only added/removed ones cost widgets
+        self.education_section.set_values(data.get("education", []))
+        self.experience_section.set_values(data.get("experience", []))
+        self.projects_section.set_values(data.get("projects", []))
+        self.awards_section.set_values(data.get("awards", []))
+        self.volunteer_section.set_values(data.get("volunteer_work", []))
+
+        self._set_entry_text(self.skills_entry, ", ".join(data.get("skills", [])))
+
+        # The form now matches what was loaded: re-read it on next use, but there is nothing to autosave
+        self.form_model.mark_all_dirty()
+        self.form_model.mark_saved()
 
-        self.name_entry.delete(0, ctk.END)
-        self.name_entry.insert(0, data.get("name", ""))
+        self.resume_data = data # Update internal data storage
+        messagebox.showinfo("Load Success", "Resume data loaded into the form.")
 
-        self.email_entry.delete(0, ctk.END)
-        self.email_entry.insert(0, data.get("email", ""))
+    @staticmethod
+    def _set_entry_text(entry_widget, text):
+        if entry_widget.get() != text:
+            entry_widget.delete(0, ctk.END)
+            entry_widget.insert(0, text)
 
-        self.phone_entry.delete(0, ctk.END)
-        self.phone_entry.insert(0, data.get("phone", ""))
+    # --- Autosave ---
 
-        self.linkedin_entry.delete(0, ctk.END)
-        self.linkedin_entry.insert(0, data.get("linkedin", ""))
+    def _schedule_autosave(self, section=None):
+        # Debounce: every edit pushes the autosave back by AUTOSAVE_DELAY_MS
+        if self._autosave_after_id is not None:
+            self.after_cancel(self._autosave_after_id)
+        self._autosave_after_id = self.after(AUTOSAVE_DELAY_MS, self._autosave)
 
-        self.summary_textbox.delete("0.0", "end")
-        self.summary_textbox.insert("0.0", data.get("summary", ""))
+    def _autosave(self):
+        self._autosave_after_id = None
+        # Only autosave a resume that already has a file, and only if something changed since it was saved
+        if not self.current_json_filename or not self.form_model.has_unsaved_changes():
+            return
+        if self._autosave_thread is not None and self._autosave_thread.is_alive():
+            self._schedule_autosave() # Previous autosave still writing; try again later
+            return
+        data = self.form_model.get_data() # Read widgets here, on the Tk thread
+        version = self.form_model.version
+        store = self._store_for(self.current_json_filename)
 
-        # Populate multi-entry sections by adding entries
-        for edu in data.get("education", []):
-            self._add_education_entry_gui(edu)
-        for exp in data.get("experience", []):
-            self._add_experience_entry_gui(exp)
-        for proj in data.get("projects", []):
-            self._add_project_entry_gui(proj)
-        for award in data.get("awards", []):
-            self._add_award_entry_gui(award)
-        for vol in data.get("volunteer_work", []):
-            self._add_volunteer_entry_gui(vol)
+        def write():
+            # Only the edits since the last autosave are appended, not the whole resume. The store drops
+            # the write if a full save of newer data got there first.
+            try:
+                store.save(data, version)
+            except (OSError, ValueError) as e:
+                print(f"Autosave to '{store.filename}' failed: {e}")
+                return
+            self.form_model.mark_saved(version)
 
-        self.skills_entry.delete(0, ctk.END)
-        self.skills_entry.insert(0, ", ".join(data.get("skills", [])))
+        self._autosave_thread = threading.Thread(target=write, daemon=True)
+        self._autosave_thread.start()
 
-        self.resume_data = data # Update internal data storage
-        messagebox.showinfo("Load Success", "Resume data loaded into the form.")
+    def _store_for(self, filename):
+        # The journaled store of `filename`, shared by autosaves and full saves so they are serialized
+        if self._journal_store is None or self._journal_store.filename != filename:
+            self._journal_store = JournaledResumeStore(filename)
+        return self._journal_store
 
     def _clear_all_multi_entries(self):
-        # Helper to remove all dynamically added frames (Education, Experience, etc.)
-        for item in list(self.education_frames): # Use list() to avoid issues when modifying list during iteration
-            item["frame"].destroy()
-        self.education_frames = []
-
-        for item in list(self.experience_frames):
-            item["frame"].destroy()
-        self.experience_frames = []
-        
-        for item in list(self.projects_frames):
-            item["frame"].destroy()
-        self.projects_frames = []
-
-        for item in list(self.awards_frames):
-            item["frame"].destroy()
-        self.awards_frames = []
-
-        for item in list(self.volunteer_frames):
-            item["frame"].destroy()
-        self.volunteer_frames = []
+        # Helper to empty all multi-entry sections (Education, Experience, etc.)
+        for section in (self.education_section, self.experience_section, self.projects_section,
+                        self.awards_section, self.volunteer_section):
+            section.set_values([])
 
 
     # --- Button Command Methods ---
@@ -561,9 +647,75 @@ class ResumeBuilderApp(ctk.CTk):
             if loaded_data:
                 self._set_data_to_gui(loaded_data)
                 self.current_json_filename = file_path # Remember the loaded file
+                self._journal_store = None
             else:
                 messagebox.showerror("Load Error", "Failed to load resume data.")
 
+    def load_from_library_gui(self):
+        # Loads a resume by id from the SQLite library (see resume_store.py)
+        if not os.path.exists(DEFAULT_DB_PATH):
+            messagebox.showerror("Library Error", f"No resume library found at '{DEFAULT_DB_PATH}'.")
+            return
+        dialog = ctk.CTkInputDialog(text="Resume id:", title="Open from Library")
+        answer = dialog.get_input()
+        if not answer:
+            return
+        try:
+            resume_id = int(answer.strip())
+        except ValueError:
+            messagebox.showerror("Library Error", f"'{answer}' is not a resume id.")
+            return
+        with ResumeStore(DEFAULT_DB_PATH) as store:
+            loaded_data = store.get(resume_id)
+        if loaded_data is None:
+            messagebox.showerror("Library Error", f"No resume with id {resume_id} in the library.")
+            return
+        self._set_data_to_gui(loaded_data)
+        self.current_json_filename = None # Not backed by a file until saved
+        self._journal_store = None
+
+    def _current_history(self):
+        if self._history is None or self._history.path != self.current_json_filename + ".history":
+            self._history = ResumeHistory.for_resume(self.current_json_filename)
+        return self._history
+
+    def save_version_gui(self):
+        # Records the form as a new version in the current file's history (see resume_history.py)
+        if not self.current_json_filename:
+            messagebox.showwarning("Save Version", "Save the resume to a file first; versions are kept next to it.")
+            return
+        dialog = ctk.CTkInputDialog(text="Label for this version (e.g. the company you tailored it for):",
+                                    title="Save Version")
+        label = dialog.get_input()
+        if label is None: # Dialog cancelled
+            return
+        version = self._current_history().commit(self._get_data_from_gui(), label=label.strip())
+        messagebox.showinfo("Version Saved", f"Saved as version {version}.")
+
+    def open_version_gui(self):
+        # Replaces the form with a version from the current file's history; autosave then writes it to the file
+        if not self.current_json_filename:
+            messagebox.showwarning("Open Version", "Load or save a resume file first.")
+            return
+        history = self._current_history()
+        if not len(history):
+            messagebox.showinfo("Open Version", "No versions saved for this resume yet.")
+            return
+        recent = history.versions()[-15:]
+        listing = "\n".join(f"{info['version']}: {info['label'] or '(no label)'}" for info in recent)
+        dialog = ctk.CTkInputDialog(text=f"{listing}\n\nVersion to open:", title="Open Version")
+        answer = dialog.get_input()
+        if not answer:
+            return
+        try:
+            data = history.checkout(int(answer.strip()))
+        except (ValueError, KeyError):
+            messagebox.showerror("Open Version", f"'{answer}' is not a saved version.")
+            return
+        self._set_data_to_gui(data)
+        self.form_model.mark_all_dirty() # Differs from the file on disk until autosaved
+        self._schedule_autosave()
+
     def save_resume_gui(self):
         current_data = self._get_data_from_gui()
         if not current_data.get("name"): # Simple validation
@@ -577,7 +729,15 @@ class ResumeBuilderApp(ctk.CTk):
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
         )
         if file_path:
-            save_resume_data(current_data, file_path)
+            version = self.form_model.version
+            # A full snapshot plus a fresh journal, written through the same store as autosaves: an autosave
+            # still writing finishes first, and one of older data is dropped instead of overwriting this
+            try:
+                self._store_for(file_path).compact(current_data, version)
+            except OSError as e:
+                messagebox.showerror("Save Error", f"Could not save to {os.path.basename(file_path)}: {e}")
+                return
+            self.form_model.mark_saved(version)
             self.current_json_filename = file_path # Update the current filename
             messagebox.showinfo("Save Success", f"Resume data saved to {os.path.basename(file_path)}")
         else:
@@ -589,22 +749,119 @@ class ResumeBuilderApp(ctk.CTk):
             messagebox.showwarning("PDF Generation Warning", "Please enter at least your name before generating PDF.")
             return
 
+        if self._pdf_job is not None:
+            # A PDF is already being generated: queue one re-run with the latest form data behind it.
+            # Further clicks just replace the queued data, so they all coalesce into that one re-run.
+            self._pending_pdf_request = (current_data, self._pdf_job["file_path"])
+            self.pdf_status_label.configure(text="Generating PDF... (another run queued)")
+            return
+
         file_path = filedialog.asksaveasfilename(
             initialfile=f"{current_data.get('name', 'resume').replace(' ', '_')}_Resume.pdf",
             defaultextension=".pdf",
             filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")]
         )
         if file_path:
-            # Create a new FPDF instance for each PDF generation
-            pdf_instance = FPDF(unit="mm", format="A4")
-            try:
-                generate_resume_pdf(current_data, pdf_instance) # Pass the FPDF instance
-                pdf_instance.output(file_path)
-                messagebox.showinfo("PDF Success", f"Resume PDF generated successfully to {os.path.basename(file_path)}")
-            except Exception as e:
-                messagebox.showerror("PDF Error", f"Failed to generate PDF: {e}")
+            self._start_pdf_job(current_data, file_path)
+        else:
+            messagebox.showinfo("PDF Cancelled", "PDF generation cancelled.")
+
+    def cancel_pdf_gui(self):
+        # The render itself can't be interrupted, but a cancelled job never writes its file
+        if self._pdf_job is not None:
+            self._pdf_job["cancel"].set()
+            self._pending_pdf_request = None
+            self.pdf_status_label.configure(text="Cancelling...")
+
+    def _show_pdf_progress(self, visible):
+        for widget in (self.pdf_status_label, self.pdf_progress_bar, self.cancel_pdf_button):
+            if visible:
+                widget.grid()
+            else:
+                widget.grid_remove()
+        if visible:
+            self.pdf_progress_bar.start()
         else:
+            self.pdf_progress_bar.stop()
+
+    def _start_pdf_job(self, data, file_path):
+        # Runs generate_resume_pdf on a worker thread. The worker only posts messages to a queue;
+        # _poll_pdf_job reads them on the Tk main thread via after(), which is the only place widgets are touched.
+        job = {
+            "file_path": file_path,
+            "cancel": threading.Event(),
+            "messages": queue.Queue(),
+            "section_memo": self._section_memo,
+        }
+        job["thread"] = threading.Thread(target=self._pdf_worker, args=(data, job), daemon=True)
+        self._pdf_job = job
+        self.pdf_status_label.configure(text="Generating PDF...")
+        self._show_pdf_progress(True)
+        job["thread"].start()
+        self.after(50, self._poll_pdf_job)
+
+    @staticmethod
+    def _pdf_worker(data, job):
+        messages, cancel = job["messages"], job["cancel"]
+        try:
+            messages.put(("progress", "Laying out resume..."))
+            # Create a new PDF instance for each PDF generation
+            pdf_instance = ResumePDF(unit="mm", format="A4")
+            generate_resume_pdf(data, pdf_instance, section_memo=job["section_memo"]) # Pass the PDF instance
+            if cancel.is_set():
+                messages.put(("cancelled", None))
+                return
+            messages.put(("progress", "Writing PDF..."))
+            # Stream into a temporary file first so a failed or cancelled job never leaves a half-written PDF
+            try:
+                with atomic_output(job["file_path"]) as f:
+                    pdf_instance.output_to(f)
+                    if cancel.is_set():
+                        raise _PdfJobCancelled()  # atomic_output removes the temp file
+            except _PdfJobCancelled:
+                messages.put(("cancelled", None))
+                return
+            messages.put(("done", None))
+        except Exception as e:
+            messages.put(("error", e))
+
+    def _poll_pdf_job(self):
+        job = self._pdf_job
+        if job is None:
+            return
+        finished = None
+        try:
+            while True:
+                kind, payload = job["messages"].get_nowait()
+                if kind == "progress":
+                    if not job["cancel"].is_set():
+                        queued = " (another run queued)" if self._pending_pdf_request else ""
+                        self.pdf_status_label.configure(text=payload + queued)
+                else:
+                    finished = (kind, payload)
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(50, self._poll_pdf_job)
+            return
+
+        self._pdf_job = None
+        kind, payload = finished
+        pending, self._pending_pdf_request = self._pending_pdf_request, None
+        if pending is not None and kind == "done":
+            # Run the queued re-generation straight away; only report once the last one finishes
+            self._start_pdf_job(*pending)
+            return
+
+        self._show_pdf_progress(False)
+        file_name = os.path.basename(job["file_path"])
+        if kind == "done":
+            messagebox.showinfo("PDF Success", f"Resume PDF generated successfully to {file_name}")
+        elif kind == "cancelled":
             messagebox.showinfo("PDF Cancelled", "PDF generation cancelled.")
+        else:
+            messagebox.showerror("PDF Error", f"Failed to generate PDF: {payload}")
 
 
 if __name__ == "__main__":
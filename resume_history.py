@@ -0,0 +1,224 @@
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+from resume_journal import apply_changes, diff_resume, serialize_snapshot, write_atomic
+
+HISTORY_SUFFIX = ".history"
+
+# A version is stored as a full snapshot once its delta chain would get this long,
+# or once its delta is this large a fraction of a full snapshot
+REBASE_EVERY = 16
+REBASE_RATIO = 0.5
+
+
+def history_path(filename):
+    return filename + HISTORY_SUFFIX
+
+
+def format_changes(changes):
+    # One readable line per change record, e.g. "~ experience[2].dates" or "+ projects[3..4]"
+    lines = []
+    for change in changes:
+        op, path = change["op"], change["path"]
+        where = path[0] + "".join(f"[{step}]" if isinstance(step, int) else f".{step}" for step in path[1:])
+        if op == "set":
+            lines.append(f"~ {where}")
+        elif op == "del":
+            lines.append(f"- {where}")
+        else:
+            start, deleted, inserted = change["start"], change["delete"], len(change["insert"])
+            if deleted:
+                lines.append(f"- {where}[{start}..{start + deleted - 1}]")
+            if inserted:
+                lines.append(f"+ {where}[{start}..{start + inserted - 1}]")
+    return lines
+
+
+class ResumeHistory:
+    """Version history of one resume, stored as deltas in <filename>.history.
+
+    Each commit is one JSON line: either a full snapshot of the resume data or
+    the changes (see resume_journal.diff_resume) from its parent version.
+    Versions form a tree, so tailored variants can branch off any earlier
+    version. A version is stored as a snapshot again every REBASE_EVERY deltas
+    along its chain, so checking out any version replays at most that many
+    deltas.
+    """
+
+    def __init__(self, path, rebase_every=REBASE_EVERY, rebase_ratio=REBASE_RATIO):
+        self.path = path
+        self.rebase_every = rebase_every
+        self.rebase_ratio = rebase_ratio
+        self._records = {}  # version -> record dict as stored
+        self._depth = {}  # version -> number of deltas since its snapshot
+        self._cache = {}  # version -> checked-out data (most recent checkouts only)
+        self.head = None  # last committed version
+        self._load()
+
+    @classmethod
+    def for_resume(cls, filename, **options):
+        return cls(history_path(filename), **options)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            contents = f.read()
+        intact = bytearray()
+        for raw_line in contents.splitlines(keepends=True):
+            try:
+                record = json.loads(raw_line)
+            except ValueError:
+                break  # torn last line from an interrupted commit
+            self._remember(record)
+            intact += raw_line if raw_line.endswith(b"\n") else raw_line + b"\n"
+        if intact != contents:
+            # Commits appended after a torn line would be lost on the next load: cut the file back to
+            # the last intact version first, as the journal does by compacting
+            write_atomic(self.path, bytes(intact))
+
+    def _remember(self, record):
+        version = record["version"]
+        self._records[version] = record
+        self._depth[version] = 0 if "snapshot" in record else self._depth[record["parent"]] + 1
+        self.head = version
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, version):
+        return version in self._records
+
+    def versions(self):
+        # [{"version", "parent", "label", "time", "snapshot"}] in commit order
+        return [{
+            "version": record["version"],
+            "parent": record.get("parent"),
+            "label": record.get("label", ""),
+            "time": record["time"],
+            "snapshot": "snapshot" in record,
+        } for record in self._records.values()]
+
+    def commit(self, data, label="", parent=None):
+        # Stores data as a new version branching off `parent` (default: head) and returns its number
+        if parent is None:
+            parent = self.head
+        elif parent not in self._records:
+            raise KeyError(f"no version {parent}")
+        version = max(self._records, default=0) + 1
+        record = {"version": version, "parent": parent, "label": label, "time": round(time.time(), 3)}
+        if parent is None or self._depth[parent] + 1 >= self.rebase_every:
+            record["snapshot"] = data
+        else:
+            changes = diff_resume(self.checkout(parent), data)
+            if len(json.dumps(changes, ensure_ascii=False)) > len(serialize_snapshot(data)) * self.rebase_ratio:
+                record["snapshot"] = data
+            else:
+                record["changes"] = changes
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._remember(json.loads(line))
+        self._cache[version] = copy.deepcopy(data)
+        self._trim_cache()
+        return version
+
+    def checkout(self, version):
+        # Returns the resume data of `version` (a fresh copy the caller may modify)
+        if version not in self._records:
+            raise KeyError(f"no version {version}")
+        # Walk back to the nearest snapshot (or cached version), then replay the deltas forward
+        chain = []
+        current = version
+        while current not in self._cache and "snapshot" not in self._records[current]:
+            chain.append(self._records[current])
+            current = self._records[current]["parent"]
+        if current in self._cache:
+            data = copy.deepcopy(self._cache[current])
+        else:
+            data = copy.deepcopy(self._records[current]["snapshot"])
+        for record in reversed(chain):
+            apply_changes(data, copy.deepcopy(record["changes"]))
+        self._cache.pop(version, None)  # re-insert so it counts as most recently used
+        self._cache[version] = copy.deepcopy(data)
+        self._trim_cache()
+        return data
+
+    def _trim_cache(self, keep=8):
+        while len(self._cache) > keep:
+            del self._cache[next(iter(self._cache))]
+
+    def diff(self, old_version, new_version):
+        # Changes that turn old_version into new_version
+        return diff_resume(self.checkout(old_version), self.checkout(new_version))
+
+    def storage_stats(self):
+        # Bytes used by the history file vs. keeping every version as a full JSON copy
+        full_copies = sum(len(serialize_snapshot(self.checkout(v))) for v in self._records)
+        stored = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"versions": len(self._records), "history_bytes": stored, "full_copy_bytes": full_copies}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep versions of a resume JSON file as compact deltas.")
+    parser.add_argument("resume", help="resume JSON file whose history to use (<resume>.history)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commit_parser = commands.add_parser("commit", help="record the resume (or another JSON file) as a new version")
+    commit_parser.add_argument("--from", dest="source", help="commit this JSON file instead, e.g. a tailored variant")
+    commit_parser.add_argument("-m", "--label", default="")
+    commit_parser.add_argument("--parent", type=int, help="version to branch off (default: the latest)")
+
+    commands.add_parser("log", help="list versions")
+
+    diff_parser = commands.add_parser("diff", help="show what changed between two versions")
+    diff_parser.add_argument("old", type=int)
+    diff_parser.add_argument("new", type=int)
+
+    checkout_parser = commands.add_parser("checkout", help="write a version out as JSON")
+    checkout_parser.add_argument("version", type=int)
+    checkout_parser.add_argument("-o", "--output", help="file to write (default: overwrite the resume)")
+
+    commands.add_parser("stats", help="compare history size with full copies")
+
+    args = parser.parse_args(argv)
+    history = ResumeHistory.for_resume(args.resume)
+
+    if args.command == "commit":
+        from resume_generator import load_resume_data
+        data = load_resume_data(args.source or args.resume)
+        if data is None:
+            return 1
+        version = history.commit(data, label=args.label, parent=args.parent)
+        print(f"Committed version {version}")
+    elif args.command == "log":
+        for info in history.versions():
+            stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(info["time"]))
+            parent = "-" if info["parent"] is None else info["parent"]
+            print(f"{info['version']}\tparent {parent}\t{stamp}\t{info['label']}")
+    elif args.command == "stats":
+        stats = history.storage_stats()
+        print(f"{stats['versions']} versions in {stats['history_bytes']} bytes "
+              f"(full copies would take {stats['full_copy_bytes']} bytes)")
+    else:
+        try:
+            if args.command == "diff":
+                for line in format_changes(history.diff(args.old, args.new)):
+                    print(line)
+            else:
+                from resume_generator import save_resume_data
+                save_resume_data(history.checkout(args.version), args.output or args.resume)
+        except KeyError as e:
+            print(f"Unknown version: {e}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
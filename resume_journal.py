@@ -0,0 +1,290 @@
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+JOURNAL_SUFFIX = ".journal"
+
+# Compact once the journal holds this many records, or grows past this fraction of the snapshot size
+COMPACT_AFTER_RECORDS = 200
+COMPACT_AFTER_RATIO = 0.5
+
+
+def journal_path(filename):
+    return filename + JOURNAL_SUFFIX
+
+
+# --- Change records ---
+#
+# A change is a small dict describing one edit to a resume data dict:
+#   {"op": "set", "path": ["summary"], "value": "..."}                  top-level key
+#   {"op": "set", "path": ["experience", 3], "value": {...}}            one list entry
+#   {"op": "set", "path": ["experience", 3, "dates"], "value": "..."}   one field of a list entry
+#   {"op": "del", "path": ["hobbies"]}                                  removed top-level key
+#   {"op": "splice", "path": ["experience"], "start": 2, "delete": 1, "insert": [...]}
+#                                                                        entries added/removed
+
+def diff_resume(old, new):
+    # Returns the list of changes that turns `old` into `new`, touching as little data as possible
+    changes = []
+    for key, new_value in new.items():
+        if key not in old:
+            changes.append({"op": "set", "path": [key], "value": new_value})
+            continue
+        old_value = old[key]
+        if old_value == new_value:
+            continue
+        if isinstance(old_value, list) and isinstance(new_value, list):
+            changes.extend(_diff_list(key, old_value, new_value))
+        else:
+            changes.append({"op": "set", "path": [key], "value": new_value})
+    for key in old:
+        if key not in new:
+            changes.append({"op": "del", "path": [key]})
+    return changes
+
+
+def _diff_list(key, old, new):
+    if len(old) == len(new):
+        changes = []
+        for i, item in enumerate(new):
+            if item == old[i]:
+                continue
+            if isinstance(item, dict) and isinstance(old[i], dict) and item.keys() == old[i].keys():
+                # Same entry shape: record only the fields that changed
+                changes.extend({"op": "set", "path": [key, i, field], "value": value}
+                               for field, value in item.items() if value != old[i][field])
+            else:
+                changes.append({"op": "set", "path": [key, i], "value": item})
+        return changes
+    # Different lengths: one splice over the span between the common prefix and the common suffix
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return [{
+        "op": "splice",
+        "path": [key],
+        "start": prefix,
+        "delete": len(old) - prefix - suffix,
+        "insert": new[prefix:len(new) - suffix],
+    }]
+
+
+def apply_changes(data, changes):
+    # Applies change records to `data` in place and returns it
+    for change in changes:
+        op, path = change["op"], change["path"]
+        if op == "set":
+            target = data
+            for step in path[:-1]:
+                target = target[step]
+            target[path[-1]] = change["value"]
+        elif op == "del":
+            data.pop(path[0], None)
+        elif op == "splice":
+            start = change["start"]
+            data[path[0]][start:start + change["delete"]] = change["insert"]
+        else:
+            raise ValueError(f"unknown change op: {op!r}")
+    return data
+
+
+# --- Files ---
+
+def _snapshot_hash(snapshot_bytes):
+    return hashlib.sha256(snapshot_bytes).hexdigest()
+
+
+def _file_mode(filename):
+    try:
+        return os.stat(filename).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_output(filename):
+    # Yields a binary file to write `filename` through: it is a temp file next to `filename`, fsynced
+    # and renamed into place once the block finishes, and removed instead if the block raises, so
+    # readers see either the old file or the complete new one, never a partial write
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _file_mode(filename)) # mkstemp creates 0600; keep what a plain open() would give
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_atomic(filename, payload):
+    with atomic_output(filename) as f:
+        f.write(payload)
+
+
+def serialize_snapshot(data):
+    return json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+
+
+def read_journal(filename, snapshot_bytes):
+    # Returns (changes, saves, torn) for `filename`'s journal: the change records that apply to this snapshot,
+    # how many saves they came from, and whether a torn line (crash during an append) was dropped.
+    # A journal written against another snapshot (e.g. compaction finished but the old journal survived) is ignored.
+    path = journal_path(filename)
+    if not os.path.exists(path):
+        return [], 0, False
+    with open(path, "rb") as f:
+        lines = f.read().split(b"\n")
+    try:
+        header = json.loads(lines[0])
+    except ValueError:
+        return [], 0, False
+    if not isinstance(header, dict) or header.get("base") != _snapshot_hash(snapshot_bytes):
+        return [], 0, False
+    changes = []
+    saves = 0
+    for line in lines[1:]:
+        if not line.strip():
+            continue
+        try:
+            changes.extend(json.loads(line)["changes"])
+        except (ValueError, KeyError, TypeError):
+            return changes, saves, True # everything after a torn line is unreliable
+        saves += 1
+    return changes, saves, False
+
+
+def load_journaled(filename):
+    # Snapshot plus replayed journal; raises like json.load on a bad snapshot
+    with open(filename, "rb") as f:
+        snapshot_bytes = f.read()
+    data = json.loads(snapshot_bytes.decode("utf-8"))
+    changes, _, _ = read_journal(filename, snapshot_bytes)
+    return apply_changes(data, changes)
+
+
+class JournaledResumeStore:
+    """Crash-safe incremental persistence for one resume file.
+
+    save() appends only the difference from the last saved state to
+    <filename>.journal (one fsynced JSON line per save), so an autosave costs
+    the size of the edit. Once the journal gets long, compact() writes the full
+    data to a temp file and atomically renames it over <filename>, then starts a
+    new journal. <filename> stays an ordinary resume JSON file throughout.
+
+    Saves are serialized with a lock, so an autosave thread and a full save
+    from the UI never interleave. Callers that know which edit their data
+    reflects pass it as `version` (e.g. FormModel.version): a save or compact
+    of data older than what was last written is dropped, so a slow autosave
+    can't overwrite a newer full save.
+    """
+
+    def __init__(self, filename, compact_after_records=COMPACT_AFTER_RECORDS, compact_after_ratio=COMPACT_AFTER_RATIO):
+        self.filename = filename
+        self.compact_after_records = compact_after_records
+        self.compact_after_ratio = compact_after_ratio
+        self._data = None
+        self._snapshot_size = 0
+        self._journal_records = 0
+        self._journal_size = 0
+        self.version = None  # version of the data last written, if callers give versions
+        self._lock = threading.Lock()
+
+    def _is_stale(self, version):
+        return version is not None and self.version is not None and version < self.version
+
+    def load(self):
+        with open(self.filename, "rb") as f:
+            snapshot_bytes = f.read()
+        data = json.loads(snapshot_bytes.decode("utf-8"))
+        changes, saves, torn = read_journal(self.filename, snapshot_bytes)
+        apply_changes(data, changes)
+        self._data = copy.deepcopy(data)
+        self._snapshot_size = len(snapshot_bytes)
+        if torn:
+            # Appending after a torn line would be lost on replay: fold what survived into a snapshot
+            self._compact()
+        elif saves:
+            self._journal_records = saves
+            self._journal_size = os.path.getsize(journal_path(self.filename))
+        else:
+            # Missing, stale or empty journal: start a fresh one against this snapshot
+            self._start_journal(snapshot_bytes)
+        return data
+
+    def save(self, data, version=None):
+        # Appends the changes since the last save; returns the number of change records written.
+        # Data of an older version than the last one written is dropped (returns 0).
+        with self._lock:
+            if self._is_stale(version):
+                return 0
+            if version is not None:
+                self.version = version
+            return self._save(data)
+
+    def _save(self, data):
+        if self._data is None:
+            if os.path.exists(self.filename):
+                self.load()
+            else:
+                self._compact(data)
+                return 0
+        changes = diff_resume(self._data, data)
+        if not changes:
+            return 0
+        if not os.path.exists(journal_path(self.filename)):
+            # Someone rewrote the resume and dropped the journal (e.g. a full save): start over from our data
+            self._compact(data)
+            return len(changes)
+        line = (json.dumps({"changes": changes}, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(journal_path(self.filename), "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_records += 1
+        self._journal_size += len(line)
+        self._data = apply_changes(self._data, copy.deepcopy(changes))
+        if (self._journal_records >= self.compact_after_records
+                or self._journal_size > self._snapshot_size * self.compact_after_ratio):
+            self._compact()
+        return len(changes)
+
+    def compact(self, data=None, version=None):
+        # Folds the journal into a new snapshot, or writes `data` as the new snapshot (a full save).
+        # Returns False if data of an older version than the last one written was dropped.
+        with self._lock:
+            if self._is_stale(version):
+                return False
+            if version is not None:
+                self.version = version
+            self._compact(data)
+            return True
+
+    def _compact(self, data=None):
+        if data is not None:
+            self._data = copy.deepcopy(data)
+        snapshot_bytes = serialize_snapshot(self._data)
+        write_atomic(self.filename, snapshot_bytes)
+        self._snapshot_size = len(snapshot_bytes)
+        # If we crash before the next line, the old journal's base no longer matches and it is ignored
+        self._start_journal(snapshot_bytes)
+
+    def _start_journal(self, snapshot_bytes):
+        header = (json.dumps({"base": _snapshot_hash(snapshot_bytes)}) + "\n").encode("utf-8")
+        write_atomic(journal_path(self.filename), header)
+        self._journal_records = 0
+        self._journal_size = len(header)
@@ -0,0 +1,144 @@
+# The shape of a resume dict, as collect_resume_data() and the GUI build it, and a checker compiled from it.
+# Only the standard library is used, so this is cheap to import from the CLI and batch workers.
+
+# The fields generate_resume_pdf reads: top-level keys, and for list sections the keys of each entry
+RESUME_FIELDS = {
+    "name": None,
+    "email": None,
+    "phone": None,
+    "linkedin": None,
+    "summary": None,
+    "education": ("degree", "university", "year"),
+    "experience": ("title", "company", "dates", "description"),
+    "projects": ("name", "link", "dates", "description"),
+    "awards": ("name", "body", "date"),
+    "volunteer_work": ("role", "organization", "dates", "description"),
+    "skills": None,
+}
+
+# Fields that may be left out (older files and hand-written JSON often do) and what they default to.
+# Everything else is required. Defaults are written out as literals, so every record gets fresh lists.
+FIELD_DEFAULTS = {
+    "linkedin": "",
+    "summary": "",
+    "education": [],
+    "experience": [],
+    "projects": [],
+    "awards": [],
+    "volunteer_work": [],
+    "skills": [],
+}
+ENTRY_DEFAULTS = {"link": "", "description": []}
+
+_MISSING = object()
+# Lists of strings are checked with _ONLY_STR.issuperset(map(type, items)), which runs in C; JSON and the
+# GUI only ever produce plain str, never subclasses
+_ONLY_STR = frozenset((str,))
+
+
+def _absent_check(var, default):
+    # The test for a field that wasn't given: null counts as left out for optional fields (files written
+    # by other tools often have "linkedin": null), but a required field set to null is a type problem
+    return f"{var} is _MISSING" if default is _MISSING else f"{var} is _MISSING or {var} is None"
+
+
+def _text_field(lines, indent, source, target, key, default, missing_message, type_message):
+    # Code that reads string field `key` of `source` into `target`; messages are Python expressions
+    pad = " " * indent
+    var = "value" if source == "data" else "item"  # entry fields mustn't clobber the list being iterated
+    lines.append(f"{pad}{var} = {source}.get({key!r}, _MISSING)")
+    lines.append(f"{pad}if {_absent_check(var, default)}:")
+    if default is _MISSING:
+        lines.append(f"{pad}    problems.append({missing_message})")
+    else:
+        lines.append(f"{pad}    {target} = {default!r}")
+    lines.append(f"{pad}elif isinstance({var}, str):")
+    lines.append(f"{pad}    {target} = {var}")
+    # Formatted with f-strings, so numbers (a phone number, a year) are fine; booleans would come out as "True"
+    lines.append(f"{pad}elif isinstance({var}, (int, float)) and not isinstance({var}, bool):")
+    lines.append(f"{pad}    {target} = str({var})")
+    lines.append(f"{pad}else:")
+    lines.append(f"{pad}    problems.append({type_message})")
+
+
+def _string_list_field(lines, indent, source, target, key, default, missing_message, type_message):
+    pad = " " * indent
+    var = "value" if source == "data" else "item"  # entry fields mustn't clobber the list being iterated
+    lines.append(f"{pad}{var} = {source}.get({key!r}, _MISSING)")
+    lines.append(f"{pad}if {_absent_check(var, default)}:")
+    if default is _MISSING:
+        lines.append(f"{pad}    problems.append({missing_message})")
+    else:
+        lines.append(f"{pad}    {target} = []")
+    lines.append(f"{pad}elif isinstance({var}, list) and _ONLY_STR.issuperset(map(type, {var})):")
+    lines.append(f"{pad}    {target} = list({var})")
+    lines.append(f"{pad}else:")
+    lines.append(f"{pad}    problems.append({type_message})")
+
+
+def _checker_source(fields, field_defaults, entry_defaults):
+    lines = [
+        "def check_resume(data):",
+        "    if not isinstance(data, dict):",
+        "        return None, [f'expected a JSON object, got {type(data).__name__}']",
+        "    problems = []",
+        "    out = {}",
+    ]
+    for field, entry_keys in fields.items():
+        default = field_defaults.get(field, _MISSING)
+        missing = repr(f"missing field '{field}'")
+        if field == "skills":
+            _string_list_field(lines, 4, "data", f"out[{field!r}]", field, default, missing,
+                               repr("'skills' must be a list of strings"))
+        elif entry_keys is None:
+            _text_field(lines, 4, "data", f"out[{field!r}]", field, default, missing,
+                        repr(f"'{field}' must be text"))
+        else:
+            lines.append(f"    value = data.get({field!r}, _MISSING)")
+            lines.append(f"    if {_absent_check('value', default)}:")
+            lines.append(f"        problems.append({missing})" if default is _MISSING else f"        out[{field!r}] = []")
+            lines.append("    elif not isinstance(value, list):")
+            lines.append(f"        problems.append({repr(f'{field!r} must be a list')})")
+            lines.append("    else:")
+            lines.append("        entries = []")
+            lines.append("        for i, entry in enumerate(value):")
+            lines.append("            if not isinstance(entry, dict):")
+            lines.append(f"                problems.append(f{f'{field}[{{i}}] must be an object'!r})")
+            lines.append("                continue")
+            lines.append("            normalized = {}")
+            for key in entry_keys:
+                key_default = entry_defaults.get(key, _MISSING)
+                key_missing = "f" + repr(f"{field}[{{i}}] is missing '{key}'")
+                if key == "description":
+                    _string_list_field(lines, 12, "entry", f"normalized[{key!r}]", key, key_default, key_missing,
+                                       "f" + repr(f"{field}[{{i}}].description must be a list of strings"))
+                else:
+                    _text_field(lines, 12, "entry", f"normalized[{key!r}]", key, key_default, key_missing,
+                                "f" + repr(f"{field}[{{i}}].{key} must be text"))
+            lines.append("            entries.append(normalized)")
+            lines.append(f"        out[{field!r}] = entries")
+    lines.append("    if problems:")
+    lines.append("        return None, problems")
+    lines.append("    return out, problems")
+    return "\n".join(lines) + "\n"
+
+
+def compile_checker(fields=RESUME_FIELDS, field_defaults=FIELD_DEFAULTS, entry_defaults=ENTRY_DEFAULTS):
+    """Builds a check_resume(data) function for a schema.
+
+    The rules are turned into straight-line Python once, when the checker is
+    compiled, so checking a record runs no per-rule lookups. check_resume
+    returns (normalized, problems): a new dict with exactly the schema's fields
+    (defaults filled in, numbers given for text turned into strings, lists
+    copied) and an empty list, or None and every problem found in the record.
+    The generated code is kept in the function's __source__ attribute.
+    """
+    source = _checker_source(fields, field_defaults, entry_defaults)
+    namespace = {"_MISSING": _MISSING, "_ONLY_STR": _ONLY_STR}
+    exec(compile(source, "<resume_schema.check_resume>", "exec"), namespace)
+    check_resume = namespace["check_resume"]
+    check_resume.__source__ = source
+    return check_resume
+
+
+check_resume = compile_checker()
@@ -0,0 +1,352 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+DEFAULT_DB_PATH = "resumes.db"
+DEFAULT_BATCH_SIZE = 500
+
+# Multi-entry sections and the keys of their entries that go into the entries table
+# (heading, subheading, dates); "description" bullets are indexed separately
+SECTION_COLUMNS = {
+    "education": ("degree", "university", "year"),
+    "experience": ("title", "company", "dates"),
+    "projects": ("name", "link", "dates"),
+    "awards": ("name", "body", "date"),
+    "volunteer_work": ("role", "organization", "dates"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE,
+    name TEXT,
+    email TEXT,
+    phone TEXT,
+    linkedin TEXT,
+    summary TEXT,
+    experience_count INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resumes_experience_count ON resumes(experience_count);
+CREATE INDEX IF NOT EXISTS resumes_name ON resumes(name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS skills (
+    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    skill_key TEXT NOT NULL,
+    PRIMARY KEY (resume_id, position)
+);
+CREATE INDEX IF NOT EXISTS skills_by_key ON skills(skill_key, resume_id);
+
+CREATE TABLE IF NOT EXISTS entries (
+    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    heading TEXT,
+    subheading TEXT,
+    dates TEXT,
+    description TEXT,
+    PRIMARY KEY (resume_id, section, position)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(skills, summary, bullets);
+"""
+
+
+def _text(value):
+    return value if isinstance(value, str) else ("" if value is None else str(value))
+
+
+def _skill_key(skill):
+    return " ".join(_text(skill).split()).casefold()
+
+
+def _list(value):
+    return value if isinstance(value, list) else []
+
+
+class ResumeStore:
+    """Resume library in a single SQLite database.
+
+    Every resume is kept whole (as its JSON) for loading by id, and broken down
+    into indexed tables for searching: one row per skill, one row per entry of
+    the multi-entry sections, and an FTS5 full-text index over skills, summary
+    and description bullets. Resumes imported from files remember their source
+    path, so importing the same file again updates the resume instead of adding
+    a copy.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._depth = 0  # nesting level of transaction()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def transaction(self):
+        # Groups writes into one commit; nested transaction() blocks join the outermost one
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self.conn.rollback()
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self.conn.commit()
+
+    # --- Writing ---
+
+    def put(self, data, source=None, resume_id=None):
+        # Adds or replaces a resume and returns its id. An existing resume is found by resume_id or, failing that,
+        # by source (e.g. the file it was imported from).
+        with self.transaction():
+            if resume_id is None and source is not None:
+                row = self.conn.execute("SELECT id FROM resumes WHERE source = ?", (source,)).fetchone()
+                resume_id = row[0] if row else None
+            values = (
+                source,
+                _text(data.get("name")),
+                _text(data.get("email")),
+                _text(data.get("phone")),
+                _text(data.get("linkedin")),
+                _text(data.get("summary")),
+                len(_list(data.get("experience"))),
+                time.time(),
+                json.dumps(data, ensure_ascii=False),
+            )
+            if resume_id is not None:
+                self._delete_rows(resume_id)
+            cursor = self.conn.execute(
+                "INSERT INTO resumes (id, source, name, email, phone, linkedin, summary, experience_count,"
+                " updated_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (resume_id,) + values)
+            resume_id = cursor.lastrowid
+            self._index(resume_id, data)
+        return resume_id
+
+    def _index(self, resume_id, data):
+        skills = [_text(skill) for skill in _list(data.get("skills"))]
+        self.conn.executemany(
+            "INSERT INTO skills (resume_id, position, skill, skill_key) VALUES (?, ?, ?, ?)",
+            [(resume_id, i, skill, _skill_key(skill)) for i, skill in enumerate(skills)])
+        entry_rows = []
+        bullets = []
+        for section, keys in SECTION_COLUMNS.items():
+            for i, entry in enumerate(_list(data.get(section))):
+                if not isinstance(entry, dict):
+                    continue
+                description = [_text(item) for item in _list(entry.get("description"))]
+                bullets.extend(description)
+                entry_rows.append((resume_id, section, i, *(_text(entry.get(key)) for key in keys),
+                                   "\n".join(description)))
+        self.conn.executemany(
+            "INSERT INTO entries (resume_id, section, position, heading, subheading, dates, description)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)", entry_rows)
+        self.conn.execute(
+            "INSERT INTO resume_fts (rowid, skills, summary, bullets) VALUES (?, ?, ?, ?)",
+            (resume_id, "\n".join(skills), _text(data.get("summary")), "\n".join(bullets)))
+
+    def _delete_rows(self, resume_id):
+        # Removes a resume and everything indexed for it; returns whether it existed
+        self.conn.execute("DELETE FROM resume_fts WHERE rowid = ?", (resume_id,))
+        return self.conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,)).rowcount > 0
+
+    def delete(self, resume_id):
+        with self.transaction():
+            return self._delete_rows(resume_id)
+
+    def put_many(self, items):
+        # Adds or replaces (source, data) pairs in one transaction; returns their ids
+        with self.transaction():
+            return [self.put(data, source=source) for source, data in items]
+
+    def import_files(self, sources, batch_size=DEFAULT_BATCH_SIZE, on_error=None):
+        # Imports resume files (same sources as batch_render.py: directories, globs, manifests, .json and .jsonl)
+        # in transactions of batch_size resumes. Bad files and records are passed to on_error (or printed)
+        # and skipped. Returns (imported, failed).
+        from batch_render import collect_input_files
+        from resume_generator import iter_resume_records
+        from resume_journal import load_journaled
+
+        imported = 0
+        failed = 0
+
+        def report(error):
+            nonlocal failed
+            failed += 1
+            if on_error is None:
+                print(f"Skipping '{error['file']}'" + (f" line {error['line']}" if "line" in error else "")
+                      + f": {error['error']}")
+            else:
+                on_error(error)
+
+        batch = []
+
+        def add(source, data):
+            # Commits every batch_size resumes, also in the middle of a large .jsonl file
+            nonlocal batch, imported
+            batch.append((source, data))
+            if len(batch) >= batch_size:
+                imported += len(self.put_many(batch))
+                batch = []
+
+        for input_path in collect_input_files(sources):
+            source = os.path.abspath(input_path)
+            if input_path.endswith(".jsonl"):
+                for line_number, _, data in iter_resume_records(input_path, on_error=report, with_position=True):
+                    add(f"{source}#{line_number}", data)
+            else:
+                try:
+                    data = load_journaled(input_path)
+                    if not isinstance(data, dict):
+                        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+                except (OSError, ValueError) as e:
+                    report({"file": input_path, "error": str(e)})
+                    continue
+                add(source, data)
+        if batch:
+            imported += len(self.put_many(batch))
+        return imported, failed
+
+    # --- Reading ---
+
+    def get(self, resume_id):
+        # Returns the resume dict stored under resume_id, or None
+        row = self.conn.execute("SELECT data FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def search(self, text=None, skills=(), min_experience=None, max_experience=None, limit=100):
+        # Returns [(id, name)] of resumes matching every given condition:
+        #   text:      FTS5 query over skills, summary and bullets, e.g. 'kubernetes AND "on-call"'
+        #              (results are then ordered by relevance)
+        #   skills:    skills that must all be listed, compared case-insensitively
+        #   min_/max_experience: bounds on the number of experience entries
+        sql = ["SELECT r.id, r.name FROM resumes r"]
+        where = []
+        params = []
+        if text:
+            sql.append("JOIN resume_fts ON resume_fts.rowid = r.id")
+            where.append("resume_fts MATCH ?")
+            params.append(text)
+        for skill in skills:
+            where.append("r.id IN (SELECT resume_id FROM skills WHERE skill_key = ?)")
+            params.append(_skill_key(skill))
+        if min_experience is not None:
+            where.append("r.experience_count >= ?")
+            params.append(min_experience)
+        if max_experience is not None:
+            where.append("r.experience_count <= ?")
+            params.append(max_experience)
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        sql.append("ORDER BY resume_fts.rank, r.id" if text else "ORDER BY r.id")
+        sql.append("LIMIT ?")
+        params.append(limit)
+        return self.conn.execute(" ".join(sql), params).fetchall()
+
+    def list_resumes(self, limit=100, offset=0):
+        # [(id, name, source)] in id order, for browsing the library
+        return self.conn.execute("SELECT id, name, source FROM resumes ORDER BY id LIMIT ? OFFSET ?",
+                                 (limit, offset)).fetchall()
+
+    def skill_counts(self, limit=50):
+        # Most common skills as [(skill, number of resumes)]
+        return self.conn.execute(
+            "SELECT MIN(skill), COUNT(DISTINCT resume_id) AS n FROM skills GROUP BY skill_key"
+            " ORDER BY n DESC, skill_key LIMIT ?", (limit,)).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import, search and load resumes in a SQLite resume library.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"library database (default: {DEFAULT_DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import resume files")
+    import_parser.add_argument("sources", nargs="+", help="directories, glob patterns, manifests, .json or .jsonl files")
+    import_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="resumes per transaction")
+
+    search_parser = commands.add_parser("search", help="find resumes")
+    search_parser.add_argument("text", nargs="?", help="full-text query over skills, summary and bullets")
+    search_parser.add_argument("-s", "--skill", action="append", default=[], help="required skill (repeatable)")
+    search_parser.add_argument("--min-experience", type=int, help="at least this many experience entries")
+    search_parser.add_argument("--max-experience", type=int, help="at most this many experience entries")
+    search_parser.add_argument("--limit", type=int, default=100)
+
+    show_parser = commands.add_parser("show", help="print a resume as JSON")
+    show_parser.add_argument("id", type=int)
+
+    export_parser = commands.add_parser("export", help="save a resume to a JSON file")
+    export_parser.add_argument("id", type=int)
+    export_parser.add_argument("-o", "--output", required=True)
+
+    render_parser = commands.add_parser("render", help="render a resume to PDF")
+    render_parser.add_argument("id", type=int)
+    render_parser.add_argument("-o", "--output", required=True)
+
+    args = parser.parse_args(argv)
+    with ResumeStore(args.db) as store:
+        if args.command == "import":
+            start = time.perf_counter()
+            imported, failed = store.import_files(args.sources, batch_size=args.batch_size)
+            print(f"Imported {imported} resumes ({failed} failed) in {time.perf_counter() - start:.1f}s; "
+                  f"{store.count()} in '{args.db}'")
+            return 1 if failed else 0
+
+        if args.command == "search":
+            start = time.perf_counter()
+            try:
+                results = store.search(args.text, args.skill, args.min_experience, args.max_experience, args.limit)
+            except sqlite3.OperationalError as e:
+                print(f"Invalid search: {e}", file=sys.stderr)
+                return 2
+            for resume_id, name in results:
+                print(f"{resume_id}\t{name}")
+            print(f"{len(results)} match(es) in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+            return 0
+
+        data = store.get(args.id)
+        if data is None:
+            print(f"No resume with id {args.id} in '{args.db}'", file=sys.stderr)
+            return 1
+        if args.command == "show":
+            print(json.dumps(data, indent=4, ensure_ascii=False))
+        elif args.command == "export":
+            from resume_generator import save_resume_data
+            save_resume_data(data, args.output)
+        elif args.command == "render":
+            from resume_generator import ResumePDF, generate_resume_pdf
+            from resume_journal import atomic_output
+            pdf_instance = ResumePDF(unit="mm", format="A4")
+            generate_resume_pdf(data, pdf_instance)
+            with atomic_output(args.output) as f:
+                pdf_instance.output_to(f)
+            print(f"Resume PDF generated successfully as '{args.output}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Sections remembered per memo; the least recently used are dropped past this
+DEFAULT_MAX_SECTIONS = 256
+
+
+def _section_texts(content):
+    # Every string a section draws: a paragraph, the (name, contact) pair, or (bold, plain, bullets) entries
+    if isinstance(content, str):
+        yield content
+        return
+    for item in content:
+        if isinstance(item, str):
+            yield item
+            continue
+        bold_line, plain_line, bullets = item
+        yield bold_line
+        yield plain_line
+        yield from bullets or ()
+
+
+class SectionMemo:
+    """Remembers what each section of a resume drew, so an unchanged section is replayed instead of laid out.
+
+    Pass one instance to generate_resume_pdf(..., section_memo=memo) for
+    every render of the same resume, as the GUI does each time Generate is
+    pressed. A section is recorded as the bytes it added to each page, the
+    pages it started, the glyphs it added to the font subsets and the state
+    it left behind. It is replayed when its text and compiled steps, the page
+    geometry, its starting position and graphics state, and the subset ids
+    of every character it uses are all the same as when it was recorded: the
+    replayed bytes are then exactly what laying it out again would produce.
+    After an edit, the edited section is laid out again, and so is every
+    later one whose start position (or glyph numbering) it moved.
+
+    Replayed sections make no cell()/multi_cell() calls, so instrumentation
+    counts only the sections that were laid out. Thread safe; hits and misses
+    are counted in .hits and .misses.
+    """
+
+    def __init__(self, max_sections=DEFAULT_MAX_SECTIONS):
+        self.max_sections = max_sections
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def draw(self, pdf_obj, section_name, steps, content, labels, draw):
+        # Replays the section if it was recorded in the same situation; otherwise calls draw() and records it
+        texts = list(_section_texts(content))
+        if pdf_obj.str_alias_nb_pages and any(pdf_obj.str_alias_nb_pages in text for text in texts):
+            draw()  # page-count placeholders are filled in per page at output; not worth recording
+            return
+        key = self._key(pdf_obj, section_name, steps, texts, labels)
+        with self._lock:
+            recording = self._entries.get(key)
+            if recording is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if recording is not None:
+            _replay(pdf_obj, recording)
+            return
+        recording = _record(pdf_obj, draw)
+        with self._lock:
+            self._entries[key] = recording
+            while len(self._entries) > self.max_sections:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _key(pdf_obj, section_name, steps, texts, labels):
+        digest = hashlib.blake2b(digest_size=16)
+        for text in texts:
+            digest.update(text.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        # Spaces and hyphens can be drawn without appearing in the text (non-breaking spaces, soft hyphens)
+        characters = sorted(set().union(*texts, *labels, " -"))
+        glyph_state = []
+        for fontkey in sorted(pdf_obj.fonts):
+            subset = getattr(pdf_obj.fonts[fontkey], "subset", None)
+            if subset is None:
+                continue
+            ids = subset._char_id_per_glyph
+            glyph_state.append((fontkey, subset._next, tuple(subset._reserved),
+                                tuple(ids.get(subset.get_glyph(unicode=ord(c))) for c in characters)))
+        geometry = (pdf_obj.w, pdf_obj.h, pdf_obj.l_margin, pdf_obj.t_margin, pdf_obj.r_margin,
+                    pdf_obj.auto_page_break, pdf_obj.page_break_trigger)
+        state = (pdf_obj.x, pdf_obj.y, pdf_obj._lasth, pdf_obj.font_family, pdf_obj.font_style, pdf_obj.font_size_pt,
+                 pdf_obj.current_font_is_set_on_page, pdf_obj.text_color, pdf_obj.draw_color, pdf_obj.fill_color,
+                 pdf_obj.line_width)
+        return (section_name, steps, digest.digest(), geometry, state, tuple(glyph_state))
+
+
+def _font_subsets(pdf_obj):
+    return {fontkey: font for fontkey, font in pdf_obj.fonts.items() if getattr(font, "subset", None) is not None}
+
+
+def _record(pdf_obj, draw):
+    catalog = pdf_obj._resource_catalog
+    first_page = pdf_obj.page
+    start = len(pdf_obj.pages[first_page].contents)
+    resources_before = {key: set(values) for key, values in catalog.resources_per_page.items()
+                        if key[0] == first_page}
+    fonts = _font_subsets(pdf_obj)
+    glyphs_before = {fontkey: len(font.subset._char_id_per_glyph) for fontkey, font in fonts.items()}
+    missing_before = {fontkey: len(font.missing_glyphs) for fontkey, font in fonts.items()}
+
+    draw()
+
+    pages = [bytes(pdf_obj.pages[first_page].contents[start:])]
+    pages.extend(bytes(pdf_obj.pages[page].contents) for page in range(first_page + 1, pdf_obj.page + 1))
+    resources = []
+    for (page, resource_type), values in catalog.resources_per_page.items():
+        if page >= first_page:
+            added = values - resources_before.get((page, resource_type), set())
+            if added:
+                resources.append((page - first_page, resource_type, frozenset(added)))
+    glyphs = {fontkey: list(font.subset._char_id_per_glyph)[glyphs_before[fontkey]:] for fontkey, font in fonts.items()}
+    missing = {fontkey: font.missing_glyphs[missing_before[fontkey]:] for fontkey, font in fonts.items()}
+    state = (pdf_obj.x, pdf_obj.y, pdf_obj._lasth, pdf_obj.font_family, pdf_obj.font_style, pdf_obj.font_size_pt,
+             pdf_obj.current_font_is_set_on_page, pdf_obj.text_color)
+    return pages, resources, glyphs, missing, state
+
+
+def _replay(pdf_obj, recording):
+    pages, resources, glyphs, missing, state = recording
+    catalog = pdf_obj._resource_catalog
+    first_page = pdf_obj.page
+    pdf_obj.pages[first_page].contents += pages[0]
+    for contents in pages[1:]:
+        # Starts the page the way a page break while drawing would; its contents are then the recorded ones
+        pdf_obj._perform_page_break()
+        pdf_obj.pages[pdf_obj.page].contents = bytearray(contents)
+    for offset, resource_type, values in resources:
+        catalog.resources_per_page[(first_page + offset, resource_type)].update(values)
+    for fontkey, new_glyphs in glyphs.items():
+        subset = pdf_obj.fonts[fontkey].subset
+        for glyph in new_glyphs:
+            subset.pick_glyph(glyph)
+    for fontkey, codes in missing.items():
+        missing_glyphs = pdf_obj.fonts[fontkey].missing_glyphs
+        missing_glyphs.extend(code for code in codes if code not in missing_glyphs)
+    x, y, lasth, font_family, font_style, font_size_pt, font_is_set, text_color = state
+    if font_family:
+        pdf_obj.set_font(font_family, font_style, font_size_pt)
+    pdf_obj.current_font_is_set_on_page = font_is_set
+    pdf_obj.text_color = text_color
+    pdf_obj.x, pdf_obj.y, pdf_obj._lasth = x, y, lasth
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from fontTools import subset as ftsubset
+from fpdf.output import CIDSystemInfo, OutputProducer, PDFFont, PDFFontStream, _tt_font_widths
+from fpdf.syntax import Name, PDFArray, PDFContentStream
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 64
+
+# Same options fpdf2 uses in OutputProducer._add_fonts
+_DROPPED_TABLES = [
+    "FFTM", "GDEF", "GPOS", "GSUB", "MATH", "hdmx", "meta", "sbix", "CBDT",
+    "CBLC", "EBDT", "EBLC", "EBSC", "SVG ", "CPAL", "COLR", "fvar",
+]
+
+
+def _subset_options():
+    options = ftsubset.Options(notdef_outline=True, recommended_glyphs=True)
+    options.drop_tables += _DROPPED_TABLES
+    return options
+
+
+class SubsetCache:
+    """Reuses fontTools subsets of the same font file for the same set of glyphs.
+
+    An entry is the serialized subset font plus the glyph-name -> glyph-id map of
+    that subset, which is all the PDF output needs, so a hit skips fontTools
+    entirely. Entries live in a bounded in-memory LRU and, if cache_dir is given,
+    also on disk (<key>.ttf + <key>.json) so later runs can reuse them.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._file_hashes = {}  # (path, mtime_ns, size) -> sha256 of the file
+        self._lock = threading.Lock()
+        self.set_cache_dir(cache_dir)
+
+    def set_cache_dir(self, cache_dir):
+        # Turns on (or, with None, off) the on-disk store
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _file_hash(self, font_path):
+        # Memoized by modification time and size too, so a font file replaced on disk is hashed again
+        st = os.stat(font_path)
+        key = (str(font_path), st.st_mtime_ns, st.st_size)
+        digest = self._file_hashes.get(key)
+        if digest is None:
+            with open(font_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            self._file_hashes[key] = digest
+        return digest
+
+    def key_for(self, font_path, glyph_names, file_digest=None):
+        # file_digest, if known, is the sha256 of the font bytes being subsetted (see FontRegistry)
+        digest = hashlib.sha256((file_digest or self._file_hash(font_path)).encode("ascii"))
+        for name in sorted(glyph_names):
+            digest.update(b"\0" + name.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+        entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._remember(key, entry)
+        return entry
+
+    def put(self, key, font_bytes, glyph_ids):
+        entry = (font_bytes, glyph_ids)
+        with self._lock:
+            self._remember(key, entry)
+        if self.cache_dir:
+            self._store(key, entry)
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key):
+        if not self.cache_dir:
+            return None
+        base = os.path.join(self.cache_dir, key)
+        try:
+            with open(base + ".json", "r", encoding="utf-8") as f:
+                glyph_ids = json.load(f)
+            with open(base + ".ttf", "rb") as f:
+                font_bytes = f.read()
+        except (OSError, ValueError):
+            return None
+        return font_bytes, glyph_ids
+
+    def _store(self, key, entry):
+        font_bytes, glyph_ids = entry
+        base = os.path.join(self.cache_dir, key)
+        # Font bytes first: an entry only counts once its .json exists
+        for suffix, payload in ((".ttf", font_bytes), (".json", json.dumps(glyph_ids).encode("utf-8"))):
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, base + suffix)
+
+    def subset(self, font):
+        # Returns (subset font bytes, {glyph name: glyph id in the subset}) for an fpdf TTFFont
+        glyph_names = font.subset.get_all_glyph_names()
+        # Registry fonts carry the digest of the bytes they were parsed from, which may be older than the file
+        key = self.key_for(font.ttffile, glyph_names, getattr(font, "file_digest", None))
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+
+        subsetter = ftsubset.Subsetter(_subset_options())
+        subsetter.populate(glyphs=glyph_names)
+        subsetter.subset(font.ttfont)
+        glyph_ids = {name: font.ttfont.getGlyphID(name) for name in glyph_names}
+        output = BytesIO()
+        font.ttfont.save(output)
+        font_bytes = output.getvalue()
+        self.put(key, font_bytes, glyph_ids)
+        return font_bytes, glyph_ids
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries_in_memory": len(self._memory),
+        }
+
+
+# Shared by every render in this process; call SUBSET_CACHE.set_cache_dir() to also keep subsets on disk
+SUBSET_CACHE = SubsetCache()
+
+
+class SubsetCachingOutputProducer(OutputProducer):
+    """OutputProducer that gets TrueType subsets from SUBSET_CACHE.
+
+    _add_fonts mirrors fpdf2 2.8.3 (pinned in requirements.txt) except for the
+    subsetting step, and must be kept in step with it when fpdf2 is upgraded.
+    """
+
+    subset_cache = SUBSET_CACHE
+
+    def _add_fonts(self):
+        font_objs_per_index = {}
+        for font in sorted(self.fpdf.fonts.values(), key=lambda font: font.i):
+            if font.type == "core":
+                encoding = "WinAnsiEncoding" if font.name not in ("Symbol", "ZapfDingbats") else None
+                core_font_obj = PDFFont(subtype="Type1", base_font=font.name, encoding=encoding)
+                self._add_pdf_obj(core_font_obj, "fonts")
+                font_objs_per_index[font.i] = core_font_obj
+            elif font.type == "TTF":
+                font_objs_per_index[font.i] = self._add_ttf_font(font)
+        return font_objs_per_index
+
+    def _add_ttf_font(self, font):
+        fontname = f"MPDFAA+{font.name}"
+
+        if len(font.missing_glyphs) > 0:
+            msg = ", ".join(
+                f"'{chr(x)}' ({chr(x).encode('unicode-escape').decode()})" for x in font.missing_glyphs[:10]
+            )
+            if len(font.missing_glyphs) > 10:
+                msg += f", ... (and {len(font.missing_glyphs) - 10} others)"
+            LOGGER.warning("Font %s is missing the following glyphs: %s", fontname, msg)
+
+        ttfontstream, glyph_ids = self.subset_cache.subset(font)
+        code_to_glyph = {char_id: glyph_ids[glyph.glyph_name] for glyph, char_id in font.subset.items()}
+
+        composite_font_obj = PDFFont(subtype="Type0", base_font=fontname, encoding="Identity-H")
+        self._add_pdf_obj(composite_font_obj, "fonts")
+
+        cid_font_obj = PDFFont(
+            subtype="CIDFontType2",
+            base_font=fontname,
+            d_w=font.desc.missing_width,
+            w=_tt_font_widths(font),
+        )
+        self._add_pdf_obj(cid_font_obj, "fonts")
+        composite_font_obj.descendant_fonts = PDFArray([cid_font_obj])
+
+        def format_code(unicode):
+            if unicode > 0xFFFF:
+                code_high = 0xD800 | (unicode - 0x10000) >> 10
+                code_low = 0xDC00 | (unicode & 0x3FF)
+                return f"{code_high:04X}{code_low:04X}"
+            return f"{unicode:04X}"
+
+        bfChar = []
+        for glyph, code_mapped in font.subset.items():
+            if len(glyph.unicode) == 0:
+                continue
+            bfChar.append(f'<{code_mapped:04X}> <{"".join(format_code(code) for code in glyph.unicode)}>\n')
+
+        to_unicode_obj = PDFContentStream(
+            "/CIDInit /ProcSet findresource begin\n"
+            "12 dict begin\n"
+            "begincmap\n"
+            "/CIDSystemInfo\n"
+            "<</Registry (Adobe)\n"
+            "/Ordering (UCS)\n"
+            "/Supplement 0\n"
+            ">> def\n"
+            "/CMapName /Adobe-Identity-UCS def\n"
+            "/CMapType 2 def\n"
+            "1 begincodespacerange\n"
+            "<0000> <FFFF>\n"
+            "endcodespacerange\n"
+            f"{len(bfChar)} beginbfchar\n"
+            f"{''.join(bfChar)}"
+            "endbfchar\n"
+            "endcmap\n"
+            "CMapName currentdict /CMap defineresource pop\n"
+            "end\n"
+            "end"
+        )
+        self._add_pdf_obj(to_unicode_obj, "fonts")
+        composite_font_obj.to_unicode = to_unicode_obj
+
+        cid_system_info_obj = CIDSystemInfo()
+        self._add_pdf_obj(cid_system_info_obj, "fonts")
+        cid_font_obj.c_i_d_system_info = cid_system_info_obj
+
+        font_descriptor_obj = font.desc
+        font_descriptor_obj.font_name = Name(fontname)
+        self._add_pdf_obj(font_descriptor_obj, "fonts")
+        cid_font_obj.font_descriptor = font_descriptor_obj
+
+        # Built as bytes directly (fpdf2 builds a 131072-item list of 1-char strings and joins it)
+        cid_to_gid_map = bytearray(256 * 256 * 2)
+        for cc, glyph in code_to_glyph.items():
+            cid_to_gid_map[cc * 2] = glyph >> 8
+            cid_to_gid_map[cc * 2 + 1] = glyph & 0xFF
+        cid_to_gid_map_obj = PDFContentStream(contents=bytes(cid_to_gid_map), compress=True)
+        self._add_pdf_obj(cid_to_gid_map_obj, "fonts")
+        cid_font_obj.c_i_d_to_g_i_d_map = cid_to_gid_map_obj
+
+        font_file_cs_obj = PDFFontStream(contents=ttfontstream)
+        self._add_pdf_obj(font_file_cs_obj, "fonts")
+        font_descriptor_obj.font_file2 = font_file_cs_obj
+
+        font.subset.pick.cache_clear()
+        font.subset.get_glyph.cache_clear()
+        font.close()
+        return composite_font_obj
@@ -0,0 +1,104 @@
+import json
+import os
+import signal
+
+import pytest
+
+import batch_render
+from batch_render import output_names, run_batch
+
+
+def _write_resume(path, name):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"name": name, "email": "x@example.com", "phone": "555"}, f)
+
+
+@pytest.fixture(autouse=True)
+def deadline():
+    # A batch that loses track of a job never ends; fail instead of hanging
+    signal.alarm(120)
+    yield
+    signal.alarm(0)
+
+
+def test_output_names_never_collide():
+    names = output_names(["a/resume.json", "b/resume.json", "./a/resume.json", "exports.jsonl",
+                          "exports-000001.json", "other/Exports-000001.json", "solo.json"])
+    assert names == {
+        "a/resume.json": "a_resume",
+        "b/resume.json": "b_resume",
+        "exports.jsonl": "exports",
+        "exports-000001.json": "exports-000001-2",
+        "other/Exports-000001.json": "other_Exports-000001",
+        "solo.json": "solo",
+    }
+
+
+def test_same_named_inputs_get_separate_pdfs(tmp_path):
+    inputs = [str(tmp_path / "a" / "resume.json"), str(tmp_path / "b" / "resume.json")]
+    for i, path in enumerate(inputs):
+        _write_resume(path, f"Person {i}")
+    output_dir = str(tmp_path / "out")
+    summary = run_batch(inputs, output_dir, workers=1)
+    assert summary["succeeded"] == 2
+    assert sorted(os.listdir(output_dir)) == ["a_resume.pdf", "b_resume.pdf"]
+
+
+def _dies_after_taking_a_job(task_queue, result_queue, *args, flag=None):
+    # The first worker takes a job off its queue and dies before reporting it started
+    if not os.path.exists(flag):
+        open(flag, "w").close()
+        task_queue.get()
+        os._exit(1)
+    _real_worker_main(task_queue, result_queue, *args)
+
+
+_real_worker_main = batch_render._worker_main
+
+
+def test_jobs_of_a_worker_that_died_before_starting_them_are_rendered(tmp_path, monkeypatch):
+    inputs = []
+    for i in range(6):
+        inputs.append(str(tmp_path / "in" / f"r{i}.json"))
+        _write_resume(inputs[-1], f"Person {i}")
+    flag = str(tmp_path / "died")
+    monkeypatch.setattr(batch_render, "_worker_main",
+                        lambda *args: _dies_after_taking_a_job(*args, flag=flag))
+    summary = run_batch(inputs, str(tmp_path / "out"), workers=2)
+    assert os.path.exists(flag)
+    assert (summary["succeeded"], summary["failed"]) == (6, 0)
+    assert len(os.listdir(tmp_path / "out")) == 6
+
+
+def _dies_on_poison(task_queue, result_queue, output_dir, *args):
+    # Renders like a real worker, but dies (before reporting it started) on any job named "poison"
+    pid = os.getpid()
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        index, job = task
+        if job["name"] == "poison":
+            os._exit(1)
+        result_queue.put(("started", pid, index))
+        record = batch_render.render_task(job, output_dir)
+        record["job"] = index
+        result_queue.put(("done", pid, record))
+    result_queue.put(("retired", pid, {"jobs": 0, "cache": None}))
+
+
+def test_a_job_that_keeps_killing_workers_is_reported_failed(tmp_path, monkeypatch):
+    inputs = [str(tmp_path / "in" / name) for name in ("a.json", "poison.json", "b.json", "c.json", "d.json")]
+    for path in inputs:
+        _write_resume(path, "Person")
+    monkeypatch.setattr(batch_render, "_worker_main", _dies_on_poison)
+    report = str(tmp_path / "report.jsonl")
+    summary = run_batch(inputs, str(tmp_path / "out"), workers=2, report_path=report)
+
+    assert (summary["succeeded"], summary["failed"]) == (4, 1)
+    assert sorted(os.listdir(tmp_path / "out")) == ["a.pdf", "b.pdf", "c.pdf", "d.pdf"]
+    with open(report, encoding="utf-8") as f:
+        records = {record["name"]: record for record in map(json.loads, f)}
+    assert records["poison"]["status"] == "failed"
+    assert records["poison"]["error"] == f"worker exited with code 1 ({batch_render.MAX_ATTEMPTS} attempts)"
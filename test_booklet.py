@@ -0,0 +1,57 @@
+import re
+
+import pytest
+
+import resume_cli
+from benchmarks.synthetic import generate_profile
+from booklet import render_booklet
+from resume_generator import ResumePDF, generate_resume_pdf
+
+
+def _pages(pdf_bytes):
+    return len(re.findall(rb"/Type /Page\b", pdf_bytes))
+
+
+def _outline_titles(pdf_bytes):
+    return re.findall(rb"/Title (\([^)]*\)|<[0-9a-f]+>)", pdf_bytes)
+
+
+def test_fonts_are_embedded_once_and_every_resume_gets_a_bookmark():
+    resumes = [generate_profile("medium", seed=seed) for seed in range(3)]
+    pdf_bytes, included = render_booklet(resumes, title="Candidates")
+
+    assert included == 3
+    separate_pages = 0
+    for data in resumes:
+        pdf_instance = ResumePDF(unit="mm")
+        generate_resume_pdf(data, pdf_instance)
+        single = bytes(pdf_instance.output())
+        separate_pages += _pages(single)
+        assert pdf_bytes.count(b"/FontFile2") == single.count(b"/FontFile2")
+    assert _pages(pdf_bytes) == separate_pages
+    titles = _outline_titles(pdf_bytes)
+    titles.remove(b"(Candidates)")  # the document title, in the info dictionary
+    assert titles == [f"({data['name']})".encode() for data in resumes]
+    assert b"/PageMode /UseOutlines" in pdf_bytes
+
+
+def test_invalid_resumes_are_skipped_and_reported():
+    good = {"name": "Ann Lee", "email": "ann@example.com", "phone": "555"}
+    errors = []
+    pdf_bytes, included = render_booklet([("a.json", good), ("b.json", {"name": "No Contact"}), good],
+                                         on_error=lambda label, message: errors.append(label))
+    assert included == 2
+    assert errors == ["b.json"]
+    assert len(_outline_titles(pdf_bytes)) == 2
+
+    with pytest.raises(ValueError):
+        render_booklet([{"name": "No Contact"}])
+
+
+def test_failed_booklet_leaves_no_output_file(tmp_path):
+    (tmp_path / "bad.json").write_text('{"name": "No Contact"}', encoding="utf-8")
+    output = tmp_path / "booklet.pdf"
+
+    assert resume_cli.main(["booklet", str(tmp_path / "bad.json"), "-o", str(output)]) == 1
+    assert not output.exists()
+    assert [p.name for p in tmp_path.iterdir()] == ["bad.json"]
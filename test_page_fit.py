@@ -0,0 +1,36 @@
+import pytest
+
+from benchmarks.synthetic import PROFILES, generate_profile, generate_resume
+from page_fit import PageMeasurer, fit_layout
+from resume_generator import ResumePDF, generate_resume_pdf, prepare_resume_text, resolve_layout
+
+
+def _rendered_pages(data, layout=None):
+    pdf_instance = ResumePDF(unit="mm", format=resolve_layout(layout)["format"])
+    generate_resume_pdf(data, pdf_instance, layout=layout)
+    return pdf_instance.page
+
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+@pytest.mark.parametrize("layout", ["classic", "condensed"])
+def test_measured_pages_match_rendered_pages(profile, layout):
+    data = generate_profile(profile)
+    assert PageMeasurer().measure(prepare_resume_text(data), layout) == _rendered_pages(data, layout)
+
+
+def test_fit_layout_shrinks_until_the_render_fits():
+    data = generate_resume(entries=3, bullets=3, bullet_words=12, skills=8)
+    assert _rendered_pages(data) == 2
+
+    settings, report = fit_layout(data, pages=1)
+    assert report["fits"] and report["pages"] == 1
+    assert report["font_scale"] < 1.0 or report["spacing_scale"] < 1.0
+    assert _rendered_pages(data, settings) == 1
+
+
+def test_fit_layout_keeps_a_layout_that_already_fits():
+    data = generate_resume(entries=1, bullets=1, bullet_words=8, skills=4)
+    assert _rendered_pages(data) == 1
+    settings, report = fit_layout(data, pages=1)
+    assert settings == resolve_layout(None)
+    assert (report["font_scale"], report["spacing_scale"], report["probes"]) == (1.0, 1.0, 1)
@@ -0,0 +1,47 @@
+import pytest
+
+from render_cache import RenderCache
+
+
+def test_rewriting_an_entry_counts_its_size_once(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=250)
+    cache.put("a", b"x" * 100)
+    cache.put("b", b"y" * 100)
+    cache.put("a", b"z" * 120)  # rewritten: 220 bytes on disk, under the limit
+    assert cache.stats()["bytes"] == 220
+
+    big = RenderCache(str(tmp_path / "big"), max_bytes=10_000)
+    for _ in range(5):
+        big.put("b", b"y" * 100)
+    assert big.stats()["bytes"] == 100
+    assert cache.evictions == 0
+    assert cache.get("a") == b"z" * 120 and cache.get("b") == b"y" * 100
+
+
+def test_size_is_evicted_down_to_the_limit(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=250)
+    for key in "abc":
+        cache.put(key, b"x" * 100)
+
+    assert cache.evictions == 1
+    assert cache.stats() == {**cache.stats(), "entries": 2, "bytes": 200}
+    assert RenderCache(str(tmp_path)).stats()["bytes"] == 200
+
+
+def _disk_full(fd):
+    raise OSError("disk full")
+
+
+def test_failed_write_leaves_no_partial_pdf(tmp_path, monkeypatch):
+    import resume_journal
+
+    cache = RenderCache(str(tmp_path / "cache"))
+    output = tmp_path / "resume.pdf"
+    output.write_bytes(b"previous")
+    monkeypatch.setattr(cache, "render", lambda data, layout=None: b"%PDF-new")
+    monkeypatch.setattr(resume_journal.os, "fsync", _disk_full)
+
+    with pytest.raises(OSError):
+        cache.render_to_file({}, str(output))
+    assert output.read_bytes() == b"previous"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cache", "resume.pdf"]
@@ -0,0 +1,147 @@
+import http.client
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import render_server
+from render_server import NoWorkerAvailable, RenderService, make_server
+
+
+def _fake_render(data):
+    # Stands in for _render_in_worker in the pool processes: sleeps, crashes or writes a tiny file
+    if data.get("crash"):
+        os._exit(1)
+    time.sleep(data.get("sleep", 0))
+    fd, spool_path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"%PDF-")
+    return spool_path, 5, []
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(render_server, "_render_in_worker", _fake_render)
+    services = []
+
+    def make(**options):
+        services.append(RenderService(**options))
+        return services[-1]
+
+    yield make
+    for started in services:
+        started.shutdown()
+
+
+def _render(service, data):
+    assert service.try_acquire()
+    spool_path, _ = service.render(data)
+    os.remove(spool_path)
+
+
+def test_timed_out_render_keeps_its_slot_until_it_finishes(service):
+    service = service(workers=1, queue_size=0, timeout=0.2)
+    assert service.try_acquire()
+    with pytest.raises(FutureTimeoutError):
+        service.render({"sleep": 1.0})
+    assert not service.try_acquire()  # the worker is still busy with it
+    deadline = time.monotonic() + 5
+    while service.in_flight and time.monotonic() < deadline:
+        time.sleep(0.05)
+    _render(service, {})
+
+
+def test_timeout_does_not_count_queue_wait(service):
+    service = service(workers=1, queue_size=1, timeout=0.6)
+    service.warm_up()
+    errors = []
+
+    def request():
+        try:
+            _render(service, {"sleep": 0.4})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=request) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []  # the second one waited 0.4 s for the worker, then rendered in 0.4 s
+
+
+def test_waiting_for_a_hung_worker_times_out_and_gives_back_the_slot(service):
+    service = service(workers=1, queue_size=1, timeout=0.3)
+    assert service.try_acquire()
+    with pytest.raises(FutureTimeoutError):
+        service.render({"sleep": 1.5})  # still holds the only worker
+    assert service.try_acquire()
+    with pytest.raises(NoWorkerAvailable):
+        service.render({})
+    assert service.in_flight == 1
+    assert service.try_acquire()  # the slot is free again
+    service.release()
+
+
+def test_crashed_worker_rebuilds_pool_and_shows_in_health(service):
+    service = service(workers=1, queue_size=0, timeout=5)
+    assert service.try_acquire()
+    with pytest.raises(BrokenProcessPool):
+        service.render({"crash": True})
+    assert service.pool_restarts == 1
+    assert service.in_flight == 0
+    _render(service, {})
+    health = service.health()
+    assert health["status"] == "ok" and health["pool_restarts"] == 1
+
+
+def test_health_reports_a_broken_pool(service, monkeypatch):
+    service = service(workers=1, queue_size=0, timeout=5)
+    assert service.try_acquire()
+    with pytest.raises(BrokenProcessPool):
+        service.render({"crash": True})
+    monkeypatch.setattr(service, "check_pool", lambda timeout=5.0: None)  # as if the new pool can't start
+    assert service.health()["status"] == "degraded"
+
+
+@pytest.fixture
+def post():
+    servers = []
+
+    def send(render_service, body=None, headers=None):
+        if not servers:
+            servers.append(make_server("127.0.0.1", 0, render_service, quiet=True))
+            threading.Thread(target=servers[0].serve_forever, daemon=True).start()
+        connection = http.client.HTTPConnection(*servers[0].server_address, timeout=5)
+        connection.putrequest("POST", "/render", skip_accept_encoding=True)
+        if headers is None:
+            headers = {"Content-Length": str(len(body))}
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        status = response.status
+        connection.close()
+        return status
+
+    yield send
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_invalid_resume_is_rejected_without_taking_a_slot(service, post, monkeypatch):
+    render_service = service(workers=1, queue_size=0)
+    monkeypatch.setattr(render_service, "try_acquire", lambda: pytest.fail("took a slot"))
+    assert post(render_service, b'{"name": "No Contact"}') == 400
+    assert render_service.counters["bad_request"] == 1
+
+
+@pytest.mark.parametrize("headers, status", [({}, 411), ({"Content-Length": "abc"}, 400),
+                                             ({"Content-Length": "-3"}, 400)])
+def test_bad_content_length_is_rejected(service, post, headers, status):
+    assert post(service(workers=1, queue_size=0), headers=headers) == status
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import resume_cli
+
+RESUME = {"name": "Jane Doe", "email": "jane@example.com", "phone": "555", "summary": "Engineer."}
+
+
+def _write_input(tmp_path):
+    path = tmp_path / "jane.json"
+    path.write_text(json.dumps(RESUME), encoding="utf-8")
+    return str(path)
+
+
+def test_failed_render_leaves_no_partial_pdf(tmp_path, monkeypatch):
+    input_path = _write_input(tmp_path)
+    output = tmp_path / "jane.pdf"
+
+    def broken_render(data, stream, cache_dir=None, layout=None):
+        stream.write(b"%PDF-1.3\n")  # part of a PDF, then the renderer fails
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(resume_cli, "_render_to", broken_render)
+    with pytest.raises(RuntimeError):
+        resume_cli.main(["render", input_path, "-o", str(output)])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["jane.json"]
+
+    # An existing PDF is kept as it was
+    output.write_bytes(b"previous")
+    with pytest.raises(RuntimeError):
+        resume_cli.main(["render", input_path, "-o", str(output)])
+    assert output.read_bytes() == b"previous"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["jane.json", "jane.pdf"]
+
+
+def test_render_writes_the_pdf(tmp_path):
+    input_path = _write_input(tmp_path)
+    output = tmp_path / "jane.pdf"
+
+    assert resume_cli.main(["render", input_path, "-o", str(output)]) == 0
+    assert output.read_bytes().startswith(b"%PDF-")
+
+
+def test_new_writes_its_pdf_atomically(tmp_path, monkeypatch):
+    import resume_generator
+
+    monkeypatch.setattr(resume_generator, "collect_resume_data", lambda: dict(RESUME))
+    output = tmp_path / "new.pdf"
+    assert resume_cli.main(["new", "-o", str(tmp_path / "new.json"), "--pdf", str(output)]) == 0
+    rendered = output.read_bytes()
+    assert rendered.startswith(b"%PDF-")
+
+    def broken_output_to(self, stream):
+        stream.write(b"%PDF-1.3\n")
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(resume_generator.ResumePDF, "output_to", broken_output_to)
+    with pytest.raises(RuntimeError):
+        resume_cli.main(["new", "-o", str(tmp_path / "new.json"), "--pdf", str(output)])
+    assert output.read_bytes() == rendered
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new.json", "new.pdf"]
@@ -0,0 +1,42 @@
+import pytest
+
+ctk = pytest.importorskip("customtkinter")
+
+from resume_gui import EDUCATION_FIELDS, EntryListSection
+
+
+@pytest.fixture
+def section():
+    try:
+        root = ctk.CTk()
+    except Exception as e:  # no display
+        pytest.skip(f"can't open a window: {e}")
+    frame = ctk.CTkFrame(root)
+    container = ctk.CTkFrame(frame)
+    scrolled = []
+    section = EntryListSection(frame, container, EDUCATION_FIELDS, page_size=20, scroll_to=scrolled.append)
+    section.scrolled = scrolled
+    yield section
+    root.destroy()
+
+
+def _shown(section):
+    return [entry for entry in section.entries if entry["row"] is not None]
+
+
+def test_add_keeps_the_page_and_builds_one_row(section):
+    section.set_values([{"degree": f"Degree {i}", "university": "U", "year": "2020"} for i in range(45)])
+    assert len(_shown(section)) == 20
+
+    entry = section.add({"degree": "New", "university": "U", "year": "2024"})
+    assert _shown(section) == section.entries[:20] + [entry]
+    assert entry["editor"] is not None
+    assert section.scrolled == [entry["row"]["frame"]]
+    assert section._packed == _shown(section)
+
+    section.show_more()  # reveals the next page before the added entry, in order
+    assert len(_shown(section)) == 41
+    assert section._packed == _shown(section)
+    frames = [entry["row"]["frame"] for entry in section._packed]
+    packed = [widget for widget in section.container.pack_slaves() if widget in frames]
+    assert packed == frames
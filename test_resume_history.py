@@ -0,0 +1,42 @@
+import json
+
+from resume_history import ResumeHistory
+
+
+def _resume(summary):
+    return {"name": "Jane Doe", "email": "jane@example.com", "phone": "555", "summary": summary}
+
+
+def test_commits_after_a_torn_line_survive_reload(tmp_path):
+    path = str(tmp_path / "resume.json.history")
+    history = ResumeHistory(path)
+    history.commit(_resume("first"))
+    history.commit(_resume("second"))
+    with open(path, "ab") as f:
+        f.write(b'{"version": 3, "parent": 2, "cha')  # crash in the middle of a commit
+
+    history = ResumeHistory(path)
+    assert len(history) == 2
+    version = history.commit(_resume("third"))
+
+    reloaded = ResumeHistory(path)
+    assert [info["version"] for info in reloaded.versions()] == [1, 2, version]
+    assert reloaded.checkout(version)["summary"] == "third"
+    with open(path, "rb") as f:
+        for line in f:
+            json.loads(line)
+
+
+def test_complete_last_line_without_newline_is_kept(tmp_path):
+    path = str(tmp_path / "resume.json.history")
+    ResumeHistory(path).commit(_resume("first"))
+    with open(path, "rb") as f:
+        contents = f.read()
+    with open(path, "wb") as f:
+        f.write(contents.rstrip(b"\n"))
+
+    history = ResumeHistory(path)
+    version = history.commit(_resume("second"))
+    reloaded = ResumeHistory(path)
+    assert len(reloaded) == 2
+    assert reloaded.checkout(version)["summary"] == "second"
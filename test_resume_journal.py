@@ -0,0 +1,57 @@
+import os
+import random
+import threading
+
+from form_model import FormModel
+from resume_journal import JournaledResumeStore, journal_path, load_journaled
+
+
+def _resume(summary):
+    return {"name": "Jane Doe", "email": "jane@example.com", "phone": "555", "summary": summary}
+
+
+def test_stale_autosave_does_not_overwrite_a_newer_full_save(tmp_path):
+    filename = str(tmp_path / "resume.json")
+    store = JournaledResumeStore(filename)
+    store.save(_resume("v1"), version=1)
+
+    assert store.compact(_resume("v3"), version=3)  # the user saves while ...
+    assert store.save(_resume("v2"), version=2) == 0  # ... an autosave of older data is still pending
+    assert load_journaled(filename) == _resume("v3")
+
+    # With the journal gone (an external full save), a stale save still doesn't compact over it
+    os.remove(journal_path(filename))
+    assert store.save(_resume("v2"), version=2) == 0
+    assert load_journaled(filename) == _resume("v3")
+
+
+def test_concurrent_saves_leave_the_newest_version(tmp_path):
+    filename = str(tmp_path / "resume.json")
+    store = JournaledResumeStore(filename, compact_after_records=3)
+    versions = list(range(1, 41))
+    random.Random(7).shuffle(versions)
+    barrier = threading.Barrier(len(versions))
+
+    def save(version):
+        barrier.wait()
+        if version % 5 == 0:
+            store.compact(_resume(f"v{version}"), version=version)
+        else:
+            store.save(_resume(f"v{version}"), version=version)
+
+    threads = [threading.Thread(target=save, args=(version,)) for version in versions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert load_journaled(filename) == _resume("v40")
+
+
+def test_saved_version_never_moves_back():
+    model = FormModel({"personal": lambda: {}})
+    for _ in range(5):
+        model.mark_dirty("personal")
+    model.mark_saved(5)
+    model.mark_saved(3)  # a slow autosave finishing after the full save
+    assert model.saved_version == 5
+    assert not model.has_unsaved_changes()
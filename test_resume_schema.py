@@ -0,0 +1,44 @@
+from resume_schema import check_resume
+
+
+def _resume(**fields):
+    data = {"name": "Jane Doe", "email": "jane@example.com", "phone": "555"}
+    data.update(fields)
+    return data
+
+
+def test_null_optional_fields_count_as_left_out():
+    data, problems = check_resume(_resume(
+        linkedin=None, summary=None, skills=None, awards=None,
+        projects=[{"name": "Site", "link": None, "dates": "2024", "description": None}],
+    ))
+    assert problems == []
+    assert data["linkedin"] == "" and data["summary"] == ""
+    assert data["skills"] == [] and data["awards"] == []
+    assert data["projects"] == [{"name": "Site", "link": "", "dates": "2024", "description": []}]
+
+
+def test_null_required_fields_are_rejected():
+    data, problems = check_resume(_resume(email=None, education=[{"degree": None, "university": "U", "year": 2020}]))
+    assert data is None
+    assert problems == ["'email' must be text", "education[0].degree must be text"]
+
+
+def test_numbers_become_text_but_booleans_are_rejected():
+    data, problems = check_resume(_resume(education=[{"degree": "BSc", "university": "U", "year": 2020}]))
+    assert problems == [] and data["education"][0]["year"] == "2020"
+    data, problems = check_resume(_resume(education=[{"degree": "BSc", "university": "U", "year": True}]))
+    assert data is None and problems == ["education[0].year must be text"]
+
+
+def test_numeric_phone_still_renders():
+    from resume_generator import ResumePDF, generate_resume_pdf
+
+    data, problems = check_resume(_resume(phone=5551234567, name=True))
+    assert problems == ["'name' must be text"]
+    data, problems = check_resume(_resume(phone=5551234567))
+    assert problems == [] and data["phone"] == "5551234567"
+
+    pdf_instance = ResumePDF(unit="mm", format="A4")
+    generate_resume_pdf(_resume(phone=5551234567), pdf_instance)
+    assert bytes(pdf_instance.output()).startswith(b"%PDF-")
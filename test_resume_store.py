@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from resume_store import ResumeStore
+
+
+def test_import_commits_jsonl_records_in_batches(tmp_path, monkeypatch):
+    export = tmp_path / "export.jsonl"
+    with open(export, "w", encoding="utf-8") as f:
+        for i in range(25):
+            f.write(json.dumps({"name": f"Person {i}", "email": f"p{i}@example.com", "phone": "555"}) + "\n")
+    store = ResumeStore(str(tmp_path / "library.db"))
+    batches = []
+    put_many = store.put_many
+    monkeypatch.setattr(store, "put_many", lambda items: batches.append(len(items)) or put_many(items))
+
+    assert store.import_files([str(export)], batch_size=10) == (25, 0)
+    assert batches == [10, 10, 5]
+    assert store.count() == 25
+
+
+def test_failed_render_keeps_the_previous_pdf(tmp_path, monkeypatch):
+    import resume_generator
+    import resume_store
+
+    db = str(tmp_path / "library.db")
+    store = ResumeStore(db)
+    resume_id = store.put({"name": "Jane Doe", "email": "jane@example.com", "phone": "555"})
+    store.close()
+    output = tmp_path / "jane.pdf"
+    output.write_bytes(b"previous")
+
+    def broken_output_to(self, stream):
+        stream.write(b"%PDF-1.3\n")
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(resume_generator.ResumePDF, "output_to", broken_output_to)
+    with pytest.raises(RuntimeError):
+        resume_store.main(["--db", db, "render", str(resume_id), "-o", str(output)])
+    assert output.read_bytes() == b"previous"
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith("library.db")) == ["jane.pdf"]
@@ -0,0 +1,50 @@
+import copy
+
+import pytest
+
+from benchmarks.synthetic import generate_profile
+from render_cache import FIXED_CREATION_DATE
+from resume_generator import ResumePDF, generate_resume_pdf, resolve_layout
+from section_memo import SectionMemo
+
+
+def _render(data, memo=None, layout=None):
+    pdf_instance = ResumePDF(unit="mm", format=resolve_layout(layout)["format"])
+    pdf_instance.set_creation_date(FIXED_CREATION_DATE)
+    generate_resume_pdf(data, pdf_instance, layout=layout, section_memo=memo)
+    return bytes(pdf_instance.output())
+
+
+@pytest.mark.parametrize("layout", ["classic", "condensed"])
+def test_rerender_after_edits_matches_a_full_render(layout):
+    data = generate_profile("unicode")
+    memo = SectionMemo()
+    assert _render(data, memo, layout) == _render(data, None, layout)
+
+    edits = [
+        lambda d: None,  # no change
+        lambda d: d["experience"][2]["description"].__setitem__(0, d["experience"][2]["description"][0] + " more"),
+        lambda d: d["experience"][0]["description"].append("A new bullet with new glyphs: Ωλ ŧ"),
+        lambda d: d.__setitem__("summary", d["summary"] + " Extra."),
+        lambda d: d.__setitem__("skills", d["skills"] + ["Zig"]),
+    ]
+    for edit in edits:
+        edit(data)
+        assert _render(copy.deepcopy(data), memo, layout) == _render(data, None, layout)
+
+
+def test_unchanged_sections_are_replayed():
+    data = generate_profile("large")
+    memo = SectionMemo()
+    _render(data, memo)
+    assert memo.hits == 0 and memo.misses > 0
+
+    misses = memo.misses
+    _render(data, memo)
+    assert memo.misses == misses and memo.hits == misses
+
+    # Editing the last section lays out only that one again
+    data["skills"] = data["skills"] + ["Zig"]
+    hits = memo.hits
+    assert _render(data, memo) == _render(data)
+    assert memo.misses == misses + 1 and memo.hits == hits + misses - 1
@@ -0,0 +1,48 @@
+import shutil
+
+from fpdf import FPDF
+
+from font_registry import FontRegistry, _resolve_font_path
+from subset_cache import SubsetCache
+
+REGULAR = _resolve_font_path("DejaVuSans.ttf")
+BOLD = _resolve_font_path("DejaVuSans-Bold.ttf")
+
+
+def _subset(registry, cache, font_path):
+    pdf = FPDF(unit="mm")
+    registry.install(pdf, fonts=(("Test", "", font_path),))
+    font = pdf.fonts["test"]
+    for character in "Resume":
+        font.subset.pick(ord(character))
+    return cache.subset(font)
+
+
+def test_font_file_replaced_on_disk_is_hashed_again(tmp_path):
+    font_path = str(tmp_path / "font.ttf")
+    shutil.copy(REGULAR, font_path)
+    cache = SubsetCache()
+    before = cache.key_for(font_path, ["a", "b"])
+    assert cache.key_for(font_path, ["a", "b"]) == before
+
+    shutil.copy(BOLD, font_path)
+    assert cache.key_for(font_path, ["a", "b"]) != before
+
+
+def test_subsets_follow_the_font_the_registry_parsed(tmp_path):
+    font_path = str(tmp_path / "font.ttf")
+    shutil.copy(REGULAR, font_path)
+    registry = FontRegistry()
+    cache = SubsetCache()
+    regular_subset = _subset(registry, cache, font_path)
+
+    # Replaced on disk but not reloaded yet: documents still embed the regular face, so it's a hit
+    shutil.copy(BOLD, font_path)
+    assert _subset(registry, cache, font_path) == regular_subset
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Once the registry re-reads the file, the bold face is subset instead of the cached regular one
+    registry.invalidate()
+    bold_subset = _subset(registry, cache, font_path)
+    assert cache.misses == 2
+    assert bold_subset[0] != regular_subset[0]
@@ -0,0 +1,102 @@
+import re
+
+from fpdf.line_break import BREAKING_SPACE_SYMBOLS_STR, NBSP
+
+# Runs of characters that are neither break opportunities, non-breaking spaces nor line ends.
+# These are measured as whole words; everything else is handled one character at a time.
+_WORD = re.compile("[^" + re.escape(BREAKING_SPACE_SYMBOLS_STR + NBSP) + "\n\f]+")
+
+# A word is placed without checking it character by character only when it ends at least this far
+# (in document units) inside the line, so rounding can't have made any of its characters overflow
+_SLACK = 1e-9
+
+
+def break_lines(text, font, size_pt, k, max_width):
+    """Splits a paragraph into lines the way fpdf2's MultiLineBreak does with WORD wrapping.
+
+    `font` is a font_registry.TableWidthTTFFont, `size_pt` the font size,
+    `k` the document's scale factor and `max_width` the width available to
+    the text (the cell width minus both clearance margins). The text must
+    already be free of carriage returns and soft hyphens.
+
+    fpdf2 re-measures the whole line for every character it adds. Here each
+    word is measured in one call (memoized per face, see word_units()) and
+    placed at once when it clearly fits; only a word that reaches the end of
+    the line is walked character by character, with fpdf2's own expressions,
+    so lines break at exactly the same characters.
+
+    Returns a list of (start, end, units, spaces, justified, trailing_newline)
+    tuples: the line is text[start:end] (with NBSP shown as a space), units
+    its width in 1/1000 em, spaces the spaces Tw stretches, and justified
+    whether fpdf2 would justify it (lines broken automatically) or left-align
+    it (forced breaks, line ends, the last line). A justified line is never
+    empty in fpdf2's sense: even with no characters (a line broken at a
+    leading space) it is drawn as an empty text object. Returns None when a
+    character is wider than the line, which fpdf2 reports as an error.
+    """
+    limit = max_width - _SLACK
+    space_units = font.char_units(" ")
+    word_at = _WORD.match
+    lines = []
+    n = len(text)
+    i = 0
+    while i < n:
+        start = i
+        units = spaces = 0
+        hint = None  # (index, units, spaces) at the last breaking space on the line
+        while True:
+            if i == n:
+                if units:  # fpdf drops a last line with nothing visible on it
+                    lines.append((start, i, units, spaces, False, False))
+                break
+            c = text[i]
+            if c == "\n" or c == "\f":
+                lines.append((start, i, units, spaces, False, c == "\n"))
+                i += 1
+                break
+            word = word_at(text, i)
+            if word is not None:
+                word_units = font.word_units(word.group())
+                if (units + word_units) * size_pt * 0.001 / k <= limit:
+                    units += word_units
+                    i = word.end()
+                    continue
+                overflow = False
+                for c in word.group():
+                    char_units = font.char_units(c)
+                    if units * size_pt * 0.001 / k + char_units * size_pt * 0.001 / k > max_width:
+                        overflow = True
+                        break
+                    units += char_units
+                    i += 1
+                if not overflow:
+                    continue
+            else:
+                char_units = font.char_units(c)
+                if units * size_pt * 0.001 / k + char_units * size_pt * 0.001 / k > max_width:
+                    if c != NBSP:  # the breaking space at the end of a full line is dropped
+                        if i == start:
+                            return None  # a lone space wider than the line; rare enough to leave to fpdf2
+                        lines.append((start, i, units, spaces, True, False))
+                        i += 1
+                        break
+                else:
+                    if c == NBSP:
+                        units += space_units  # shown (and justified) as a plain space
+                    else:
+                        hint = (i, units, spaces)
+                        units += char_units
+                    spaces += 1
+                    i += 1
+                    continue
+            # text[i] doesn't fit on the line: break after the last space, or before the character
+            if hint is not None:
+                space_at, units, spaces = hint
+                lines.append((start, space_at, units, spaces, True, False))
+                i = space_at + 1
+            elif units:
+                lines.append((start, i, units, spaces, False, False))
+            else:
+                return None
+            break
+    return lines